@@ -0,0 +1,53 @@
+"""
+Configuración general de la aplicación
+Valores ajustables por variables de entorno
+"""
+
+import os
+
+
+def _env_float(name: str, default: float, minimum: float = 0.0) -> float:
+    """
+    Lee un número de una variable de entorno sin romper el arranque
+
+    Un valor ausente o mal formado usa `default`; el resultado nunca baja de `minimum`.
+    """
+    raw = os.environ.get(name)
+    try:
+        value = float(raw) if raw is not None else default
+    except ValueError:
+        print(f"[Settings] Valor no válido en {name}={raw!r}; se usa {default}")
+        value = default
+    if value != value:  # NaN
+        value = default
+    return max(minimum, value)
+
+# Tiempo mínimo (segundos) que se muestra la pantalla de carga aunque el
+# arranque termine antes. 0 desactiva la espera y muestra Home de inmediato.
+LOADING_MIN_DISPLAY_SECONDS = _env_float("JDTP_LOADING_MIN_SECONDS", 0.5)
+
+# Ventana (segundos) en la que ProgressService agrupa asignaciones de puntos
+# en un solo commit. 0 confirma cada asignación de inmediato.
+POINTS_WRITE_BEHIND_SECONDS = _env_float("JDTP_POINTS_WRITE_BEHIND_SECONDS", 0.25)
+
+# Ventana (segundos) en la que RewardsService agrupa altas, cambios y bajas
+# de recompensas en un solo lote. 0 escribe en la siguiente vuelta del loop.
+REWARDS_WRITE_BEHIND_SECONDS = _env_float("JDTP_REWARDS_WRITE_BEHIND_SECONDS", 0.25)
+
+# Máximo de envíos de UI por segundo del planificador de page.update().
+# Las peticiones de una misma vuelta del loop se agrupan siempre; 0 quita el límite.
+UI_MAX_FPS = _env_float("JDTP_UI_MAX_FPS", 60)
+
+# Intervalo (segundos) entre snapshots de los espejos en memoria; el arranque
+# restaura el último y relee solo lo cambiado después. 0 desactiva los snapshots.
+SNAPSHOT_INTERVAL_SECONDS = _env_float("JDTP_SNAPSHOT_INTERVAL_SECONDS", 0)
+
+# Segundos sin eventos de dominio tras los que se ejecuta el mantenimiento de
+# la BD (optimize, VACUUM incremental, ANALYZE y copia de seguridad). 0 lo desactiva.
+MAINTENANCE_IDLE_SECONDS = _env_float("JDTP_MAINTENANCE_IDLE_SECONDS", 120)
+
+# Intervalo mínimo (segundos) entre dos mantenimientos completos.
+MAINTENANCE_INTERVAL_SECONDS = _env_float("JDTP_MAINTENANCE_INTERVAL_SECONDS", 24 * 3600)
+
+# Copias de seguridad de la BD que se conservan al rotar.
+BACKUP_KEEP = int(_env_float("JDTP_BACKUP_KEEP", 5, minimum=1))
@@ -3,9 +3,12 @@
 from .system_points import (
 	Level,
 	PointsSystem,
+	LevelInfo,
+	LEVEL_TABLE,
 	LEVEL_POINTS,
 	LEVELS_ORDER,
 	POINTS_BY_ACTION,
+	HABIT_ACTION_BY_FREQUENCY,
 	LEVEL_COLORS,
 	LEVEL_ICONS,
 )
@@ -14,9 +17,12 @@ from .system_levels import UserLevel, LevelManager
 __all__ = [
 	"Level",
 	"PointsSystem",
+	"LevelInfo",
+	"LEVEL_TABLE",
 	"LEVEL_POINTS",
 	"LEVELS_ORDER",
 	"POINTS_BY_ACTION",
+	"HABIT_ACTION_BY_FREQUENCY",
 	"LEVEL_COLORS",
 	"LEVEL_ICONS",
 	"UserLevel",
@@ -0,0 +1,171 @@
+"""
+Rachas de Hábitos
+Calcula rachas actuales y máximas agrupando los completados por periodo
+según la frecuencia del hábito (día, semana, mes, semestre, año).
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, Optional, Tuple
+
+# Expresión SQL que lleva completed_at ('YYYY-MM-DD') al inicio de su periodo
+PERIOD_BUCKET_SQL = {
+    "daily": "completed_at",
+    "weekly": "date(completed_at, 'weekday 0', '-6 days')",
+    "monthly": "date(completed_at, 'start of month')",
+    "semiannual": (
+        "CASE WHEN CAST(strftime('%m', completed_at) AS INTEGER) <= 6 "
+        "THEN strftime('%Y-01-01', completed_at) ELSE strftime('%Y-07-01', completed_at) END"
+    ),
+    "annual": "date(completed_at, 'start of year')",
+}
+
+
+def period_start(day: date, frequency: str) -> date:
+    """
+    Inicio del periodo al que pertenece un día
+
+    Args:
+        day: Fecha
+        frequency: daily, weekly, monthly, semiannual o annual
+
+    Returns:
+        Primer día del periodo (las semanas empiezan en lunes)
+    """
+    if frequency == "weekly":
+        return day - timedelta(days=day.weekday())
+    if frequency == "monthly":
+        return day.replace(day=1)
+    if frequency == "semiannual":
+        return date(day.year, 1 if day.month <= 6 else 7, 1)
+    if frequency == "annual":
+        return date(day.year, 1, 1)
+    return day
+
+
+def next_period_start(start: date, frequency: str) -> date:
+    """Inicio del periodo siguiente a `start` (que debe ser inicio de periodo)"""
+    if frequency == "weekly":
+        return start + timedelta(days=7)
+    if frequency == "monthly":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    if frequency == "semiannual":
+        return date(start.year, 7, 1) if start.month == 1 else date(start.year + 1, 1, 1)
+    if frequency == "annual":
+        return date(start.year + 1, 1, 1)
+    return start + timedelta(days=1)
+
+
+def previous_period_start(start: date, frequency: str) -> date:
+    """Inicio del periodo anterior a `start` (que debe ser inicio de periodo)"""
+    return period_start(start - timedelta(days=1), frequency)
+
+
+def required_completions(frequency: str, frequency_times: int) -> int:
+    """
+    Completados necesarios para cumplir un periodo
+
+    Solo se registra un completado por día, así que en hábitos diarios basta con uno.
+    """
+    if frequency == "daily":
+        return 1
+    return max(1, int(frequency_times or 1))
+
+
+def expected_completions(frequency: str, frequency_times: int, start: date, end: date) -> float:
+    """
+    Completados esperados de un hábito entre start y end (ambos incluidos)
+
+    Cada periodo del hábito aporta required_completions prorrateado por los días
+    que caen en el rango: una semana entera de un hábito de 3 veces por semana
+    aporta 3 y un solo día de esa semana, 3/7.
+    """
+    required = required_completions(frequency, frequency_times)
+    total = 0.0
+    current = period_start(start, frequency)
+    while current <= end:
+        following = next_period_start(current, frequency)
+        inside = (min(following, end + timedelta(days=1)) - max(current, start)).days
+        total += required * inside / (following - current).days
+        current = following
+    return total
+
+
+@dataclass
+class StreakInfo:
+    """Estado de racha de un hábito"""
+    current: int = 0
+    longest: int = 0
+    last_met_period: Optional[date] = None  # Último periodo cumplido
+    current_period: Optional[date] = None   # Periodo con conteo en curso
+    current_count: int = 0                  # Completados dentro de current_period
+
+    def effective_current(self, today: date, frequency: str) -> int:
+        """
+        Racha vigente hoy: el periodo en curso aún puede cumplirse, pero si el
+        anterior no se cumplió la racha está rota
+        """
+        if self.last_met_period is None:
+            return 0
+        this_period = period_start(today, frequency)
+        if self.last_met_period in (this_period, previous_period_start(this_period, frequency)):
+            return self.current
+        return 0
+
+
+def compute_streaks(
+    buckets: Iterable[Tuple[date, int]],
+    frequency: str,
+    frequency_times: int = 1,
+) -> StreakInfo:
+    """
+    Calcula la racha a partir de conteos por periodo
+
+    Args:
+        buckets: Pares (inicio de periodo, completados) en orden ascendente
+        frequency: Frecuencia del hábito
+        frequency_times: Veces requeridas por periodo
+
+    Returns:
+        StreakInfo con la racha del último tramo y la más larga
+    """
+    required = required_completions(frequency, frequency_times)
+    info = StreakInfo()
+    for start, count in buckets:
+        info.current_period, info.current_count = start, count
+        if count < required:
+            continue
+        if info.last_met_period is not None and next_period_start(info.last_met_period, frequency) == start:
+            info.current += 1
+        else:
+            info.current = 1
+        info.last_met_period = start
+        info.longest = max(info.longest, info.current)
+    return info
+
+
+def apply_completion(info: StreakInfo, day: date, frequency: str, frequency_times: int = 1) -> StreakInfo:
+    """
+    Actualiza una racha en caché con un completado nuevo, sin releer el historial
+
+    Args:
+        info: Racha calculada previamente (se modifica en sitio)
+        day: Día del completado (no anterior al último periodo registrado)
+        frequency: Frecuencia del hábito
+        frequency_times: Veces requeridas por periodo
+
+    Returns:
+        La misma instancia actualizada
+    """
+    start = period_start(day, frequency)
+    if info.current_period != start:
+        info.current_period, info.current_count = start, 0
+    info.current_count += 1
+    if info.current_count == required_completions(frequency, frequency_times):
+        if info.last_met_period is not None and next_period_start(info.last_met_period, frequency) == start:
+            info.current += 1
+        else:
+            info.current = 1
+        info.last_met_period = start
+        info.longest = max(info.longest, info.current)
+    return info
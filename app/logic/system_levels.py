@@ -3,11 +3,15 @@ Sistema de Niveles
 Gestiona la lógica de niveles y progresión del usuario
 """
 
+import heapq
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from app.logic.system_points import Level, PointsSystem, LEVEL_POINTS, LEVELS_ORDER
 
+if TYPE_CHECKING:
+    from app.services.user_service import UserService
+
 
 @dataclass
 class UserLevel:
@@ -52,12 +56,8 @@ class UserLevel:
         
         if amount is not None:
             self.current_points += amount
-            print(f"[UserLevel] Añadiendo {amount} puntos manualmente")
         else:
-            old_points = self.current_points
             self.current_points = PointsSystem.add_points(self.current_points, action)
-            points_added = self.current_points - old_points
-            print(f"[UserLevel] Acción '{action}': Puntos previos: {old_points}, Puntos añadidos: {points_added}, Puntos totales: {self.current_points}")
         
         self.current_level = PointsSystem.get_level_by_points(self.current_points)
         self.total_actions += 1
@@ -108,11 +108,24 @@ class UserLevel:
 
 
 class LevelManager:
-    """Gestor centralizado de niveles de usuarios"""
+    """
+    Gestor centralizado de niveles de usuarios
+    
+    Con un UserService, los puntos sumados se acumulan en memoria y flush()
+    los persiste en un solo lote.
+    """
     
-    def __init__(self):
-        """Inicializa el gestor"""
+    def __init__(self, user_service: Optional["UserService"] = None):
+        """
+        Inicializa el gestor
+        
+        Args:
+            user_service: Servicio para persistir los puntos (opcional)
+        """
         self.user_levels: dict[str, UserLevel] = {}
+        self.user_service = user_service
+        # user_id -> [puntos, asignaciones] acumulados desde el último flush
+        self._pending_points: Dict[str, List] = {}
     
     def get_or_create_user_level(self, user_id: str) -> UserLevel:
         """
@@ -141,7 +154,45 @@ class LevelManager:
             True si hubo promoción de nivel
         """
         user_level = self.get_or_create_user_level(user_id)
-        return user_level.add_points(action, amount)
+        old_points = user_level.current_points
+        level_up = user_level.add_points(action, amount)
+        if self.user_service is not None:
+            pending = self._pending_points.setdefault(user_id, [0.0, 0])
+            pending[0] += user_level.current_points - old_points
+            pending[1] += 1
+        return level_up
+    
+    async def load_user(self, user_id: str) -> UserLevel:
+        """
+        Carga el nivel de un usuario desde UserService
+        
+        Args:
+            user_id: ID del usuario
+            
+        Returns:
+            UserLevel con los puntos persistidos (más los pendientes)
+        """
+        user_level = self.get_or_create_user_level(user_id)
+        if self.user_service is not None:
+            user = await self.user_service.get_user(user_id)
+            if user is not None:
+                user_level.current_points = user.points + self._pending_points.get(user_id, [0.0])[0]
+                user_level.current_level = PointsSystem.get_level_by_points(user_level.current_points)
+        return user_level
+    
+    async def flush(self) -> Dict[str, Level]:
+        """
+        Persiste en lote los puntos acumulados desde el último flush
+        
+        Returns:
+            {user_id: nivel} de los usuarios que cambiaron de nivel
+        """
+        if self.user_service is None or not self._pending_points:
+            return {}
+        pending, self._pending_points = self._pending_points, {}
+        return await self.user_service.add_points_bulk(
+            (user_id, points, actions) for user_id, (points, actions) in pending.items()
+        )
     
     def get_user_level_info(self, user_id: str) -> dict:
         """
@@ -181,11 +232,7 @@ class LevelManager:
         Returns:
             Lista de usuarios ordenados por puntos
         """
-        sorted_users = sorted(
-            self.user_levels.values(),
-            key=lambda x: x.current_points,
-            reverse=True
-        )
+        top_users = heapq.nlargest(limit, self.user_levels.values(), key=lambda x: x.current_points)
         
         return [
             {
@@ -195,5 +242,5 @@ class LevelManager:
                 "points": user.current_points,
                 "icon": PointsSystem.get_level_icon(user.current_level),
             }
-            for idx, user in enumerate(sorted_users[:limit])
+            for idx, user in enumerate(top_users)
         ]
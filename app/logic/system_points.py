@@ -3,8 +3,10 @@ Sistema de Puntos
 Define los puntos requeridos para cada nivel del sistema de gamificación
 """
 
+from bisect import bisect_right
 from enum import Enum
-from typing import Optional
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, NamedTuple, Optional, Tuple
 
 
 class Level(Enum):
@@ -62,6 +64,15 @@ POINTS_BY_ACTION = {
     "goal_decrement_completed": 0.25,
 }
 
+# Acción de puntos asociada a cada frecuencia de hábito
+HABIT_ACTION_BY_FREQUENCY = {
+    "daily": "habit_daily_completed",
+    "weekly": "habit_weekly_completed",
+    "monthly": "habit_monthly_completed",
+    "semiannual": "habit_semiannual_completed",
+    "annual": "habit_annual_completed",
+}
+
 # Colores para cada nivel
 LEVEL_COLORS = {
     Level.NADIE: "#808080",           # Gris
@@ -91,8 +102,60 @@ LEVEL_ICONS = {
 }
 
 
+class LevelInfo(NamedTuple):
+    """Entrada precalculada de la tabla de niveles"""
+    level: Level
+    index: int
+    threshold: float
+    next_level: Optional[Level]
+    span: float  # Puntos entre este nivel y el siguiente (0 en el nivel máximo)
+
+
+def _build_level_table() -> Tuple[LevelInfo, ...]:
+    table = []
+    for index, level in enumerate(LEVELS_ORDER):
+        next_level = LEVELS_ORDER[index + 1] if index + 1 < len(LEVELS_ORDER) else None
+        threshold = LEVEL_POINTS[level]
+        span = LEVEL_POINTS[next_level] - threshold if next_level else 0.0
+        table.append(LevelInfo(level, index, threshold, next_level, span))
+    return tuple(table)
+
+
+# Tabla de niveles inmutable: umbrales ordenados para bisect e índice por nivel
+LEVEL_TABLE: Tuple[LevelInfo, ...] = _build_level_table()
+LEVEL_THRESHOLDS: Tuple[float, ...] = tuple(info.threshold for info in LEVEL_TABLE)
+LEVEL_INDEX: Mapping[Level, int] = MappingProxyType({info.level: info.index for info in LEVEL_TABLE})
+
+
 class PointsSystem:
     """Sistema de gestión de puntos y niveles"""
+
+    @staticmethod
+    def get_level_info(points: float) -> LevelInfo:
+        """
+        Obtiene la entrada de la tabla de niveles para unos puntos (O(log n))
+        
+        Args:
+            points: Puntos totales del usuario
+            
+        Returns:
+            LevelInfo del nivel alcanzado
+        """
+        return LEVEL_TABLE[max(0, bisect_right(LEVEL_THRESHOLDS, points) - 1)]
+
+    @staticmethod
+    def levels_for(points_array: Iterable[float]) -> List[Level]:
+        """
+        Calcula el nivel de muchos puntajes en una sola pasada (p. ej. ranking)
+        
+        Args:
+            points_array: Secuencia de puntos
+            
+        Returns:
+            Lista de niveles en el mismo orden
+        """
+        thresholds, levels = LEVEL_THRESHOLDS, LEVELS_ORDER
+        return [levels[max(0, bisect_right(thresholds, points) - 1)] for points in points_array]
     
     @staticmethod
     def get_level_by_points(points: float) -> Level:
@@ -105,13 +168,7 @@ class PointsSystem:
         Returns:
             Level correspondiente
         """
-        level = Level.NADIE
-        for lvl in LEVELS_ORDER:
-            if points >= LEVEL_POINTS[lvl]:
-                level = lvl
-            else:
-                break
-        return level
+        return PointsSystem.get_level_info(points).level
     
     @staticmethod
     def get_points_for_level(level: Level) -> float:
@@ -137,13 +194,10 @@ class PointsSystem:
         Returns:
             Siguiente nivel o None si es el último
         """
-        try:
-            current_index = LEVELS_ORDER.index(current_level)
-            if current_index < len(LEVELS_ORDER) - 1:
-                return LEVELS_ORDER[current_index + 1]
-        except ValueError:
-            pass
-        return None
+        index = LEVEL_INDEX.get(current_level)
+        if index is None:
+            return None
+        return LEVEL_TABLE[index].next_level
     
     @staticmethod
     def get_points_to_next_level(current_points: float) -> float:
@@ -156,14 +210,11 @@ class PointsSystem:
         Returns:
             Puntos faltantes para el siguiente nivel
         """
-        current_level = PointsSystem.get_level_by_points(current_points)
-        next_level = PointsSystem.get_next_level(current_level)
-        
-        if next_level is None:
+        info = PointsSystem.get_level_info(current_points)
+        if info.next_level is None:
             return 0.0  # Ya está en el máximo nivel
         
-        next_points = LEVEL_POINTS[next_level]
-        return max(0.0, next_points - current_points)
+        return max(0.0, info.threshold + info.span - current_points)
     
     @staticmethod
     def get_progress_to_next_level(current_points: float) -> tuple[float, float]:
@@ -176,18 +227,8 @@ class PointsSystem:
         Returns:
             Tupla (puntos_en_nivel_actual, puntos_totales_para_siguiente)
         """
-        current_level = PointsSystem.get_level_by_points(current_points)
-        current_level_points = LEVEL_POINTS[current_level]
-        next_level = PointsSystem.get_next_level(current_level)
-        
-        if next_level is None:
-            return (current_points - current_level_points, 0.0)
-        
-        next_level_points = LEVEL_POINTS[next_level]
-        points_in_current = current_points - current_level_points
-        total_for_next = next_level_points - current_level_points
-        
-        return (points_in_current, total_for_next)
+        info = PointsSystem.get_level_info(current_points)
+        return (current_points - info.threshold, info.span)
     
     @staticmethod
     def add_points(current_points: float, action: str) -> float:
@@ -5,8 +5,9 @@ Punto de entrada de la aplicación
 
 import flet as ft
 from pathlib import Path
-from app.ui.home_view import HomeView
+from app import ui  # Vistas con import perezoso: HomeView se carga tras el splash
 from app.utils.screem_load import LoadingScreen
+from app.services.startup_service import StartupService
 
 
 def main(page: ft.Page):
@@ -16,6 +17,17 @@ def main(page: ft.Page):
     Args:
         page: Objeto Page de Flet que representa la página principal
     """
+    # Arrancar BD y precarga de datos de inmediato, en paralelo con la pantalla de carga
+    startup = StartupService()
+    page.run_task(startup.run)
+
+    # Confirmar los puntos agrupados por write-behind al cerrar la sesión
+    async def flush_on_exit(e):
+        await startup.shutdown()
+
+    page.on_close = flush_on_exit
+    page.on_disconnect = flush_on_exit
+    
     # Configuración de la ventana
     page.title = "Justice Driven Task Power"
     page.window.width = 800
@@ -61,8 +73,8 @@ def main(page: ft.Page):
         # Limpiar la página
         page.clean()
         
-        # Cargar la vista principal (Home) con BottomNav
-        page.add(HomeView().build(page))
+        # Cargar la vista principal (Home) con BottomNav y los datos precargados
+        page.add(ui.HomeView().build(page, startup=startup))
         
         # Actualizar la página
         page.update()
@@ -72,5 +84,5 @@ def main(page: ft.Page):
     page.add(loading_screen.build(page))  # Pasar page para cálculos responsive
     page.update()
     
-    # Iniciar la animación de carga (dura 5 segundos por defecto)
-    loading_screen.start_loading(page, duration=5.0)
+    # La carga termina cuando concluye el trabajo real de arranque
+    loading_screen.start_loading(page, steps=startup.loading_steps())
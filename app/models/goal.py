@@ -17,6 +17,16 @@ class Goal:
     progress: float = 0.0
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    goal_class: str = "incremental"  # incremental o reductual
+
+    @property
+    def completed(self) -> bool:
+        """Cumplida: incremental si progress >= target, reductual si progress <= target"""
+        if self.target <= 0:
+            return False
+        if self.goal_class == "reductual":
+            return self.progress <= self.target
+        return self.progress >= self.target
 
     def update(self, **kwargs):
         for key, value in kwargs.items():
@@ -36,6 +46,8 @@ class Goal:
             "progress": self.progress,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
+            "goal_class": self.goal_class,
+            "completed": self.completed,
         }
 
     @classmethod
@@ -60,7 +72,6 @@ class Goal:
             progress=float(data.get("progress", 0.0)),
             created_at=parse_dt(data["created_at"]) if "created_at" in data else datetime.now(),
             updated_at=parse_dt(data["updated_at"]) if "updated_at" in data else datetime.now(),
+            goal_class=data.get("goal_class") or "incremental",
         )
-        # goal_class puede no estar en el dataclass, pero lo agregamos dinámicamente
-        setattr(obj, "goal_class", data.get("goal_class", "incremental"))
         return obj
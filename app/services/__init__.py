@@ -1,16 +1,54 @@
 """Servicios principales de la aplicación."""
 
 from .database_service import DatabaseService, TableSchema
+from .event_bus import (
+	CountersChanged,
+	DomainEvent,
+	EventBus,
+	GoalUpdated,
+	HabitCompleted,
+	PointsChanged,
+	SubtaskToggled,
+	TaskCompleted,
+	TaskDeleted,
+	TaskStatusChanged,
+	event_bus,
+)
 from .progress_service import ProgressService
+from .points_integrity_service import PointsIntegrityService
 from .task_service import TaskService
 from .rewards_service import RewardsService
 from .habits_service import HabitsService
+from .user_service import UserService
+from .dashboard_counters_service import DashboardCountersService
+from .snapshot_service import SnapshotService
+from .maintenance_service import MaintenanceService
+from .data_transfer_service import DataTransferService
+from .startup_service import StartupService
 
 __all__ = [
 	"DatabaseService",
 	"TableSchema",
+	"DomainEvent",
+	"EventBus",
+	"TaskCompleted",
+	"TaskDeleted",
+	"TaskStatusChanged",
+	"SubtaskToggled",
+	"HabitCompleted",
+	"GoalUpdated",
+	"PointsChanged",
+	"CountersChanged",
+	"event_bus",
 	"ProgressService",
+	"PointsIntegrityService",
 	"TaskService",
 	"RewardsService",
 	"HabitsService",
+	"UserService",
+	"DashboardCountersService",
+	"SnapshotService",
+	"MaintenanceService",
+	"DataTransferService",
+	"StartupService",
 ]
@@ -0,0 +1,178 @@
+"""
+Contadores de completados mantenidos por triggers (Completion Counters)
+Tabla única dashboard_counters que comparten DashboardCountersService (totales
+del resumen) y PointsIntegrityService (puntos esperados, con los hábitos
+agrupados por frecuencia).
+
+Triggers AFTER INSERT/UPDATE/DELETE sobre cada tabla de origen suman o restan
+1 al contador en la misma transacción que la escritura. Un contador cuyo
+trigger se instala por primera vez se recuenta desde su tabla; después solo lo
+ajustan los triggers.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+from app.services.database_service import DatabaseService
+from app.utils.task_helper import TASK_STATUS_COMPLETED
+
+COUNTERS_TABLE = "dashboard_counters"
+
+# Ámbito de los contadores que no dependen del usuario y grupo de los que no se dividen
+GLOBAL_SCOPE = ""
+NO_BUCKET = ""
+
+# contador -> (tabla de origen, condición de fila contada, ámbito, grupo);
+# {row} se sustituye por NEW, OLD o el nombre de la tabla
+COUNTER_SOURCES = {
+    "tasks_completed": ("tasks", f"{{row}}.status = '{TASK_STATUS_COMPLETED}'", "{row}.user_id", f"'{NO_BUCKET}'"),
+    "subtasks_completed": ("subtasks", "COALESCE({row}.completed, 0) != 0", f"'{GLOBAL_SCOPE}'", f"'{NO_BUCKET}'"),
+    "habits_completed": ("habit_completions", "1", f"'{GLOBAL_SCOPE}'", "COALESCE({row}.frequency, '')"),
+    "goals_completed": ("goals", "{row}.completed = 1", f"'{GLOBAL_SCOPE}'", f"'{NO_BUCKET}'"),
+}
+
+# Tablas y triggers de versiones anteriores (conteos propios de la integridad de puntos)
+_LEGACY_TABLES = (
+    "points_integrity_counts",
+    "points_integrity_rows",
+    "points_integrity_checkpoint",
+    "habit_frequency_points",
+)
+_LEGACY_TRIGGER_PREFIX = "trg_points_integrity_counts_"
+
+
+async def install_counters(db: DatabaseService, savepoint: str = "completion_counters_install") -> Tuple[bool, int]:
+    """
+    Crea la tabla y los triggers de las tablas de origen que ya existen
+
+    Args:
+        db: Servicio de BD ya conectado
+        savepoint: Nombre del savepoint de la instalación
+
+    Returns:
+        (todos los contadores instalados, filas de origen leídas en los recuentos)
+    """
+    await _ensure_table(db)
+    cursor = await db.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    existing = {(kind, name) for kind, name in await cursor.fetchall()}
+    installed = 0
+    examined = 0
+    async with db.savepoint(savepoint):
+        for name, (table, condition, scope, bucket) in COUNTER_SOURCES.items():
+            if ("trigger", trigger_name(name, "insert")) in existing:
+                installed += 1
+                continue
+            if ("table", table) not in existing:
+                continue  # Se instalará cuando su servicio cree la tabla
+            for statement in trigger_statements(name, table, condition, scope, bucket):
+                await db.execute(statement)
+            examined += await recount(db, name)
+            installed += 1
+            print(f"[CompletionCounters] Contador {name} materializado desde {table}")
+    await db.commit()
+    return installed == len(COUNTER_SOURCES), examined
+
+
+async def recount_all(
+    db: DatabaseService,
+    names: Optional[Iterable[str]] = None,
+    savepoint: str = "completion_counters_recount",
+) -> int:
+    """
+    Recalcula los contadores indicados (todos por defecto) desde sus tablas (reparación)
+
+    Returns:
+        Filas de origen leídas
+    """
+    examined = 0
+    async with db.savepoint(savepoint):
+        for name in names or COUNTER_SOURCES:
+            table = COUNTER_SOURCES[name][0]
+            cursor = await db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            if await cursor.fetchone():
+                examined += await recount(db, name)
+    await db.commit()
+    return examined
+
+
+async def recount(db: DatabaseService, name: str) -> int:
+    """Recalcula un contador con una pasada por su tabla; devuelve las filas leídas"""
+    table, condition, scope, bucket = COUNTER_SOURCES[name]
+    cursor = await db.execute(
+        f"""
+        SELECT {scope.format(row=table)}, {bucket.format(row=table)},
+               COALESCE(SUM(CASE WHEN {condition.format(row=table)} THEN 1 ELSE 0 END), 0), COUNT(*)
+        FROM {table} GROUP BY 1, 2
+        """
+    )
+    rows = await cursor.fetchall()
+    await db.execute(f"DELETE FROM {COUNTERS_TABLE} WHERE name = ?", (name,))
+    await db.executemany(
+        f"INSERT INTO {COUNTERS_TABLE} (scope, name, bucket, value) VALUES (?, ?, ?, ?)",
+        [(row_scope, name, row_bucket, int(value)) for row_scope, row_bucket, value, _ in rows if value],
+    )
+    return sum(int(total) for _, _, _, total in rows)
+
+
+def trigger_name(name: str, operation: str) -> str:
+    return f"trg_{COUNTERS_TABLE}_{name}_{operation}"
+
+
+def trigger_statements(name: str, table: str, condition: str, scope: str, bucket: str) -> List[str]:
+    """Triggers AFTER INSERT/UPDATE/DELETE que suman o restan 1 al contador"""
+    new_cond, old_cond = condition.format(row="NEW"), condition.format(row="OLD")
+    new_scope, old_scope = scope.format(row="NEW"), scope.format(row="OLD")
+    new_bucket, old_bucket = bucket.format(row="NEW"), bucket.format(row="OLD")
+    increment = (
+        f"INSERT INTO {COUNTERS_TABLE} (scope, name, bucket, value) "
+        f"SELECT {new_scope}, '{name}', {new_bucket}, 1 WHERE {new_cond} "
+        f"ON CONFLICT(scope, name, bucket) DO UPDATE SET value = value + 1;"
+    )
+    decrement = (
+        f"UPDATE {COUNTERS_TABLE} SET value = value - 1 "
+        f"WHERE scope = {old_scope} AND name = '{name}' AND bucket = {old_bucket} AND {old_cond};"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {trigger_name(name, 'insert')} "
+        f"AFTER INSERT ON {table} BEGIN {increment} END",
+        f"CREATE TRIGGER IF NOT EXISTS {trigger_name(name, 'update')} "
+        f"AFTER UPDATE ON {table} "
+        f"WHEN ({old_cond}) IS NOT ({new_cond}) OR {old_scope} IS NOT {new_scope} "
+        f"OR {old_bucket} IS NOT {new_bucket} "
+        f"BEGIN {decrement} {increment} END",
+        f"CREATE TRIGGER IF NOT EXISTS {trigger_name(name, 'delete')} "
+        f"AFTER DELETE ON {table} BEGIN {decrement} END",
+    ]
+
+
+async def _ensure_table(db: DatabaseService):
+    """Crea la tabla; retira los conteos de versiones anteriores para que se recuenten"""
+    cursor = await db.execute(f"PRAGMA table_info({COUNTERS_TABLE})")
+    columns = {row[1] for row in await cursor.fetchall()}
+    cursor = await db.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    existing = await cursor.fetchall()
+    triggers = [name for kind, name in existing if kind == "trigger"]
+    stale = [name for name in triggers if name.startswith(_LEGACY_TRIGGER_PREFIX)]
+    outdated = bool(columns) and "bucket" not in columns
+    if outdated:
+        # Tabla sin grupo: sus triggers escriben otras columnas
+        stale += [name for name in triggers if name.startswith(f"trg_{COUNTERS_TABLE}_")]
+    legacy = [name for kind, name in existing if kind == "table" and name in _LEGACY_TABLES]
+    if columns and not (stale or outdated or legacy):
+        return
+    for name in stale:
+        await db.execute(f"DROP TRIGGER IF EXISTS {name}")
+    if outdated:
+        await db.execute(f"DROP TABLE {COUNTERS_TABLE}")
+    for table in legacy:
+        await db.execute(f"DROP TABLE IF EXISTS {table}")
+    await db.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {COUNTERS_TABLE} (
+            scope TEXT NOT NULL,
+            name TEXT NOT NULL,
+            bucket TEXT NOT NULL DEFAULT '',
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, name, bucket)
+        ) WITHOUT ROWID
+        """
+    )
+    await db.commit()
@@ -0,0 +1,134 @@
+"""
+Servicio de Contadores del Resumen (Dashboard Counters Service)
+Mantiene en la tabla dashboard_counters los totales que muestra el resumen
+(tareas, subtareas, hábitos y metas completados).
+
+Los contadores se actualizan de forma incremental con triggers de SQLite sobre
+las tablas de origen (ver completion_counters): cualquier escritura de los
+servicios (o de otra conexión) ajusta el contador en la misma transacción. El
+resumen los lee con un único SELECT por clave primaria y recibe CountersChanged
+por el bus de eventos cuando cambian, sin volver a consultar las tablas de origen.
+"""
+
+from typing import Callable, Dict, List, Optional
+from app.services.completion_counters import (
+    COUNTER_SOURCES,
+    COUNTERS_TABLE,
+    GLOBAL_SCOPE,
+    install_counters,
+    recount_all,
+)
+from app.services.database_service import DatabaseService
+from app.services.event_bus import (
+    CountersChanged,
+    DomainEvent,
+    EventBus,
+    GoalUpdated,
+    HabitCompleted,
+    SubtaskToggled,
+    TaskCompleted,
+    TaskDeleted,
+    TaskStatusChanged,
+    event_bus,
+)
+
+# Eventos publicados por los servicios tras escribir en una tabla de origen
+SOURCE_EVENTS = (TaskStatusChanged, TaskCompleted, TaskDeleted, SubtaskToggled, HabitCompleted, GoalUpdated)
+
+
+class DashboardCountersService:
+    """Contadores materializados del resumen con actualización por triggers"""
+
+    def __init__(
+        self,
+        database_service: Optional[DatabaseService] = None,
+        user_id: str = "default_user",
+        bus: Optional[EventBus] = None,
+    ):
+        """
+        Args:
+            database_service: Servicio de BD (crea uno nuevo si no se proporciona)
+            user_id: Usuario cuyos contadores se publican en CountersChanged
+            bus: Bus de eventos (default: el bus global de la aplicación)
+        """
+        self.database_service = database_service or DatabaseService()
+        self.user_id = user_id
+        self.event_bus = bus or event_bus
+        self._initialized = False
+        self._stopped = False
+        self._last: Optional[Dict[str, int]] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    async def initialize(self):
+        """
+        Crea la tabla y los triggers de las tablas de origen que ya existen
+
+        Un contador cuyo trigger se crea por primera vez se recalcula desde su
+        tabla en la misma transacción; después solo lo ajustan los triggers.
+        Conviene llamarlo tras inicializar los demás servicios.
+        """
+        if self._initialized:
+            return
+        await self.database_service.initialize()
+        self._initialized, _ = await install_counters(self.database_service, "dashboard_counters_install")
+
+    def start(self):
+        """Publica CountersChanged cada vez que un servicio escribe en una tabla de origen"""
+        self._stopped = False
+        if self._unsubscribe is None:
+            self._unsubscribe = self.event_bus.subscribe(self._on_source_events, *SOURCE_EVENTS)
+
+    def stop(self):
+        """Cancela la suscripción al bus; refresh() deja de consultar la BD"""
+        self._stopped = True
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    async def get_counters(self, user_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Lee todos los contadores con un SELECT sobre la clave primaria
+
+        Args:
+            user_id: Usuario de las tareas completadas (default: el del servicio)
+
+        Returns:
+            {"tasks_completed", "subtasks_completed", "habits_completed", "goals_completed"}
+        """
+        await self.initialize()
+        cursor = await self.database_service.execute(
+            f"SELECT name, SUM(value) FROM {COUNTERS_TABLE} WHERE scope IN (?, ?) GROUP BY name",
+            (GLOBAL_SCOPE, user_id or self.user_id),
+        )
+        counters = dict.fromkeys(COUNTER_SOURCES, 0)
+        counters.update({name: int(value) for name, value in await cursor.fetchall()})
+        return counters
+
+    async def refresh(self) -> Dict[str, int]:
+        """
+        Relee los contadores y publica CountersChanged si cambiaron
+
+        Tras stop() o con la BD cerrada devuelve los últimos valores leídos sin
+        reabrir la conexión (un evento tardío no debe reconectar una BD cerrada).
+        """
+        if self._stopped or (self._last is not None and not self.database_service.is_connected):
+            return dict(self._last or {})
+        counters = await self.get_counters()
+        if counters != self._last:
+            self._last = counters
+            self.event_bus.publish(CountersChanged(user_id=self.user_id, counters=counters))
+        return counters
+
+    async def rebuild(self) -> Dict[str, int]:
+        """Recalcula todos los contadores desde las tablas de origen (reparación)"""
+        await self.initialize()
+        await recount_all(self.database_service, savepoint="dashboard_counters_rebuild")
+        return await self.refresh()
+
+    async def _on_source_events(self, events: List[DomainEvent]):
+        if self._unsubscribe is None:
+            return
+        try:
+            await self.refresh()
+        except Exception as e:
+            print(f"[DashboardCountersService] Error refrescando contadores: {e}")
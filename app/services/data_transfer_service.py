@@ -0,0 +1,270 @@
+"""
+Servicio de Exportación e Importación (Data Transfer Service)
+Vuelca y restaura todos los datos del usuario: tareas, subtareas, hábitos y sus
+completados, metas, recompensas y progreso (estado y libro mayor de puntos).
+
+Formatos:
+- "ndjson": un archivo con una línea por fila, {"table": ..., "row": {...}}
+- "csv": una carpeta con un <tabla>.csv por tabla; NULL se escribe como \\N
+
+Ambos pueden comprimirse con gzip. La exportación lee cada tabla con un cursor
+por lotes (fetchmany) y escribe lote a lote, sin cargar tablas enteras. La
+importación agrupa las filas en lotes de UPSERT dentro de una sola
+transacción: si algo falla no queda nada a medias.
+"""
+
+import csv
+import gzip
+import io
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from app.services.database_service import DatabaseService
+from app.services.goals_service import GOALS_TABLE
+from app.services.progress_service import LEDGER_TABLE, PROGRESS_TABLE
+from app.services.rewards_service import REWARDS_TABLE
+
+# Orden de exportación e importación (las subtareas después de sus tareas)
+EXPORT_TABLES = (
+    "tasks",
+    "subtasks",
+    "habits",
+    "habit_completions",
+    GOALS_TABLE,
+    REWARDS_TABLE,
+    PROGRESS_TABLE,
+    LEDGER_TABLE,
+)
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# Filas por lectura del cursor y por executemany del UPSERT
+EXPORT_BATCH_ROWS = 1000
+IMPORT_BATCH_ROWS = 5000
+
+CSV_NULL = "\\N"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class DataTransferService:
+    """Exportación e importación en streaming de los datos del usuario"""
+
+    def __init__(self, database_service: Optional[DatabaseService] = None):
+        """
+        Args:
+            database_service: Servicio de BD (crea uno nuevo si no se proporciona)
+        """
+        self.database_service = database_service or DatabaseService()
+        self._columns: Dict[str, List[Tuple[str, int]]] = {}
+
+    async def export_data(
+        self,
+        path: Union[str, Path],
+        fmt: str = "ndjson",
+        compress: bool = False,
+        tables: Tuple[str, ...] = EXPORT_TABLES,
+    ) -> Dict:
+        """
+        Exporta las tablas indicadas
+
+        Args:
+            path: Archivo (ndjson) o carpeta (csv) de destino
+            fmt: "ndjson" o "csv"
+            compress: Comprimir con gzip (los .csv pasan a .csv.gz)
+            tables: Tablas a exportar; las que no existen se omiten
+
+        Returns:
+            {"tables": {tabla: filas}, "rows", "seconds", "rows_per_second"}
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportación no soportado: {fmt}")
+        started = time.perf_counter()
+        await self.database_service.connect()
+        path = Path(path)
+        counts: Dict[str, int] = {}
+        if fmt == "ndjson":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with self._open_text(path, "w", compress) as handle:
+                for table in tables:
+                    if await self._table_columns(table):
+                        counts[table] = await self._export_ndjson(table, handle)
+        else:
+            path.mkdir(parents=True, exist_ok=True)
+            for table in tables:
+                if await self._table_columns(table):
+                    target = path / (f"{table}.csv.gz" if compress else f"{table}.csv")
+                    with self._open_text(target, "w", compress) as handle:
+                        counts[table] = await self._export_csv(table, handle)
+        return self._report("Exportadas", counts, started)
+
+    async def import_data(self, path: Union[str, Path], fmt: str = "ndjson") -> Dict:
+        """
+        Importa un volcado con UPSERT por lotes en una sola transacción
+
+        Las filas existentes (misma clave primaria) se actualizan; las que chocan
+        con otra restricción única (p. ej. el mismo hábito y día) se omiten. Los
+        espejos en memoria (hábitos, recompensas, tareas, progreso) deben
+        recargarse después.
+
+        Args:
+            path: Archivo (ndjson, con o sin gzip) o carpeta (csv) de origen
+            fmt: "ndjson" o "csv"
+
+        Returns:
+            {"tables": {tabla: filas}, "rows", "seconds", "rows_per_second"}
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de importación no soportado: {fmt}")
+        started = time.perf_counter()
+        db = self.database_service
+        await db.connect()
+        path = Path(path)
+        counts: Dict[str, int] = {}
+        async with db.savepoint("data_import"):
+            if fmt == "ndjson":
+                with self._open_text(path, "r", self._is_gzip(path)) as handle:
+                    await self._import_rows(self._read_ndjson(handle), counts)
+            else:
+                for table in EXPORT_TABLES:
+                    source = next(
+                        (p for p in (path / f"{table}.csv", path / f"{table}.csv.gz") if p.is_file()), None
+                    )
+                    if source is None:
+                        continue
+                    with self._open_text(source, "r", self._is_gzip(source)) as handle:
+                        await self._import_rows(self._read_csv(table, handle), counts)
+        await db.commit()
+        return self._report("Importadas", counts, started)
+
+    # ------------------------------------------------------------------
+    # Exportación
+    # ------------------------------------------------------------------
+    async def _export_ndjson(self, table: str, handle) -> int:
+        exported = 0
+        async for columns, rows in self._iter_table(table):
+            handle.write("".join(
+                json.dumps({"table": table, "row": dict(zip(columns, row))}, ensure_ascii=False) + "\n"
+                for row in rows
+            ))
+            exported += len(rows)
+        return exported
+
+    async def _export_csv(self, table: str, handle) -> int:
+        writer = csv.writer(handle)
+        writer.writerow([name for name, _ in await self._table_columns(table)])
+        exported = 0
+        async for _, rows in self._iter_table(table):
+            writer.writerows([CSV_NULL if value is None else value for value in row] for row in rows)
+            exported += len(rows)
+        return exported
+
+    async def _iter_table(self, table: str):
+        """Lotes (columnas, filas) de la tabla leídos con fetchmany"""
+        cursor = await self.database_service.execute(f"SELECT * FROM {table}")
+        columns = [description[0] for description in cursor.description]
+        try:
+            while True:
+                rows = await cursor.fetchmany(EXPORT_BATCH_ROWS)
+                if not rows:
+                    break
+                yield columns, rows
+        finally:
+            await cursor.close()
+
+    # ------------------------------------------------------------------
+    # Importación
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _read_ndjson(handle) -> Iterator[Tuple[str, Dict]]:
+        for line_number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield record["table"], record["row"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Línea {line_number} no válida en la importación: {e}") from e
+
+    @staticmethod
+    def _read_csv(table: str, handle) -> Iterator[Tuple[str, Dict]]:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if not header:
+            return
+        for values in reader:
+            yield table, {name: None if value == CSV_NULL else value for name, value in zip(header, values)}
+
+    async def _import_rows(self, records: Iterator[Tuple[str, Dict]], counts: Dict[str, int]):
+        """Agrupa filas consecutivas de la misma tabla y columnas en lotes de UPSERT"""
+        batch_key: Optional[Tuple[str, Tuple[str, ...]]] = None
+        batch: List[tuple] = []
+        for table, row in records:
+            if table not in EXPORT_TABLES:
+                raise ValueError(f"Tabla desconocida en la importación: {table}")
+            known = {name for name, _ in await self._table_columns(table)}
+            if not known:
+                raise ValueError(f"La tabla {table} no existe; inicializa los servicios antes de importar")
+            columns = tuple(name for name in row if name in known)
+            key = (table, columns)
+            if key != batch_key or len(batch) >= IMPORT_BATCH_ROWS:
+                await self._write_batch(batch_key, batch)
+                batch_key, batch = key, []
+            batch.append(tuple(row[name] for name in columns))
+            counts[table] = counts.get(table, 0) + 1
+        await self._write_batch(batch_key, batch)
+
+    async def _write_batch(self, key: Optional[Tuple[str, Tuple[str, ...]]], batch: List[tuple]):
+        if key is None or not batch:
+            return
+        table, columns = key
+        primary_key = [name for name, pk in await self._table_columns(table) if pk]
+        updates = [name for name in columns if name not in primary_key]
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        )
+        if primary_key and updates and set(primary_key) <= set(columns):
+            assignments = ", ".join(f"{name} = excluded.{name}" for name in updates)
+            query += f" ON CONFLICT({', '.join(primary_key)}) DO UPDATE SET {assignments}"
+        query += " ON CONFLICT DO NOTHING"
+        await self.database_service.executemany(query, batch)
+
+    # ------------------------------------------------------------------
+    # Utilidades
+    # ------------------------------------------------------------------
+    async def _table_columns(self, table: str) -> List[Tuple[str, int]]:
+        """Columnas (nombre, posición en la clave primaria) de la tabla; vacía si no existe"""
+        if table not in self._columns:
+            cursor = await self.database_service.execute(f"PRAGMA table_info({table})")
+            columns = [(row[1], int(row[5])) for row in await cursor.fetchall()]
+            if not columns:
+                return []
+            self._columns[table] = columns
+        return self._columns[table]
+
+    @staticmethod
+    def _open_text(path: Path, mode: str, compress: bool) -> io.TextIOBase:
+        if compress:
+            return gzip.open(path, f"{mode}t", encoding="utf-8", newline="")
+        return open(path, mode, encoding="utf-8", newline="")
+
+    @staticmethod
+    def _is_gzip(path: Path) -> bool:
+        with open(path, "rb") as handle:
+            return handle.read(2) == _GZIP_MAGIC
+
+    @staticmethod
+    def _report(verb: str, counts: Dict[str, int], started: float) -> Dict:
+        seconds = time.perf_counter() - started
+        rows = sum(counts.values())
+        result = {
+            "tables": counts,
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds > 0 else float(rows),
+        }
+        print(
+            f"[DataTransferService] {verb} {rows} filas de {len(counts)} tablas "
+            f"en {seconds:.2f}s ({result['rows_per_second']:.0f} filas/s)"
+        )
+        return result
@@ -4,8 +4,12 @@ Servicio genérico y reutilizable para todos los módulos de la aplicación
 """
 
 import aiosqlite
+import asyncio
 import json
-from typing import Optional, List, Dict, Any
+import re
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, List, Dict, Any
 from datetime import datetime, date
 from app.utils.helpers import get_database_path, ensure_database_directory
 
@@ -20,7 +24,7 @@ class TableSchema:
         columns: Dict[str, str],  # {"column_name": "TEXT NOT NULL", ...}
         primary_key: str = "id",
         foreign_keys: Optional[List[Dict[str, str]]] = None,  # [{"column": "task_id", "references": "tasks(id)"}]
-        indexes: Optional[List[str]] = None,  # ["user_id", "status"]
+        indexes: Optional[List[str]] = None,  # ["user_id", "status", "points DESC, id"]
     ):
         self.table_name = table_name
         self.columns = columns
@@ -49,6 +53,11 @@ class DatabaseService:
         self.db_path = db_path
         self._connection: Optional[aiosqlite.Connection] = None
         self._registered_schemas: Dict[str, TableSchema] = {}
+        # Serializa savepoints y commits entre corrutinas (reentrante por tarea):
+        # un commit ajeno a mitad de un savepoint lo liberaría
+        self._tx_lock = asyncio.Lock()
+        self._tx_owner: Optional[asyncio.Task] = None
+        self._tx_depth = 0
     
     async def connect(self):
         """Establece conexión con la base de datos"""
@@ -57,6 +66,11 @@ class DatabaseService:
             await self._connection.execute("PRAGMA foreign_keys = ON")
             await self._connection.commit()
     
+    @property
+    def is_connected(self) -> bool:
+        """Indica si hay una conexión abierta"""
+        return self._connection is not None
+
     async def disconnect(self):
         """Cierra la conexión con la base de datos"""
         if self._connection:
@@ -113,7 +127,8 @@ class DatabaseService:
     async def _create_indexes(self, schema: TableSchema):
         """Crea índices para una tabla"""
         for index_col in schema.indexes:
-            index_name = f"idx_{schema.table_name}_{index_col}"
+            # Admite índices compuestos ("points DESC, id" -> idx_users_points_DESC_id)
+            index_name = f"idx_{schema.table_name}_{re.sub(r'[^0-9A-Za-z]+', '_', index_col).strip('_')}"
             await self.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {schema.table_name}({index_col})")
     
     # ============================================================================
@@ -121,27 +136,125 @@ class DatabaseService:
     # ============================================================================
     
     async def execute(self, query: str, parameters: tuple = ()) -> aiosqlite.Cursor:
-        """Ejecuta una consulta SQL"""
+        """Ejecuta una consulta SQL (espera si otra tarea tiene un savepoint abierto)"""
         if self._connection is None:
             await self.connect()
+        if self._must_wait_tx():
+            async with self._tx_lock:
+                return await self._connection.execute(query, parameters)
         return await self._connection.execute(query, parameters)
     
     async def executemany(self, query: str, parameters: List[tuple]) -> aiosqlite.Cursor:
-        """Ejecuta una consulta SQL múltiples veces"""
+        """Ejecuta una consulta SQL múltiples veces (espera como execute)"""
         if self._connection is None:
             await self.connect()
+        if self._must_wait_tx():
+            async with self._tx_lock:
+                return await self._connection.executemany(query, parameters)
         return await self._connection.executemany(query, parameters)
+
+    def _must_wait_tx(self) -> bool:
+        # Una sentencia ajena dentro de un savepoint abierto se desharía con su ROLLBACK TO.
+        # Sin savepoint abierto se encola sin esperar: la cola de aiosqlite es FIFO y
+        # un BEGIN posterior llega detrás de ella.
+        return self._tx_lock.locked() and not self.owns_transaction()
     
     async def commit(self):
-        """Confirma los cambios en la base de datos"""
+        """Confirma los cambios en la base de datos (espera a los savepoints abiertos)"""
         if self._connection:
-            await self._connection.commit()
+            await self._acquire_tx()
+            try:
+                if self._connection:
+                    await self._connection.commit()
+            finally:
+                self._release_tx()
     
     async def rollback(self):
         """Revierte los cambios en la base de datos"""
         if self._connection:
-            await self._connection.rollback()
+            await self._acquire_tx()
+            try:
+                if self._connection:
+                    await self._connection.rollback()
+            finally:
+                self._release_tx()
+
+    def owns_transaction(self) -> bool:
+        """Indica si la tarea actual tiene abierto un savepoint (o un commit) en curso"""
+        task = asyncio.current_task()
+        return task is not None and self._tx_owner is task
+
+    async def _acquire_tx(self):
+        task = asyncio.current_task()
+        if task is not None and self._tx_owner is task:
+            self._tx_depth += 1
+            return
+        await self._tx_lock.acquire()
+        self._tx_owner = task
+        self._tx_depth = 1
+
+    def _release_tx(self):
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            self._tx_owner = None
+            self._tx_lock.release()
+
+    @asynccontextmanager
+    async def savepoint(self, name: str) -> AsyncIterator[None]:
+        """
+        Agrupa escrituras en un SAVEPOINT dentro de la transacción abierta
+
+        Si el bloque falla solo se deshacen sus escrituras (ROLLBACK TO); lo que
+        se escribió antes de abrirlo en la conexión compartida se conserva. No
+        confirma: el commit sigue siendo del llamador. Mientras el bloque está
+        abierto, las sentencias, commits y savepoints de otras tareas esperan a
+        que se cierre, así ninguna cae dentro de él.
+
+        Args:
+            name: Nombre del savepoint (identificador SQL)
+        """
+        await self.connect()
+        await self._acquire_tx()
+        try:
+            if not self._connection.in_transaction:
+                # Sin BEGIN explícito, RELEASE del savepoint más externo confirmaría
+                try:
+                    await self._connection.execute("BEGIN")
+                except sqlite3.OperationalError:
+                    # Una escritura encolada antes por otra tarea ya abrió la transacción
+                    if not self._connection.in_transaction:
+                        raise
+            await self._connection.execute(f"SAVEPOINT {name}")
+            try:
+                yield
+            except BaseException:
+                if self._connection is not None and self._connection.in_transaction:
+                    await self._connection.execute(f"ROLLBACK TO {name}")
+                    await self._connection.execute(f"RELEASE {name}")
+                raise
+            # Un commit dentro del bloque ya liberó el savepoint
+            if self._connection is not None and self._connection.in_transaction:
+                await self._connection.execute(f"RELEASE {name}")
+        finally:
+            self._release_tx()
     
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        """
+        Reserva la conexión para sentencias que no admiten una transacción abierta (VACUUM)
+
+        Confirma lo pendiente y, mientras dura el bloque, los commits y
+        savepoints de otras tareas esperan.
+        """
+        await self.connect()
+        await self._acquire_tx()
+        try:
+            if self._connection.in_transaction:
+                await self._connection.commit()
+            yield
+        finally:
+            self._release_tx()
+
     # ============================================================================
     # MÉTODOS GENÉRICOS CRUD (Reutilizables para cualquier tabla)
     # ============================================================================
@@ -0,0 +1,174 @@
+"""
+Bus de Eventos (Event Bus)
+Publica cambios de dominio (tareas, subtareas, hábitos, metas, puntos) a suscriptores
+dentro del proceso. Los eventos publicados en la misma vuelta del event loop se
+entregan juntos: cada suscriptor recibe una sola llamada con la lista de eventos
+que le interesan, así varias acciones seguidas producen una sola actualización de UI.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """Evento base; occurred_at se fija al crearlo"""
+    occurred_at: str = field(default_factory=lambda: datetime.now().isoformat(), kw_only=True)
+
+
+@dataclass(frozen=True)
+class TaskCompleted(DomainEvent):
+    """Una tarea pasó a completada"""
+    task_id: str
+    title: str = ""
+
+
+@dataclass(frozen=True)
+class TaskStatusChanged(DomainEvent):
+    """El estado de una tarea cambió en cualquier sentido (previous_status=None al crearla)"""
+    task_id: str
+    status: str
+    previous_status: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class TaskDeleted(DomainEvent):
+    """Una tarea (y sus subtareas) se eliminó"""
+    task_id: str
+
+
+@dataclass(frozen=True)
+class SubtaskToggled(DomainEvent):
+    """Una subtarea se marcó o desmarcó"""
+    subtask_id: str
+    task_id: str
+    completed: bool
+
+
+@dataclass(frozen=True)
+class HabitCompleted(DomainEvent):
+    """Un hábito se marcó (completed=True) o desmarcó en un día"""
+    habit_id: str
+    day: str
+    completed: bool = True
+
+
+@dataclass(frozen=True)
+class GoalUpdated(DomainEvent):
+    """Una meta se creó, cambió o eliminó (deleted=True)"""
+    goal_id: str
+    completed: bool = False
+    deleted: bool = False
+
+
+@dataclass(frozen=True)
+class PointsChanged(DomainEvent):
+    """El total de puntos cambió; stats tiene la forma de ProgressService.get_stats"""
+    points: float
+    level: str
+    delta: float = 0.0
+    level_up: bool = False
+    stats: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+@dataclass(frozen=True)
+class CountersChanged(DomainEvent):
+    """Contadores del resumen tras un cambio; forma de DashboardCountersService.get_counters"""
+    user_id: str
+    counters: Dict[str, int] = field(default_factory=dict, compare=False)
+
+
+# handler(events) puede ser síncrono o devolver una corrutina
+EventHandler = Callable[[List[DomainEvent]], Any]
+
+
+class EventBus:
+    """Bus de eventos asyncio con entrega agrupada por vuelta del event loop"""
+
+    def __init__(self):
+        self._subscribers: List[Tuple[EventHandler, Tuple[Type[DomainEvent], ...]]] = []
+        self._pending: List[DomainEvent] = []
+        self._dispatch_handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def subscribe(self, handler: EventHandler, *event_types: Type[DomainEvent]) -> Callable[[], None]:
+        """
+        Suscribe un handler a uno o varios tipos de evento
+
+        Args:
+            handler: Recibe la lista de eventos de una vuelta del loop
+            event_types: Tipos de interés (sin tipos = todos)
+
+        Returns:
+            Función que cancela la suscripción
+        """
+        entry = (handler, event_types or (DomainEvent,))
+        self._subscribers.append(entry)
+
+        def unsubscribe():
+            if entry in self._subscribers:
+                self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def publish(self, event: DomainEvent):
+        """Encola un evento; se entrega al final de la vuelta actual del loop"""
+        self._pending.append(event)
+        if self._dispatch_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sin event loop (scripts, tests síncronos): entregar de inmediato
+            self._dispatch()
+            return
+        self._dispatch_handle = loop.call_soon(self._dispatch)
+
+    async def drain(self):
+        """Entrega los eventos pendientes y espera a los handlers asíncronos"""
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _dispatch(self):
+        self._dispatch_handle = None
+        events, self._pending = self._pending, []
+        if not events:
+            return
+        for handler, event_types in list(self._subscribers):
+            matching = [event for event in events if isinstance(event, event_types)]
+            if not matching:
+                continue
+            try:
+                result = handler(matching)
+            except Exception as e:
+                print(f"[EventBus] Error en suscriptor {getattr(handler, '__qualname__', handler)}: {e}")
+                continue
+            if asyncio.iscoroutine(result):
+                self._track(result)
+
+    def _track(self, coroutine):
+        try:
+            task = asyncio.get_running_loop().create_task(self._run_handler(coroutine))
+        except RuntimeError:
+            coroutine.close()
+            print("[EventBus] Suscriptor asíncrono ignorado: no hay event loop")
+            return
+        # Guardar la referencia para que la tarea no se pierda
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _run_handler(coroutine):
+        try:
+            await coroutine
+        except Exception as e:
+            print(f"[EventBus] Error en suscriptor asíncrono: {e}")
+
+
+# Bus compartido por servicios y vistas de la aplicación
+event_bus = EventBus()
@@ -1,11 +1,16 @@
 """
 Servicio de Metas (GoalsService)
-Gestiona operaciones CRUD y persistencia en memoria (puedes adaptar a BD)
+Gestiona operaciones CRUD y persistencia de metas en BD.
+
+`goal_class` (incremental/reductual) y `completed` son columnas reales;
+`completed` se recalcula en SQL en cada escritura para que los listados y
+conteos filtren por índice sin cargar todas las metas.
 """
-import asyncio
+from datetime import datetime
 from typing import List, Optional
 from app.models.goal import Goal
 from app.services.database_service import DatabaseService, TableSchema
+from app.services.event_bus import GoalUpdated, event_bus
 
 GOALS_TABLE = "goals"
 
@@ -22,33 +27,165 @@ GOALS_SCHEMA = TableSchema(
         "progress": "REAL",
         "created_at": "TEXT",
         "updated_at": "TEXT",
+        "goal_class": "TEXT NOT NULL DEFAULT 'incremental'",
+        "completed": "INTEGER NOT NULL DEFAULT 0",
     },
     primary_key="id",
+    # Los índices sobre goal_class/completed se crean en initialize, tras migrar
+    # las BD antiguas que aún no tienen esas columnas
     indexes=["goal_type", "unit_type"]
 )
 
+# Índices sobre las columnas nuevas: (completed, goal_class) sirve el conteo
+# de cumplidas y los listados por clase y estado
+GOALS_MIGRATED_INDEXES = {
+    "idx_goals_completed_goal_class": "completed, goal_class",
+    "idx_goals_goal_class": "goal_class",
+}
+
+# Misma regla que Goal.completed, evaluada en SQL
+COMPLETED_SQL = (
+    "CASE WHEN target > 0 AND ("
+    "(goal_class = 'reductual' AND progress <= target) OR "
+    "(goal_class <> 'reductual' AND progress >= target)"
+    ") THEN 1 ELSE 0 END"
+)
+
+
 class GoalsService:
     def __init__(self, db_service: DatabaseService = None):
         self.db = db_service or DatabaseService()
         self.db.register_table_schema(GOALS_SCHEMA)
+        self._initialized = False
         # La inicialización debe hacerse de forma asíncrona fuera del constructor
 
+    async def initialize(self):
+        """Crea la tabla, migra goal_class/completed en BD antiguas y crea sus índices"""
+        if self._initialized:
+            return
+        await self.db.initialize()
+        cursor = await self.db.execute(f"PRAGMA table_info({GOALS_TABLE})")
+        existing = {row[1] for row in await cursor.fetchall()}
+        if "goal_class" not in existing:
+            await self.db.execute(
+                f"ALTER TABLE {GOALS_TABLE} ADD COLUMN goal_class TEXT NOT NULL DEFAULT 'incremental'"
+            )
+        if "completed" not in existing:
+            await self.db.execute(
+                f"ALTER TABLE {GOALS_TABLE} ADD COLUMN completed INTEGER NOT NULL DEFAULT 0"
+            )
+            await self.db.execute(f"UPDATE {GOALS_TABLE} SET completed = {COMPLETED_SQL}")
+            print("[GoalsService] Columnas goal_class/completed migradas")
+        for index_name, columns in GOALS_MIGRATED_INDEXES.items():
+            await self.db.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {GOALS_TABLE}({columns})")
+        await self.db.commit()
+        self._initialized = True
+
     async def create_goal(self, **kwargs) -> Goal:
+        await self.initialize()
         goal = Goal.from_dict(kwargs)
         await self.db.create(GOALS_TABLE, goal.to_dict())
+        event_bus.publish(GoalUpdated(goal_id=goal.id, completed=goal.completed))
         return goal
 
     async def get_goal(self, goal_id: str) -> Optional[Goal]:
+        await self.initialize()
         data = await self.db.get(GOALS_TABLE, goal_id)
         return Goal.from_dict(data) if data else None
 
-    async def list_goals(self) -> List[Goal]:
-        rows = await self.db.get_all(GOALS_TABLE, order_by="created_at DESC")
+    async def list_goals(
+        self,
+        goal_class: Optional[str] = None,
+        goal_type: Optional[str] = None,
+        completed: Optional[bool] = None,
+    ) -> List[Goal]:
+        """
+        Lista metas, opcionalmente filtradas en SQL
+
+        Args:
+            goal_class: incremental o reductual
+            goal_type: Categoría de la meta (Salud, ...)
+            completed: True = cumplidas, False = en progreso
+        """
+        await self.initialize()
+        filters = {}
+        if goal_class is not None:
+            filters["goal_class"] = goal_class
+        if goal_type is not None:
+            filters["goal_type"] = goal_type
+        if completed is not None:
+            filters["completed"] = completed
+        rows = await self.db.get_all(GOALS_TABLE, filters=filters or None, order_by="created_at DESC")
         return [Goal.from_dict(row) for row in rows]
 
+    async def count_completed(self, goal_class: Optional[str] = None) -> int:
+        """Cuenta las metas cumplidas (usa el índice (completed, goal_class))"""
+        await self.initialize()
+        query = f"SELECT COUNT(*) FROM {GOALS_TABLE} WHERE completed = 1"
+        params: tuple = ()
+        if goal_class is not None:
+            query += " AND goal_class = ?"
+            params = (goal_class,)
+        cursor = await self.db.execute(query, params)
+        row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
     async def update_goal(self, goal_id: str, **kwargs) -> Optional[Goal]:
+        await self.initialize()
+        kwargs.pop("completed", None)  # Derivado: se recalcula abajo
         updated = await self.db.update(GOALS_TABLE, goal_id, kwargs)
-        return Goal.from_dict(updated) if updated else None
+        if not updated:
+            return None
+        goal = Goal.from_dict(updated)
+        if bool(updated.get("completed")) != goal.completed:
+            await self.db.execute(
+                f"UPDATE {GOALS_TABLE} SET completed = ? WHERE id = ?", (int(goal.completed), goal_id)
+            )
+            await self.db.commit()
+        event_bus.publish(GoalUpdated(goal_id=goal_id, completed=goal.completed))
+        return goal
+
+    async def step_progress(self, goal_id: str, action: str = "incremental") -> Optional[Goal]:
+        """
+        Avanza una unidad el progreso de una meta y devuelve solo esa meta
+
+        Incremental suma 1; reductual resta 1 sin bajar del objetivo.
+        Una meta reductual siempre resta; `action="reductual"` (botón de
+        reducir) resta 1 también en una incremental, sin bajar de 0.
+        El progreso y `completed` se actualizan en SQL sin releer el listado.
+
+        Args:
+            goal_id: ID de la meta
+            action: "incremental" o "reductual"
+
+        Returns:
+            La meta actualizada o None si no existe
+        """
+        await self.initialize()
+        cursor = await self.db.execute(
+            f"""
+            UPDATE {GOALS_TABLE}
+            SET progress = CASE
+                    WHEN goal_class = 'reductual' THEN MAX(progress - 1, target)
+                    WHEN ? THEN MAX(progress - 1, 0)
+                    ELSE progress + 1 END,
+                updated_at = ?
+            WHERE id = ?
+            """,
+            (action == "reductual", datetime.now().isoformat(), goal_id),
+        )
+        if cursor.rowcount == 0:
+            return None
+        # Sentencia aparte: en un UPDATE, COMPLETED_SQL vería el progreso anterior
+        await self.db.execute(f"UPDATE {GOALS_TABLE} SET completed = {COMPLETED_SQL} WHERE id = ?", (goal_id,))
+        await self.db.commit()
+        goal = await self.get_goal(goal_id)
+        event_bus.publish(GoalUpdated(goal_id=goal_id, completed=goal.completed))
+        return goal
 
     async def delete_goal(self, goal_id: str) -> bool:
-        return await self.db.delete(GOALS_TABLE, goal_id)
+        await self.initialize()
+        deleted = await self.db.delete(GOALS_TABLE, goal_id)
+        if deleted:
+            event_bus.publish(GoalUpdated(goal_id=goal_id, deleted=True))
+        return deleted
@@ -3,11 +3,115 @@ Servicio de Hábitos (Habits Service)
 Gestiona la lógica de negocio y persistencia de hábitos en BD
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import csv
+import json
+import time
 import uuid
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from app.logic.habit_streaks import (
+    PERIOD_BUCKET_SQL,
+    StreakInfo,
+    apply_completion,
+    compute_streaks,
+    expected_completions,
+    next_period_start,
+    period_start,
+)
+from app.logic.system_points import HABIT_ACTION_BY_FREQUENCY
 from app.models.habit import Habit
 from app.services.database_service import DatabaseService
+from app.services.event_bus import HabitCompleted, event_bus
+
+COMPLETIONS_DAY_INDEX = "idx_habit_completions_habit_day"
+COMPLETIONS_DATE_INDEX = "idx_habit_completions_completed_at"
+
+# Tamaño de lote para consultas con IN (...) (límite de variables de SQLite)
+_CHUNK_SIZE = 500
+# Filas por executemany/commit al importar historial
+IMPORT_CHUNK_SIZE = 5000
+
+
+def read_completions_csv(path: Union[str, Path]) -> Iterator[Tuple[str, str]]:
+    """
+    Lee pares (habit_id, fecha) de un CSV con columnas habit_id y date
+    
+    Es un generador: el archivo se recorre fila a fila sin cargarlo entero.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            yield row.get("habit_id", ""), row.get("date", "")
+
+
+def read_completions_json(path: Union[str, Path]) -> Iterator[Tuple[str, str]]:
+    """
+    Lee pares (habit_id, fecha) de JSON: una lista de objetos {"habit_id", "date"}
+    o JSON Lines (un objeto por línea)
+
+    Ambos formatos se leen en streaming: de una lista solo se mantiene en
+    memoria el bloque leído y el objeto que se está decodificando.
+    """
+    with open(path, encoding="utf-8") as handle:
+        first = handle.read(1)
+        while first.isspace():
+            first = handle.read(1)
+        if first == "[":
+            for item in _iter_json_array(handle):
+                yield item.get("habit_id", ""), item.get("date", "")
+            return
+        handle.seek(0)
+        for line in handle:
+            if line.strip():
+                item = json.loads(line)
+                yield item.get("habit_id", ""), item.get("date", "")
+
+
+def _iter_json_array(handle, chunk_size: int = 64 * 1024) -> Iterator:
+    """Decodifica uno a uno los elementos de una lista JSON cuyo "[" ya se leyó"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    expect_value = True
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Lista JSON sin cerrar")
+            buffer, pos = buffer[pos:] + handle.read(chunk_size), 0
+            eof = pos >= len(buffer)
+            continue
+        char = buffer[pos]
+        if char == "]":
+            return
+        if not expect_value:
+            if char != ",":
+                raise ValueError(f"Se esperaba ',' en la lista JSON y se encontró {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # Un valor que llega al final del bloque puede estar cortado: leer más
+        if end is None or (end == len(buffer) and not eof):
+            chunk = handle.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+        expect_value = False
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+# Granularidad de las series de analítica -> frecuencia de agrupación
+SERIES_GRANULARITY = {"day": "daily", "week": "weekly", "month": "monthly"}
+# Periodos que cubre una serie cuando no se indica fecha inicial
+SERIES_DEFAULT_PERIODS = {"day": 84, "week": 12, "month": 12}
 
 
 class HabitsService:
@@ -22,9 +126,18 @@ class HabitsService:
         """
         self.database_service = database_service or DatabaseService()
         self.habits: Dict[str, Habit] = {}
+        # Rachas calculadas desde el historial, actualizadas en cada completado
+        self._streaks: Dict[str, StreakInfo] = {}
+        # Series de analítica por hábito (None = todos) y (granularidad, inicio, fin)
+        self._series: Dict[Optional[str], Dict[Tuple[str, str, str], List[Dict]]] = {}
     
-    async def initialize(self):
-        """Inicializa la tabla de hábitos en la BD"""
+    async def initialize(self, load: bool = True):
+        """
+        Inicializa la tabla de hábitos en la BD
+
+        Args:
+            load: Si False, conserva el espejo en memoria (p. ej. restaurado de un snapshot)
+        """
         try:
             await self.database_service.execute(
                 """
@@ -61,12 +174,13 @@ class HabitsService:
                 )
                 """
             )
-            await self.database_service.commit()
+            await self._ensure_completion_indexes()
             await self.database_service.commit()
             print("[HabitsService] Tabla de hábitos creada/verificada")
             
             # Cargar hábitos existentes
-            await self.load_from_db()
+            if load:
+                await self.load_from_db()
         except Exception as e:
             print(f"[HabitsService] Error inicializando BD: {e}")
     
@@ -111,6 +225,7 @@ class HabitsService:
             
             self.habits[habit.id] = habit
             await self._save_to_db(habit)
+            self.invalidate_series(habit.id)
             print(f"[HabitsService] Hábito creado: {habit.title}")
             return habit
         except Exception as e:
@@ -136,23 +251,225 @@ class HabitsService:
             
             # Si ya fue completado hoy, desmarcarlo
             if habit.was_completed_today():
-                # Desmarcar: restar 1 a la racha (mínimo 0)
-                habit.streak = max(0, habit.streak - 1)
                 habit.last_completed = None
                 await self._remove_today_completion_record(habit_id)
+                # Quitar un completado puede romper la racha: recalcular desde el historial
+                self._streaks.pop(habit_id, None)
                 was_completed = False
             else:
                 # Marcar como completado
                 habit.complete_today()
-                await self._add_completion_record(habit)
+                if await self._add_completion_record(habit):
+                    self._record_streak_completion(habit, datetime.now().date())
                 was_completed = True
+            self.invalidate_series(habit_id)
             
+            # La racha se deriva del historial agrupado por periodo
+            habit.streak = await self.get_current_streak(habit_id)
             await self._update_in_db(habit)
+            event_bus.publish(HabitCompleted(
+                habit_id=habit_id, day=datetime.now().date().isoformat(), completed=was_completed
+            ))
             return was_completed
         except Exception as e:
             print(f"[HabitsService] Error completando hábito: {e}")
             raise
 
+    async def complete_habits(
+        self,
+        habit_ids: Iterable[str],
+        on_date: Optional[Union[date, str]] = None,
+        progress_service=None,
+    ) -> Dict:
+        """
+        Marca varios hábitos como completados en una fecha con una sola transacción
+        
+        A diferencia de complete_habit no alterna: un hábito ya completado ese día
+        se deja como está. Los puntos se otorgan con source_id "<habit_id>:<fecha>"
+        (el mismo que usa HabitsView), así que repetir el lote no duplica puntos.
+        Si progress_service comparte la conexión de BD, completados, rachas y
+        puntos se confirman juntos.
+        
+        Args:
+            habit_ids: IDs de los hábitos
+            on_date: Fecha del completado (por defecto, hoy)
+            progress_service: Servicio de progreso para otorgar los puntos (opcional)
+        
+        Returns:
+            {"results": {habit_id: "completed" | "already_completed" | "not_found"},
+             "streaks": {habit_id: racha vigente}, "points_delta": puntos sumados}
+        """
+        day = date.fromisoformat(self._iso_day(on_date)) if on_date else datetime.now().date()
+        day_iso = day.isoformat()
+        results: Dict[str, str] = {}
+        habits: List[Habit] = []
+        for habit_id in dict.fromkeys(habit_ids):
+            habit = self.habits.get(habit_id)
+            if habit is None:
+                results[habit_id] = "not_found"
+            else:
+                habits.append(habit)
+        if not habits:
+            return {"results": results, "streaks": {}, "points_delta": 0.0}
+
+        db = self.database_service
+        now = datetime.now()
+        try:
+            async with db.savepoint("habits_batch"):
+                existing = await self._completed_on(day_iso, [habit.id for habit in habits])
+                new_habits = [habit for habit in habits if habit.id not in existing]
+                await db.executemany(
+                    """
+                    INSERT OR IGNORE INTO habit_completions (id, habit_id, frequency, completed_at, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [(str(uuid.uuid4()), habit.id, habit.frequency, day_iso, now.isoformat()) for habit in new_habits],
+                )
+
+                # last_completed guarda fecha y hora; para otro día se usa el inicio de ese día
+                completed_at = now.isoformat() if day == now.date() else datetime.combine(day, datetime.min.time()).isoformat()
+                streaks: Dict[str, int] = {}
+                for habit in habits:
+                    if habit.id in existing:
+                        results[habit.id] = "already_completed"
+                    else:
+                        results[habit.id] = "completed"
+                        self._record_streak_completion(habit, day)
+                        if habit.last_completed is None or habit.last_completed[:10] < day_iso:
+                            habit.last_completed = completed_at
+                    habit.streak = await self.get_current_streak(habit.id)
+                    streaks[habit.id] = habit.streak
+                await db.executemany(
+                    "UPDATE habits SET streak = ?, last_completed = ? WHERE id = ?",
+                    [(habit.streak, habit.last_completed, habit.id) for habit in habits],
+                )
+
+                points_delta = 0.0
+                if progress_service is not None:
+                    # Incluye los ya completados: si un lote anterior se cortó antes de
+                    # otorgar sus puntos, el libro mayor los completa sin duplicar
+                    awards = [
+                        (HABIT_ACTION_BY_FREQUENCY.get(habit.frequency, HABIT_ACTION_BY_FREQUENCY["daily"]), f"{habit.id}:{day_iso}")
+                        for habit in habits
+                    ]
+                    if progress_service.database_service is not db:
+                        await db.commit()
+                    points_delta = (await progress_service.add_awards(awards))["points_delta"]
+            await db.commit()
+        except Exception as e:
+            print(f"[HabitsService] Error completando hábitos en lote: {e}")
+            self.invalidate_streak()
+            await self.load_from_db()
+            raise
+        finally:
+            self.invalidate_series()
+
+        for habit in new_habits:
+            event_bus.publish(HabitCompleted(habit_id=habit.id, day=day_iso))
+        print(f"[HabitsService] {len(new_habits)}/{len(habits)} hábitos completados el {day_iso}")
+        return {"results": results, "streaks": streaks, "points_delta": points_delta}
+
+    async def import_completions(
+        self,
+        completions: Iterable[Tuple[str, Union[date, str]]],
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> Dict:
+        """
+        Importa completados históricos (p. ej. de otra app) en bloque
+        
+        Inserta con executemany por lotes (un commit por lote, así que una
+        importación cortada puede repetirse: los días ya registrados se ignoran)
+        y recalcula rachas y last_completed una sola vez al final. No otorga puntos.
+        
+        Args:
+            completions: Pares (habit_id, fecha); acepta generadores como
+                read_completions_csv o read_completions_json
+            chunk_size: Filas por lote
+        
+        Returns:
+            Diccionario con read, inserted, duplicates, unknown_habits,
+            invalid_dates, habits_updated, seconds y rows_per_second
+        """
+        started = time.perf_counter()
+        report = {"read": 0, "inserted": 0, "duplicates": 0, "unknown_habits": 0, "invalid_dates": 0}
+        latest: Dict[str, str] = {}
+        created_at = datetime.now().isoformat()
+        db = self.database_service
+        batch: List[tuple] = []
+
+        async def write_batch():
+            async with db.savepoint("habits_import_batch"):
+                cursor = await db.executemany(
+                    """
+                    INSERT OR IGNORE INTO habit_completions (id, habit_id, frequency, completed_at, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    batch,
+                )
+            await db.commit()
+            inserted = max(0, cursor.rowcount)
+            report["inserted"] += inserted
+            report["duplicates"] += len(batch) - inserted
+            batch.clear()
+
+        try:
+            for habit_id, day in completions:
+                report["read"] += 1
+                habit = self.habits.get(habit_id)
+                if habit is None:
+                    report["unknown_habits"] += 1
+                    continue
+                try:
+                    day_iso = date.fromisoformat(self._iso_day(day)).isoformat()
+                except (TypeError, ValueError):
+                    report["invalid_dates"] += 1
+                    continue
+                batch.append((str(uuid.uuid4()), habit_id, habit.frequency, day_iso, created_at))
+                if day_iso > latest.get(habit_id, ""):
+                    latest[habit_id] = day_iso
+                if len(batch) >= chunk_size:
+                    await write_batch()
+            if batch:
+                await write_batch()
+
+            # Rachas y último completado: una vez por hábito tocado
+            updated: List[Habit] = []
+            for habit_id, day_iso in latest.items():
+                habit = self.habits[habit_id]
+                self.invalidate_streak(habit_id)
+                self.invalidate_series(habit_id)
+                if habit.last_completed is None or habit.last_completed[:10] < day_iso:
+                    habit.last_completed = datetime.combine(date.fromisoformat(day_iso), datetime.min.time()).isoformat()
+                habit.streak = await self.get_current_streak(habit_id)
+                updated.append(habit)
+            if updated:
+                async with db.savepoint("habits_import_streaks"):
+                    await db.executemany(
+                        "UPDATE habits SET streak = ?, last_completed = ? WHERE id = ?",
+                        [(habit.streak, habit.last_completed, habit.id) for habit in updated],
+                    )
+                await db.commit()
+        except Exception as e:
+            print(f"[HabitsService] Error importando completados: {e}")
+            raise
+
+        if report["inserted"]:
+            # Un evento por hábito; el bus los entrega juntos en la misma vuelta
+            for habit_id, day_iso in latest.items():
+                event_bus.publish(HabitCompleted(habit_id=habit_id, day=day_iso))
+
+        seconds = time.perf_counter() - started
+        report.update(
+            habits_updated=len(latest),
+            seconds=seconds,
+            rows_per_second=report["read"] / seconds if seconds > 0 else 0.0,
+        )
+        print(
+            f"[HabitsService] Importados {report['inserted']}/{report['read']} completados "
+            f"en {seconds:.2f}s ({report['rows_per_second']:.0f} filas/s)"
+        )
+        return report
+
     async def update_habit(
         self,
         habit_id: str,
@@ -171,6 +488,10 @@ class HabitsService:
             habit.description = description
             habit.frequency = frequency
             habit.frequency_times = frequency_times
+            # La frecuencia cambia cómo se agrupan los periodos y lo esperado en las series
+            self.invalidate_streak(habit_id)
+            self.invalidate_series(habit_id)
+            habit.streak = await self.get_current_streak(habit_id)
             await self._update_in_db(habit)
             return habit
         except Exception as e:
@@ -193,6 +514,8 @@ class HabitsService:
                 return False
             
             del self.habits[habit_id]
+            self.invalidate_streak(habit_id)
+            self.invalidate_series(habit_id)
             await self._delete_from_db(habit_id)
             print(f"[HabitsService] Hábito eliminado: {habit_id}")
             return True
@@ -229,6 +552,221 @@ class HabitsService:
     async def count_completion_records(self) -> int:
         """Cuenta cuántos completados de hábitos existen"""
         return await self.database_service.count("habit_completions")
+
+    async def completions_between(
+        self,
+        habit_id: str,
+        start: Union[date, str],
+        end: Union[date, str],
+    ) -> List[Dict]:
+        """
+        Registros de completado de un hábito en un rango de fechas (inclusive)
+        
+        Usa el índice único (habit_id, completed_at).
+        
+        Args:
+            habit_id: ID del hábito
+            start: Fecha inicial
+            end: Fecha final
+        
+        Returns:
+            Lista de registros ordenados por fecha
+        """
+        cursor = await self.database_service.execute(
+            """
+            SELECT id, habit_id, frequency, completed_at, created_at FROM habit_completions
+            WHERE habit_id = ? AND completed_at BETWEEN ? AND ?
+            ORDER BY completed_at
+            """,
+            (habit_id, self._iso_day(start), self._iso_day(end)),
+        )
+        rows = await cursor.fetchall()
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    async def count_completions_between(
+        self,
+        start: Union[date, str],
+        end: Union[date, str],
+        habit_id: Optional[str] = None,
+    ) -> int:
+        """
+        Cuenta completados en un rango de fechas (inclusive), de un hábito o de todos
+        
+        Args:
+            start: Fecha inicial
+            end: Fecha final
+            habit_id: ID del hábito (opcional; sin él usa el índice por fecha)
+        """
+        query = "SELECT COUNT(*) FROM habit_completions WHERE completed_at BETWEEN ? AND ?"
+        params = [self._iso_day(start), self._iso_day(end)]
+        if habit_id is not None:
+            query += " AND habit_id = ?"
+            params.append(habit_id)
+        cursor = await self.database_service.execute(query, tuple(params))
+        row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    # Analítica
+    async def get_completion_series(
+        self,
+        habit_id: Optional[str] = None,
+        granularity: str = "day",
+        start: Optional[Union[date, str]] = None,
+        end: Optional[Union[date, str]] = None,
+    ) -> List[Dict]:
+        """
+        Serie de completados por día, semana o mes, de un hábito o de todos
+        
+        Los conteos salen de un GROUP BY sobre habit_completions con la misma
+        expresión de periodo que las rachas; Python solo rellena los periodos
+        vacíos del rango. El resultado se cachea por hábito hasta el próximo
+        completado.
+        
+        Args:
+            habit_id: ID del hábito (None = todos los hábitos)
+            granularity: "day", "week" o "month"
+            start: Fecha inicial (por defecto, los últimos periodos de SERIES_DEFAULT_PERIODS)
+            end: Fecha final (por defecto, hoy)
+        
+        Returns:
+            Lista ascendente de {"period", "count", "rate"}; rate es completados
+            entre los esperados en el periodo (dentro del rango) según la
+            frecuencia y frequency_times de cada hábito, como en las rachas
+        """
+        if granularity not in SERIES_GRANULARITY:
+            raise ValueError(f"Granularidad no soportada: {granularity}")
+        frequency = SERIES_GRANULARITY[granularity]
+        end_day = date.fromisoformat(self._iso_day(end)) if end else datetime.now().date()
+        if start:
+            start_day = date.fromisoformat(self._iso_day(start))
+        else:
+            start_day = period_start(end_day, frequency)
+            for _ in range(SERIES_DEFAULT_PERIODS[granularity] - 1):
+                start_day = period_start(start_day - timedelta(days=1), frequency)
+        if start_day > end_day:
+            return []
+
+        key = (granularity, start_day.isoformat(), end_day.isoformat())
+        cached = self._series.get(habit_id, {}).get(key)
+        if cached is not None:
+            return cached
+
+        bucket_sql = PERIOD_BUCKET_SQL[frequency]
+        query = (
+            f"SELECT {bucket_sql} AS period, COUNT(*) FROM habit_completions "
+            f"WHERE completed_at BETWEEN ? AND ?"
+        )
+        params: List = [start_day.isoformat(), end_day.isoformat()]
+        if habit_id is not None:
+            query += " AND habit_id = ?"
+            params.append(habit_id)
+            habit = self.habits.get(habit_id)
+            cadences = [(habit.frequency, habit.frequency_times, 1)] if habit else [("daily", 1, 1)]
+        else:
+            # Los completados de hábitos eliminados no cuentan
+            query += " AND habit_id IN (SELECT id FROM habits)"
+            cursor = await self.database_service.execute(
+                "SELECT frequency, frequency_times, COUNT(*) FROM habits GROUP BY 1, 2"
+            )
+            cadences = [(freq or "daily", times or 1, n) for freq, times, n in await cursor.fetchall()]
+        cursor = await self.database_service.execute(f"{query} GROUP BY period", tuple(params))
+        counts = {period: count for period, count in await cursor.fetchall()}
+
+        series: List[Dict] = []
+        current = period_start(start_day, frequency)
+        while current <= end_day:
+            following = next_period_start(current, frequency)
+            first, last = max(current, start_day), min(following - timedelta(days=1), end_day)
+            count = counts.get(current.isoformat(), 0)
+            possible = sum(
+                n * expected_completions(freq, times, first, last) for freq, times, n in cadences
+            )
+            series.append({
+                "period": current.isoformat(),
+                "count": count,
+                "rate": min(1.0, count / possible) if possible else 0.0,
+            })
+            current = following
+
+        self._series.setdefault(habit_id, {})[key] = series
+        return series
+
+    def invalidate_series(self, habit_id: Optional[str] = None):
+        """Descarta las series cacheadas de un hábito y las agregadas (o todas)"""
+        if habit_id is None:
+            self._series.clear()
+        else:
+            self._series.pop(habit_id, None)
+            self._series.pop(None, None)
+
+    # Rachas
+    async def get_streak(self, habit_id: str) -> StreakInfo:
+        """
+        Racha del hábito calculada desde habit_completions agrupado por periodo
+        
+        El resultado se cachea y se actualiza de forma incremental al completar.
+        
+        Args:
+            habit_id: ID del hábito
+        
+        Returns:
+            StreakInfo (current es la racha del último tramo cumplido)
+        """
+        info = self._streaks.get(habit_id)
+        if info is None:
+            habit = self.habits.get(habit_id)
+            frequency = habit.frequency if habit else "daily"
+            times = habit.frequency_times if habit else 1
+            bucket_sql = PERIOD_BUCKET_SQL.get(frequency, PERIOD_BUCKET_SQL["daily"])
+            cursor = await self.database_service.execute(
+                f"""
+                SELECT {bucket_sql} AS period, COUNT(*) FROM habit_completions
+                WHERE habit_id = ? GROUP BY period ORDER BY period
+                """,
+                (habit_id,),
+            )
+            buckets = [(date.fromisoformat(period), count) for period, count in await cursor.fetchall()]
+            info = compute_streaks(buckets, frequency, times)
+            self._streaks[habit_id] = info
+        return info
+
+    async def get_current_streak(self, habit_id: str) -> int:
+        """Racha vigente hoy (0 si el periodo anterior no se cumplió)"""
+        habit = self.habits.get(habit_id)
+        info = await self.get_streak(habit_id)
+        return info.effective_current(datetime.now().date(), habit.frequency if habit else "daily")
+
+    async def get_longest_streak(self, habit_id: str) -> int:
+        """Racha más larga registrada en el historial"""
+        return (await self.get_streak(habit_id)).longest
+
+    def invalidate_streak(self, habit_id: Optional[str] = None):
+        """Descarta la racha cacheada de un hábito (o de todos)"""
+        if habit_id is None:
+            self._streaks.clear()
+        else:
+            self._streaks.pop(habit_id, None)
+
+    def _record_streak_completion(self, habit: Habit, day: date):
+        """Aplica un completado nuevo a la racha cacheada sin releer el historial"""
+        info = self._streaks.get(habit.id)
+        if info is None:
+            return  # Se calculará completa en la próxima consulta
+        if info.current_period is not None and period_start(day, habit.frequency) < info.current_period:
+            # Completado en un periodo pasado: no es incremental
+            self._streaks.pop(habit.id, None)
+            return
+        apply_completion(info, day, habit.frequency, habit.frequency_times)
+
+    @staticmethod
+    def _iso_day(value: Union[date, str]) -> str:
+        """Normaliza una fecha a 'YYYY-MM-DD' (formato de completed_at)"""
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        return value[:10]
     
     # Métodos privados de persistencia
     async def _save_to_db(self, habit: Habit):
@@ -288,18 +826,42 @@ class HabitsService:
             print(f"[HabitsService] Error eliminando hábito: {e}")
             raise
 
-    async def _add_completion_record(self, habit: Habit):
-        """Agrega un registro de completado para el hábito"""
-        try:
-            today_iso = datetime.now().date().isoformat()
-            # Evitar duplicados para el mismo día
+    async def _ensure_completion_indexes(self):
+        """Crea los índices del historial (eliminando duplicados previos una sola vez)"""
+        cursor = await self.database_service.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (COMPLETIONS_DAY_INDEX,),
+        )
+        if await cursor.fetchone() is None:
+            # Bases antiguas podían tener varios registros del mismo hábito y día
             await self.database_service.execute(
-                "DELETE FROM habit_completions WHERE habit_id = ? AND completed_at = ?",
-                (habit.id, today_iso),
+                """
+                DELETE FROM habit_completions WHERE rowid NOT IN (
+                    SELECT MIN(rowid) FROM habit_completions GROUP BY habit_id, completed_at
+                )
+                """
             )
             await self.database_service.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {COMPLETIONS_DAY_INDEX} "
+                f"ON habit_completions(habit_id, completed_at)"
+            )
+        await self.database_service.execute(
+            f"CREATE INDEX IF NOT EXISTS {COMPLETIONS_DATE_INDEX} ON habit_completions(completed_at)"
+        )
+
+    async def _add_completion_record(self, habit: Habit) -> bool:
+        """
+        Agrega un registro de completado para el hábito
+        
+        Returns:
+            True si se insertó (False si ya existía el de hoy o hubo error)
+        """
+        try:
+            today_iso = datetime.now().date().isoformat()
+            # El índice único (habit_id, completed_at) descarta duplicados del mismo día
+            cursor = await self.database_service.execute(
                 """
-                INSERT INTO habit_completions (id, habit_id, frequency, completed_at, created_at)
+                INSERT OR IGNORE INTO habit_completions (id, habit_id, frequency, completed_at, created_at)
                 VALUES (?, ?, ?, ?, ?)
                 """,
                 (
@@ -311,8 +873,23 @@ class HabitsService:
                 ),
             )
             await self.database_service.commit()
+            return cursor.rowcount > 0
         except Exception as e:
             print(f"[HabitsService] Error registrando completado de hábito: {e}")
+            return False
+
+    async def _completed_on(self, day_iso: str, habit_ids: List[str]) -> set:
+        """IDs de los hábitos indicados que ya tienen completado ese día"""
+        found = set()
+        for start in range(0, len(habit_ids), _CHUNK_SIZE):
+            chunk = habit_ids[start:start + _CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor = await self.database_service.execute(
+                f"SELECT habit_id FROM habit_completions WHERE completed_at = ? AND habit_id IN ({placeholders})",
+                (day_iso, *chunk),
+            )
+            found.update(row[0] for row in await cursor.fetchall())
+        return found
 
     async def _remove_today_completion_record(self, habit_id: str):
         """Elimina el registro de completado de hoy para el hábito (si existe)"""
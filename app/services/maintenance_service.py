@@ -0,0 +1,278 @@
+"""
+Servicio de Mantenimiento de la BD (Maintenance Service)
+Copias de seguridad en caliente y compactación de la base de datos SQLite.
+
+- backup(): copia la BD con la API de backup de SQLite por bloques de páginas,
+  desde una conexión propia, así la conexión compartida y el loop de la UI
+  siguen atendiendo mientras se copia. Conserva las últimas `keep_backups`.
+- optimize(), incremental_vacuum() y analyze(): PRAGMA optimize, VACUUM
+  incremental (activa auto_vacuum=INCREMENTAL la primera vez) y ANALYZE.
+
+start() lo ejecuta todo cuando la aplicación lleva `idle_seconds` sin eventos
+de dominio, como mucho una vez cada `interval`. Cada paso informa de su
+duración y de los bytes recuperados.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import aiosqlite
+
+from app.config.settings import (
+    BACKUP_KEEP,
+    MAINTENANCE_IDLE_SECONDS,
+    MAINTENANCE_INTERVAL_SECONDS,
+)
+from app.services.database_service import DatabaseService
+from app.services.event_bus import EventBus, event_bus
+from app.utils.helpers import create_backup_path, get_database_path
+
+# auto_vacuum: 0 = NONE, 1 = FULL, 2 = INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Páginas copiadas por paso del backup y pausa entre pasos (segundos)
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+
+
+class MaintenanceService:
+    """Backup en caliente, optimize, VACUUM incremental y ANALYZE en tiempo ocioso"""
+
+    def __init__(
+        self,
+        database_service: Optional[DatabaseService] = None,
+        backup_dir: Optional[Union[str, Path]] = None,
+        keep_backups: int = BACKUP_KEEP,
+        bus: Optional[EventBus] = None,
+    ):
+        """
+        Args:
+            database_service: Servicio de BD (crea uno nuevo si no se proporciona)
+            backup_dir: Carpeta de las copias (default: database/backups)
+            keep_backups: Copias que se conservan al rotar
+            bus: Bus cuyos eventos marcan actividad (default: el bus global)
+        """
+        self.database_service = database_service or DatabaseService()
+        self.backup_dir = Path(backup_dir) if backup_dir is not None else get_database_path("backups")
+        self.keep_backups = max(1, int(keep_backups))
+        self.event_bus = bus or event_bus
+        self.last_report: List[Dict] = []
+        self._last_activity = time.monotonic()
+        self._last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    # ------------------------------------------------------------------
+    # Pasos
+    # ------------------------------------------------------------------
+    async def backup(self, pages: int = BACKUP_PAGES_PER_STEP) -> Dict:
+        """
+        Copia la BD a backup_dir con la API de backup y rota las copias antiguas
+
+        La copia se escribe en un archivo temporal y se renombra al terminar:
+        una copia a medias nunca pasa por válida.
+
+        Args:
+            pages: Páginas por paso (0 = todo en un paso)
+
+        Returns:
+            {"step", "seconds", "path", "bytes", "pages", "removed", "bytes_reclaimed"}
+            (bytes_reclaimed: espacio liberado por las copias rotadas)
+        """
+        started = time.perf_counter()
+        source_path = Path(self.database_service.db_path)
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        target_path = create_backup_path(self.backup_dir / source_path.name, suffix=f"_backup_{stamp}")
+        temp_path = target_path.with_name(target_path.name + ".tmp")
+
+        copied = {"total": 0}
+
+        def progress(status: int, remaining: int, total: int):
+            copied["total"] = total
+
+        # Lo pendiente en la conexión compartida entra en la copia
+        await self.database_service.commit()
+        # Conexiones propias: la compartida sigue libre durante la copia
+        source = await aiosqlite.connect(source_path)
+        try:
+            target = await aiosqlite.connect(temp_path, check_same_thread=False)
+            try:
+                await source.backup(target, pages=pages, progress=progress, sleep=BACKUP_STEP_SLEEP)
+            finally:
+                await target.close()
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            await source.close()
+        os.replace(temp_path, target_path)
+
+        removed = self.rotate_backups()
+        result = {
+            "step": "backup",
+            "seconds": time.perf_counter() - started,
+            "path": str(target_path),
+            "bytes": target_path.stat().st_size,
+            "pages": copied["total"],
+            "removed": len(removed),
+            "bytes_reclaimed": sum(size for _, size in removed),
+        }
+        self._log(result)
+        return result
+
+    def list_backups(self) -> List[Path]:
+        """Copias de esta BD en backup_dir, de la más reciente a la más antigua"""
+        source = Path(self.database_service.db_path)
+        pattern = create_backup_path(source.name, suffix="_backup_*").name
+        return sorted(self.backup_dir.glob(pattern), reverse=True)
+
+    def rotate_backups(self) -> List[Tuple[Path, int]]:
+        """
+        Borra las copias que sobran de keep_backups
+
+        Returns:
+            Lista de (ruta, bytes) de las copias borradas
+        """
+        removed = []
+        for path in self.list_backups()[self.keep_backups:]:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                removed.append((path, size))
+            except OSError as e:
+                print(f"[MaintenanceService] No se pudo borrar {path.name}: {e}")
+        return removed
+
+    async def optimize(self) -> Dict:
+        """PRAGMA optimize: ANALYZE de las tablas cuyas estadísticas lo necesitan"""
+        return await self._measure("optimize", ("PRAGMA optimize",))
+
+    async def analyze(self) -> Dict:
+        """ANALYZE completo de todas las tablas e índices"""
+        return await self._measure("analyze", ("ANALYZE",))
+
+    async def incremental_vacuum(self, pages: int = 0) -> Dict:
+        """
+        Devuelve al sistema las páginas libres (todas con pages=0)
+
+        Si la BD aún no usa auto_vacuum=INCREMENTAL se activa con un VACUUM
+        completo, una sola vez; a partir de ahí basta el VACUUM incremental.
+        """
+        cursor = await self.database_service.execute("PRAGMA auto_vacuum")
+        mode = (await cursor.fetchone())[0]
+        if mode != AUTO_VACUUM_INCREMENTAL:
+            return await self._measure(
+                "vacuum", ("PRAGMA auto_vacuum = INCREMENTAL", "VACUUM"), exclusive=True
+            )
+        return await self._measure("incremental_vacuum", (f"PRAGMA incremental_vacuum({int(pages)})",))
+
+    async def run_all(self) -> List[Dict]:
+        """
+        Ejecuta optimize, VACUUM incremental, ANALYZE y backup, en ese orden
+
+        Un paso que falla queda en el informe con "error" y no detiene los demás.
+        """
+        report = []
+        steps = (
+            ("optimize", self.optimize),
+            ("incremental_vacuum", self.incremental_vacuum),
+            ("analyze", self.analyze),
+            ("backup", self.backup),
+        )
+        for name, step in steps:
+            try:
+                report.append(await step())
+            except Exception as e:
+                print(f"[MaintenanceService] Error en {name}: {e}")
+                report.append({"step": name, "error": str(e)})
+        self.last_report = report
+        self._last_run = time.monotonic()
+        return report
+
+    # ------------------------------------------------------------------
+    # Programación en tiempo ocioso
+    # ------------------------------------------------------------------
+    def start(
+        self,
+        idle_seconds: float = MAINTENANCE_IDLE_SECONDS,
+        interval: float = MAINTENANCE_INTERVAL_SECONDS,
+    ):
+        """
+        Ejecuta run_all() tras `idle_seconds` sin eventos de dominio, como mucho
+        una vez cada `interval` segundos (idle_seconds = 0 no programa nada)
+        """
+        if idle_seconds <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._last_activity = time.monotonic()
+        if self._unsubscribe is None:
+            self._unsubscribe = self.event_bus.subscribe(self._on_activity)
+        self._task = asyncio.get_running_loop().create_task(self._run_when_idle(idle_seconds, interval))
+
+    def stop(self):
+        """Cancela la programación y la suscripción al bus"""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _on_activity(self, events):
+        self._last_activity = time.monotonic()
+
+    async def _run_when_idle(self, idle_seconds: float, interval: float):
+        while True:
+            now = time.monotonic()
+            wait = self._last_activity + idle_seconds - now
+            if self._last_run is not None:
+                wait = max(wait, self._last_run + interval - now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            await self.run_all()
+
+    # ------------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------------
+    async def _measure(self, step: str, statements: tuple, exclusive: bool = False) -> Dict:
+        """Ejecuta las sentencias y mide duración y bytes recuperados (tamaño antes - después)"""
+        db = self.database_service
+        started = time.perf_counter()
+        before = await self._database_bytes()
+        if exclusive:
+            async with db.exclusive():
+                for statement in statements:
+                    await (await db.execute(statement)).fetchall()
+        else:
+            # fetchall recorre la sentencia entera (incremental_vacuum libera página a página)
+            for statement in statements:
+                await (await db.execute(statement)).fetchall()
+            await db.commit()
+        after = await self._database_bytes()
+        result = {
+            "step": step,
+            "seconds": time.perf_counter() - started,
+            "bytes_before": before,
+            "bytes_after": after,
+            "bytes_reclaimed": before - after,
+        }
+        self._log(result)
+        return result
+
+    async def _database_bytes(self) -> int:
+        db = self.database_service
+        page_count = (await (await db.execute("PRAGMA page_count")).fetchone())[0]
+        page_size = (await (await db.execute("PRAGMA page_size")).fetchone())[0]
+        return int(page_count) * int(page_size)
+
+    @staticmethod
+    def _log(result: Dict):
+        print(
+            f"[MaintenanceService] {result['step']}: {result['seconds']:.3f}s, "
+            f"{result['bytes_reclaimed']} bytes recuperados"
+        )
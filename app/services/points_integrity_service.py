@@ -0,0 +1,125 @@
+"""
+Servicio de Integridad de Puntos
+Calcula los puntos esperados a partir de tareas, subtareas y completados de
+hábitos, y los compara con el total de ProgressService.
+
+Lee los mismos contadores del resumen (tabla dashboard_counters, ver
+completion_counters), que triggers de SQLite mantienen en la misma transacción
+que cada escritura; los hábitos llevan un grupo por frecuencia. Una verificación
+suma esos contadores y los multiplica por los puntos vigentes: no copia filas
+ni recorre las tablas de origen salvo al instalar los triggers o con full=True.
+"""
+
+from typing import Dict, Optional
+from app.logic.system_points import POINTS_BY_ACTION, HABIT_ACTION_BY_FREQUENCY
+from app.services.completion_counters import COUNTERS_TABLE, install_counters, recount_all
+from app.services.database_service import DatabaseService
+
+# origen del resultado -> contador de completion_counters
+POINTS_COUNTERS = {
+    "tasks": "tasks_completed",
+    "subtasks": "subtasks_completed",
+    "habits": "habits_completed",
+}
+
+
+class PointsIntegrityService:
+    """Verificación de la integridad de los puntos con conteos mantenidos por triggers"""
+
+    def __init__(self, database_service: Optional[DatabaseService] = None):
+        self.database_service = database_service or DatabaseService()
+        self._initialized = False
+
+    async def initialize(self) -> int:
+        """
+        Crea los contadores y los triggers de las tablas de origen que ya existen
+
+        Un contador cuyo trigger se crea por primera vez se cuenta desde su
+        tabla en la misma transacción; después solo lo ajustan los triggers.
+
+        Returns:
+            Filas de origen leídas para los conteos iniciales
+        """
+        if self._initialized:
+            return 0
+        await self.database_service.connect()
+        self._initialized, examined = await install_counters(self.database_service, "points_integrity_install")
+        return examined
+
+    async def compute_expected(self, full: bool = False) -> Dict:
+        """
+        Calcula los puntos esperados a partir de los conteos
+
+        Args:
+            full: Si True, recuenta todos los orígenes desde sus tablas (reparación)
+
+        Returns:
+            Diccionario con conteos y puntos por origen, expected_points y
+            examined_rows (filas de origen leídas en esta verificación)
+        """
+        examined = await self.initialize()
+        if full:
+            examined += await recount_all(
+                self.database_service, POINTS_COUNTERS.values(), savepoint="points_integrity_recount"
+            )
+
+        counts: Dict[str, Dict[str, int]] = {source: {} for source in POINTS_COUNTERS}
+        sources = {counter: source for source, counter in POINTS_COUNTERS.items()}
+        cursor = await self.database_service.execute(
+            f"SELECT name, bucket, SUM(value) FROM {COUNTERS_TABLE} "
+            f"WHERE name IN ({', '.join('?' for _ in sources)}) GROUP BY name, bucket",
+            tuple(sources),
+        )
+        for name, bucket, completed in await cursor.fetchall():
+            counts[sources[name]][bucket] = int(completed)
+
+        completed_tasks = sum(counts["tasks"].values())
+        completed_subtasks = sum(counts["subtasks"].values())
+        completed_habits = sum(counts["habits"].values())
+        task_points = completed_tasks * POINTS_BY_ACTION["task_completed"]
+        subtask_points = completed_subtasks * POINTS_BY_ACTION["subtask_completed"]
+        habit_points = sum(
+            completed * self._habit_points(frequency) for frequency, completed in counts["habits"].items()
+        )
+        return {
+            "completed_tasks": completed_tasks,
+            "completed_subtasks": completed_subtasks,
+            "completed_habits": completed_habits,
+            "task_points": task_points,
+            "subtask_points": subtask_points,
+            "habit_points": habit_points,
+            "expected_points": task_points + subtask_points + habit_points,
+            "examined_rows": examined,
+        }
+
+    async def verify(self, progress_service, repair: bool = True, full: bool = False) -> Dict:
+        """
+        Compara los puntos de ProgressService con los esperados
+
+        Args:
+            progress_service: Servicio de progreso a verificar
+            repair: Si True, ajusta los puntos al valor esperado
+            full: Si True, recuenta los orígenes desde sus tablas
+
+        Returns:
+            Resultado de compute_expected más current_points, difference y had_correction
+        """
+        result = await self.compute_expected(full=full)
+        stats = await progress_service.load_stats()
+        current_points = stats.get("points", 0.0)
+        difference = result["expected_points"] - current_points
+        had_correction = False
+        if abs(difference) > 0.001 and repair:
+            await progress_service.set_points(result["expected_points"])
+            had_correction = True
+        result.update(current_points=current_points, difference=difference, had_correction=had_correction)
+        return result
+
+    # ------------------------------------------------------------------
+    # Puntos
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _habit_points(frequency: str) -> float:
+        # Frecuencias desconocidas puntúan como diarias (igual que HabitsView)
+        action = HABIT_ACTION_BY_FREQUENCY.get(frequency, HABIT_ACTION_BY_FREQUENCY["daily"])
+        return POINTS_BY_ACTION.get(action, 0.0)
@@ -2,15 +2,43 @@
 Servicio de Progreso Local
 Sistema de puntos y niveles sin requerir autenticación de usuarios
 con persistencia en SQLite mediante DatabaseService.
+
+Cada asignación de puntos se registra en un libro mayor append-only
+(`points_ledger`); `progress_state` guarda el total acumulado materializado.
+
+Un (action, source_id) solo puntúa una vez mientras esté vigente. Al desmarcar
+la entidad, revoke_points() añade un movimiento "reversal" con el importe en
+negativo y archiva la clave del original como "<source_id>#<id>" (la reversión
+lleva la misma): el par queda libre y volver a completar puntúa de nuevo.
+Ningún importe se modifica ni se borra.
 """
 
+import asyncio
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Iterable, Optional, Dict, List, Tuple
 from app.logic.system_points import PointsSystem, Level, LEVEL_POINTS, POINTS_BY_ACTION
 from app.services.database_service import DatabaseService
+from app.services.event_bus import PointsChanged, event_bus
 
 PROGRESS_TABLE = "progress_state"
 PROGRESS_ID = "global_progress"
+LEDGER_TABLE = "points_ledger"
+
+# Acciones internas del libro mayor (no otorgan puntos por sí mismas)
+LEDGER_OPENING_BALANCE = "opening_balance"
+LEDGER_ADJUSTMENT = "adjustment"
+LEDGER_REVERSAL = "reversal"
+
+
+@dataclass
+class _AwardRequest:
+    """Petición encolada: movimientos (action, amount, source_id) y futuro del llamador"""
+    awards: List[Tuple[str, float, Optional[str]]]
+    bulk: bool
+    future: Optional[asyncio.Future] = None
+    # True: revierte el movimiento vigente de awards[0] en vez de insertarlo
+    revoke: bool = False
 
 
 class ProgressService:
@@ -19,7 +47,7 @@ class ProgressService:
     _instance = None
     _initialized = False
     
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(ProgressService, cls).__new__(cls)
         return cls._instance
@@ -32,6 +60,17 @@ class ProgressService:
             self.total_actions: int = 0
             self.database_service: Optional[DatabaseService] = database_service
             self._db_ready: bool = False
+            # Write-behind: los cambios se escriben al momento y el commit se agrupa
+            self.write_behind_window: float = 0.0
+            self._pending_writes: int = 0
+            self._flush_handle: Optional[asyncio.TimerHandle] = None
+            self._flush_task: Optional[asyncio.Task] = None
+            # Cola de asignaciones: un único consumidor las aplica en orden de llegada
+            self._award_queue: List[_AwardRequest] = []
+            self._award_worker: Optional[asyncio.Task] = None
+            self._ready_lock = asyncio.Lock()
+            # Bus donde se publica PointsChanged tras cada cambio de puntos
+            self.event_bus = event_bus
             ProgressService._initialized = True
             print("[ProgressService] Servicio inicializado")
         elif database_service is not None:
@@ -45,7 +84,12 @@ class ProgressService:
         """Garantiza que la tabla y el estado estén listos en la base de datos"""
         if self._db_ready:
             return
+        # Varias vistas pueden pedir puntos a la vez en el primer uso
+        async with self._ready_lock:
+            if not self._db_ready:
+                await self._prepare_db()
 
+    async def _prepare_db(self):
         if self.database_service is None:
             self.database_service = DatabaseService()
 
@@ -62,6 +106,26 @@ class ProgressService:
         )
         """
         await self.database_service.execute(create_query)
+
+        # Libro mayor append-only; el índice único parcial evita otorgar dos
+        # veces los puntos de la misma acción para la misma entidad origen
+        await self.database_service.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {LEDGER_TABLE} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                action TEXT NOT NULL,
+                amount REAL NOT NULL,
+                source_id TEXT,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        await self.database_service.execute(
+            f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_{LEDGER_TABLE}_source
+            ON {LEDGER_TABLE} (action, source_id) WHERE source_id IS NOT NULL
+            """
+        )
         await self.database_service.commit()
 
         # Insertar registro base si no existe (evita violar UNIQUE)
@@ -86,10 +150,40 @@ class ProgressService:
                 self.current_level = Level.NADIE
             self.total_actions = int(record.get("total_actions", 0))
 
+        # Migración: progreso previo al libro mayor se registra como saldo inicial
+        if self.current_points != 0.0 and await self._count_ledger_entries() == 0:
+            await self._append_entry(LEDGER_OPENING_BALANCE, self.current_points)
+            await self.database_service.commit()
+            print(f"[ProgressService] Saldo inicial registrado en el libro mayor: {self.current_points:.2f}")
+
         self._db_ready = True
 
-    async def _persist_state(self):
-        """Guarda el estado actual en la base de datos"""
+    async def _append_entry(self, action: str, amount: float, source_id: Optional[str] = None) -> bool:
+        """
+        Inserta un movimiento en el libro mayor (sin confirmar)
+
+        Returns:
+            False si ya existía un movimiento para (action, source_id)
+        """
+        cursor = await self.database_service.execute(
+            f"INSERT OR IGNORE INTO {LEDGER_TABLE} (action, amount, source_id, created_at) VALUES (?, ?, ?, ?)",
+            (action, amount, source_id, datetime.now().isoformat()),
+        )
+        return cursor.rowcount > 0
+
+    async def _count_ledger_entries(self) -> int:
+        cursor = await self.database_service.execute(f"SELECT COUNT(*) FROM {LEDGER_TABLE}")
+        row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    async def _persist_state(
+        self,
+        commit: bool = True,
+        points: Optional[float] = None,
+        level: Optional[Level] = None,
+        total_actions: Optional[int] = None,
+    ):
+        """Guarda en la base de datos el estado actual o los valores indicados"""
         if self.database_service is None:
             return
         now = datetime.now().isoformat()
@@ -105,57 +199,414 @@ class ProgressService:
             """,
             (
                 PROGRESS_ID,
-                self.current_points,
-                self.current_level.value,
-                self.total_actions,
+                self.current_points if points is None else points,
+                (self.current_level if level is None else level).value,
+                self.total_actions if total_actions is None else total_actions,
                 PROGRESS_ID,
                 now,
                 now,
             ),
         )
-        await self.database_service.commit()
+        if commit:
+            await self.database_service.commit()
 
     async def ensure_persistence(self):
         """Punto de entrada público para preparar la BD"""
         await self._ensure_db_ready()
-    
-    async def add_points(self, action: str, amount: Optional[float] = None) -> Dict:
+
+    # ------------------------------------------------------------------
+    # Write-behind (agrupación de commits)
+    # ------------------------------------------------------------------
+    def configure_write_behind(self, window: float):
+        """
+        Activa o desactiva el modo write-behind
+
+        Args:
+            window: Segundos durante los que se agrupan asignaciones en un solo
+                commit. 0 confirma cada asignación de inmediato.
+        """
+        self.write_behind_window = max(0.0, float(window))
+
+    async def _commit_state(self):
+        """Confirma la asignación ya escrita ahora o al cerrar la ventana write-behind"""
+        if self.write_behind_window <= 0:
+            await self.database_service.commit()
+            return
+        self._pending_writes += 1
+        if self._flush_handle is None and self._flush_task is None:
+            loop = asyncio.get_running_loop()
+
+            def start_flush():
+                self._flush_handle = None
+                # Se guarda la tarea para esperarla o cancelarla en flush()/shutdown()
+                self._flush_task = loop.create_task(self._scheduled_flush())
+
+            self._flush_handle = loop.call_later(self.write_behind_window, start_flush)
+
+    async def _scheduled_flush(self):
+        try:
+            await self._commit_pending()
+        except Exception as e:
+            print(f"[ProgressService] Error confirmando asignaciones pendientes: {e}")
+        finally:
+            self._flush_task = None
+
+    async def flush(self):
+        """Confirma en la BD las asignaciones pendientes del modo write-behind"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        task = self._flush_task
+        if task is not None and task is not asyncio.current_task():
+            await task
+        await self._commit_pending()
+
+    async def shutdown(self):
+        """Aplica las asignaciones encoladas, confirma lo pendiente y no deja tareas vivas"""
+        worker = self._award_worker
+        if worker is not None and not worker.done() and worker is not asyncio.current_task():
+            await worker
+        try:
+            await self.flush()
+        finally:
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                self._flush_task = None
+
+    async def _commit_pending(self):
+        if self._pending_writes == 0 or self.database_service is None:
+            return
+        await self.database_service.commit()
+        pending, self._pending_writes = self._pending_writes, 0
+        print(f"[ProgressService] {pending} asignaciones confirmadas en un solo commit")
+
+    # ------------------------------------------------------------------
+    # Asignación de puntos (cola serializada)
+    # ------------------------------------------------------------------
+    async def add_points(self, action: str, amount: Optional[float] = None, source_id: Optional[str] = None) -> Dict:
         """
         Añade puntos por una acción y persiste el estado
         
+        Las llamadas concurrentes (tareas, subtareas, hábitos, metas) se aplican
+        en orden de llegada por un único consumidor, sin perder incrementos.
+        
         Args:
             action: Tipo de acción realizada
             amount: Cantidad específica de puntos (opcional)
+            source_id: ID de la entidad que origina los puntos (tarea, subtarea,
+                hábito...). Si ya hay puntos vigentes para (action, source_id)
+                no se vuelven a sumar (revoke_points libera el par).
             
         Returns:
             Diccionario con información actualizada
+            (incluye "duplicate": True si la asignación se ignoró)
+        """
+        points = amount if amount is not None else POINTS_BY_ACTION.get(action, 0.0)
+        return await self._submit(_AwardRequest([(action, points, source_id)], bulk=False))
+
+    async def add_points_bulk(
+        self,
+        action: str,
+        count: Optional[int] = None,
+        source_ids: Optional[Iterable[str]] = None,
+    ) -> Dict:
+        """
+        Añade puntos por varias acciones iguales con un solo commit
+
+        Args:
+            action: Tipo de acción realizada
+            count: Número de asignaciones sin entidad origen
+            source_ids: IDs de las entidades origen (se ignoran las ya otorgadas)
+
+        Returns:
+            Diccionario con información actualizada (incluye "awarded": asignaciones aplicadas)
+        """
+        if source_ids is not None:
+            awards = [(action, source_id) for source_id in source_ids]
+        else:
+            awards = [(action, None)] * max(0, count or 0)
+        return await self.add_awards(awards)
+
+    async def add_awards(self, awards: Iterable[Tuple[str, Optional[str]]]) -> Dict:
         """
+        Añade puntos por acciones de distinto tipo con un solo commit
+
+        Args:
+            awards: Pares (action, source_id); source_id puede ser None. Los pares
+                ya otorgados se ignoran, así que repetir un lote es seguro.
+
+        Returns:
+            Diccionario con información actualizada (incluye "awarded":
+            asignaciones aplicadas y "points_delta": puntos sumados)
+        """
+        rows = [(action, POINTS_BY_ACTION.get(action, 0.0), source_id) for action, source_id in awards]
+        return await self._submit(_AwardRequest(rows, bulk=True))
+
+    async def revoke_points(self, action: str, source_id: str) -> Dict:
+        """
+        Revierte los puntos vigentes de (action, source_id), p. ej. al desmarcar
+
+        Añade un movimiento "reversal" con el importe en negativo y libera el
+        par: si la entidad se vuelve a completar, add_points puntúa otra vez.
+        Sin movimiento vigente no hace nada, así que llamarlo de más es seguro.
+
+        Args:
+            action: Acción de la asignación original
+            source_id: ID de la entidad que originó los puntos
+
+        Returns:
+            Diccionario con información actualizada (incluye "revoked": si se revirtió algo)
+        """
+        return await self._submit(_AwardRequest([(action, 0.0, source_id)], bulk=False, revoke=True))
+
+    async def _submit(self, request: "_AwardRequest") -> Dict:
+        """Encola una petición y espera a que el consumidor la aplique"""
         await self._ensure_db_ready()
+        loop = asyncio.get_running_loop()
+        request.future = loop.create_future()
+        self._award_queue.append(request)
+        if self.database_service.owns_transaction():
+            # Llamada desde un savepoint de esta tarea (p. ej. lote de hábitos): el
+            # consumidor esperaría a que lo liberemos, así que se vacía la cola aquí
+            await self._drain_awards()
+            return await request.future
+        worker = self._award_worker
+        if worker is None or worker.done() or worker.get_loop() is not loop:
+            self._award_worker = loop.create_task(self._drain_awards())
+        return await request.future
 
-        old_level = self.current_level
+    async def _drain_awards(self):
+        """
+        Consumidor único: aplica en orden de llegada todo lo encolado
+
+        Cada vuelta toma lo acumulado mientras se escribía el lote anterior y lo
+        aplica con un solo UPDATE del total. Si el lote falla, se reintenta
+        petición a petición para que un error solo afecte a quien lo causó.
+        """
+        while self._award_queue:
+            batch, self._award_queue = self._award_queue, []
+            try:
+                results = await self._apply_awards(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    self._resolve(batch[0], error=e)
+                    continue
+                print(f"[ProgressService] Lote de {len(batch)} asignaciones falló ({e}); se aplican por separado")
+                for request in batch:
+                    try:
+                        self._resolve(request, result=(await self._apply_awards([request]))[0])
+                    except Exception as single_error:
+                        self._resolve(request, error=single_error)
+                continue
+            for request, result in zip(batch, results):
+                self._resolve(request, result=result)
 
-        # Añadir puntos
-        if amount is not None:
-            points_added = amount
-            self.current_points += amount
+    @staticmethod
+    def _resolve(request: "_AwardRequest", result: Optional[Dict] = None, error: Optional[Exception] = None):
+        if request.future is None or request.future.done():
+            return  # Quien esperaba fue cancelado
+        if error is not None:
+            request.future.set_exception(error)
         else:
-            points_added = POINTS_BY_ACTION.get(action, 0.0)
-            self.current_points += points_added
-        
-        # Actualizar nivel
-        self.current_level = PointsSystem.get_level_by_points(self.current_points)
-        self.total_actions += 1
-        
-        # Verificar si hubo cambio de nivel
-        level_up = self.current_level != old_level
-        
-        print(f"[ProgressService] Acción '{action}': +{points_added} puntos | Total: {self.current_points:.2f}")
-        
-        if level_up:
-            print(f"[ProgressService] ¡NIVEL SUBIDO! {old_level.value} → {self.current_level.value}")
+            request.future.set_result(result)
+
+    async def _apply_awards(self, batch: List["_AwardRequest"]) -> List[Dict]:
+        """
+        Escribe un lote de peticiones en un savepoint y actualiza el total
+
+        El total se suma en SQL (`current_points = current_points + ?`), así que
+        ninguna escritura pisa a otra aunque el estado en memoria estuviera
+        desfasado. La memoria solo cambia si el savepoint se libera.
+
+        Returns:
+            Stats de cada petición, en el mismo orden del lote
+        """
+        db = self.database_service
+        now = datetime.now().isoformat()
+        applied: List[Tuple[int, float, Level, float, Level, int]] = []
+        total_awarded = 0
+        total_delta = 0.0
+        # Movimientos escritos (una reversión resta de total_awarded pero también cuenta)
+        changed = 0
+        # El savepoint serializa el acceso al estado: se lee la memoria ya dentro
+        async with db.savepoint("progress_awards"):
+            points, level, actions = self.current_points, self.current_level, self.total_actions
+            for request in batch:
+                awarded, delta = await self._insert_ledger_rows(request, now)
+                old_level = level
+                if awarded:
+                    points += delta
+                    actions += awarded
+                    level = PointsSystem.get_level_by_points(points)
+                applied.append((awarded, delta, old_level, points, level, actions))
+                total_awarded += awarded
+                total_delta += delta
+                changed += abs(awarded)
+            if changed:
+                cursor = await db.execute(
+                    f"""
+                    UPDATE {PROGRESS_TABLE}
+                    SET current_points = current_points + ?, total_actions = total_actions + ?, updated_at = ?
+                    WHERE id = ?
+                    RETURNING current_points, total_actions
+                    """,
+                    (total_delta, total_awarded, now, PROGRESS_ID),
+                )
+                row = await cursor.fetchone()
+                if row is not None:
+                    points, actions = float(row[0]), int(row[1])
+                    level = PointsSystem.get_level_by_points(points)
+                await db.execute(
+                    f"UPDATE {PROGRESS_TABLE} SET current_level = ? WHERE id = ? AND current_level != ?",
+                    (level.value, PROGRESS_ID, level.value),
+                )
+        self.current_points, self.current_level, self.total_actions = points, level, actions
+        if changed:
+            await self._commit_state()
+
+        results = []
+        for request, (awarded, delta, old_level, after_points, after_level, after_actions) in zip(batch, applied):
+            level_up = after_level != old_level and delta > 0
+            stats = self._build_stats(
+                after_points, after_level, after_actions, include_level_up=level_up, old_level=old_level
+            )
+            actions_label = ", ".join(dict.fromkeys(action for action, _, _ in request.awards)) or "-"
+            if request.revoke:
+                if awarded:
+                    print(f"[ProgressService] Acción '{actions_label}' revertida para {request.awards[0][2]}: {delta:.2f} puntos | Total: {after_points:.2f}")
+            elif request.bulk:
+                print(f"[ProgressService] Acciones '{actions_label}' x{awarded}: +{delta:.2f} puntos | Total: {after_points:.2f}")
+            elif awarded:
+                print(f"[ProgressService] Acción '{actions_label}': +{delta} puntos | Total: {after_points:.2f}")
+            else:
+                print(f"[ProgressService] Acción '{actions_label}' ya registrada para {request.awards[0][2]} - ignorando duplicado")
+            if level_up:
+                print(f"[ProgressService] ¡NIVEL SUBIDO! {old_level.value} → {after_level.value}")
+            if awarded:
+                self._publish_points_changed(stats, delta)
+            if request.revoke:
+                stats["revoked"] = bool(awarded)
+            elif request.bulk:
+                stats["awarded"] = awarded
+                stats["points_delta"] = delta
+            elif not awarded:
+                stats["duplicate"] = True
+            results.append(stats)
+        if len(batch) > 1:
+            print(f"[ProgressService] {len(batch)} peticiones aplicadas en un lote: +{total_delta:.2f} puntos")
+        return results
+
+    async def _insert_ledger_rows(self, request: "_AwardRequest", now: str) -> Tuple[int, float]:
+        """Inserta los movimientos de una petición; devuelve (asignaciones nuevas, puntos)"""
+        if request.revoke:
+            return await self._insert_reversal(request.awards[0][0], request.awards[0][2], now)
+        if not request.bulk:
+            action, amount, source_id = request.awards[0]
+            cursor = await self.database_service.execute(
+                f"INSERT OR IGNORE INTO {LEDGER_TABLE} (action, amount, source_id, created_at) VALUES (?, ?, ?, ?)",
+                (action, amount, source_id, now),
+            )
+            return (1, amount) if cursor.rowcount > 0 else (0, 0.0)
+        # Un executemany por acción para saber cuántas filas de cada una entraron
+        rows_by_action: Dict[str, List[tuple]] = {}
+        for action, amount, source_id in request.awards:
+            rows_by_action.setdefault(action, []).append((action, amount, source_id, now))
+        awarded = 0
+        delta = 0.0
+        for action, rows in rows_by_action.items():
+            cursor = await self.database_service.executemany(
+                f"INSERT OR IGNORE INTO {LEDGER_TABLE} (action, amount, source_id, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            inserted = max(0, cursor.rowcount)
+            awarded += inserted
+            delta += POINTS_BY_ACTION.get(action, 0.0) * inserted
+        return awarded, delta
+
+    async def _insert_reversal(self, action: str, source_id: Optional[str], now: str) -> Tuple[int, float]:
+        """Revierte el movimiento vigente de (action, source_id); devuelve (-1, -importe) o (0, 0.0)"""
+        db = self.database_service
+        cursor = await db.execute(
+            f"SELECT id, amount FROM {LEDGER_TABLE} WHERE action = ? AND source_id = ?",
+            (action, source_id),
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return 0, 0.0
+        entry_id, amount = int(row[0]), float(row[1])
+        archived = f"{source_id}#{entry_id}"
+        await db.execute(f"UPDATE {LEDGER_TABLE} SET source_id = ? WHERE id = ?", (archived, entry_id))
+        await db.execute(
+            f"INSERT INTO {LEDGER_TABLE} (action, amount, source_id, created_at) VALUES (?, ?, ?, ?)",
+            (LEDGER_REVERSAL, -amount, archived, now),
+        )
+        return -1, -amount
 
-        await self._persist_state()
-        return self.get_stats(include_level_up=level_up, old_level=old_level)
+    def _publish_points_changed(self, stats: Dict, delta: float):
+        """Notifica el nuevo total a los suscriptores del bus de eventos"""
+        self.event_bus.publish(PointsChanged(
+            points=stats["points"],
+            level=stats["level"],
+            delta=delta,
+            level_up=stats.get("level_up", False),
+            stats=stats,
+        ))
+
+    async def has_award(self, action: str, source_id: str) -> bool:
+        """Indica si hay puntos vigentes (no revertidos) de `action` para `source_id`"""
+        await self._ensure_db_ready()
+        cursor = await self.database_service.execute(
+            f"SELECT 1 FROM {LEDGER_TABLE} WHERE action = ? AND source_id = ? LIMIT 1",
+            (action, source_id),
+        )
+        return await cursor.fetchone() is not None
+
+    async def get_ledger_total(self) -> float:
+        """Suma de todos los movimientos del libro mayor"""
+        await self._ensure_db_ready()
+        cursor = await self.database_service.execute(f"SELECT COALESCE(SUM(amount), 0) FROM {LEDGER_TABLE}")
+        row = await cursor.fetchone()
+        return float(row[0]) if row else 0.0
+
+    async def get_ledger_entries(self, limit: Optional[int] = None) -> List[Dict]:
+        """Movimientos del libro mayor, del más reciente al más antiguo"""
+        await self._ensure_db_ready()
+        query = f"SELECT id, action, amount, source_id, created_at FROM {LEDGER_TABLE} ORDER BY id DESC"
+        params: tuple = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        cursor = await self.database_service.execute(query, params)
+        rows = await cursor.fetchall()
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    async def verify_ledger(self, repair: bool = True) -> Dict:
+        """
+        Compara el total materializado con SUM(amount) del libro mayor
+
+        Args:
+            repair: Si True, corrige el total materializado con el del libro mayor
+
+        Returns:
+            Diccionario con ledger_total, materialized_points y consistent
+        """
+        ledger_total = await self.get_ledger_total()
+        materialized = self.current_points
+        consistent = abs(ledger_total - materialized) <= 0.001
+        if not consistent:
+            print(f"[ProgressService] Total materializado ({materialized:.2f}) difiere del libro mayor ({ledger_total:.2f})")
+            if repair:
+                level = PointsSystem.get_level_by_points(ledger_total)
+                async with self.database_service.savepoint("progress_repair"):
+                    await self._persist_state(commit=False, points=ledger_total, level=level)
+                self.current_points, self.current_level = ledger_total, level
+                await self.database_service.commit()
+        return {
+            "ledger_total": ledger_total,
+            "materialized_points": materialized,
+            "consistent": consistent,
+        }
     
     def get_stats(self, include_level_up: bool = False, old_level: Optional[Level] = None) -> Dict:
         """
@@ -168,8 +619,21 @@ class ProgressService:
         Returns:
             Diccionario con todas las estadísticas
         """
-        points_in_current, total_for_next = PointsSystem.get_progress_to_next_level(self.current_points)
-        next_level = PointsSystem.get_next_level(self.current_level)
+        return self._build_stats(
+            self.current_points, self.current_level, self.total_actions, include_level_up, old_level
+        )
+
+    @staticmethod
+    def _build_stats(
+        points: float,
+        level: Level,
+        total_actions: int,
+        include_level_up: bool = False,
+        old_level: Optional[Level] = None,
+    ) -> Dict:
+        """Estadísticas para un estado dado (el actual o uno intermedio de un lote)"""
+        points_in_current, total_for_next = PointsSystem.get_progress_to_next_level(points)
+        next_level = PointsSystem.get_next_level(level)
         
         progress_percent = 0.0
         if total_for_next > 0:
@@ -178,16 +642,16 @@ class ProgressService:
             progress_percent = 100.0  # Nivel máximo
         
         stats = {
-            "points": self.current_points,
-            "level": self.current_level.value,
-            "level_icon": PointsSystem.get_level_icon(self.current_level),
-            "level_color": PointsSystem.get_level_color(self.current_level),
+            "points": points,
+            "level": level.value,
+            "level_icon": PointsSystem.get_level_icon(level),
+            "level_color": PointsSystem.get_level_color(level),
             "progress_percent": progress_percent,
             "points_in_current_level": points_in_current,
             "total_for_next_level": total_for_next,
             "next_level": next_level.value if next_level else None,
             "next_level_points": LEVEL_POINTS.get(next_level, 0) if next_level else None,
-            "total_actions": self.total_actions,
+            "total_actions": total_actions,
         }
         
         if include_level_up and old_level:
@@ -199,23 +663,37 @@ class ProgressService:
     async def reset_progress(self):
         """Reinicia todo el progreso y lo persiste"""
         await self._ensure_db_ready()
-        self.current_points = 0.0
-        self.current_level = Level.NADIE
-        self.total_actions = 0
-        await self._persist_state()
+        # La memoria cambia solo si el savepoint se libera (como en _apply_awards)
+        async with self.database_service.savepoint("progress_reset"):
+            await self.database_service.execute(f"DELETE FROM {LEDGER_TABLE}")
+            await self._persist_state(commit=False, points=0.0, level=Level.NADIE, total_actions=0)
+        self.current_points, self.current_level, self.total_actions = 0.0, Level.NADIE, 0
+        await self.database_service.commit()
+        self._publish_points_changed(self.get_stats(), 0.0)
         print("[ProgressService] Progreso reiniciado")
     
     async def set_points(self, points: float):
         """
         Establece manualmente los puntos y los persiste
         
+        La diferencia se registra como un ajuste en el libro mayor.
+        
         Args:
             points: Cantidad de puntos a establecer
         """
         await self._ensure_db_ready()
-        self.current_points = points
-        self.current_level = PointsSystem.get_level_by_points(self.current_points)
-        await self._persist_state()
+        level = PointsSystem.get_level_by_points(points)
+        # El savepoint lo serializa con las asignaciones en curso; la memoria
+        # solo cambia si se libera
+        async with self.database_service.savepoint("progress_set"):
+            difference = points - self.current_points
+            if difference != 0.0:
+                await self._append_entry(LEDGER_ADJUSTMENT, difference)
+            await self._persist_state(commit=False, points=points, level=level)
+        self.current_points, self.current_level = points, level
+        await self.database_service.commit()
+        if difference != 0.0:
+            self._publish_points_changed(self.get_stats(), difference)
         print(f"[ProgressService] Puntos establecidos manualmente: {points:.2f} | Nivel: {self.current_level.value}")
 
     async def load_stats(self) -> Dict:
@@ -3,13 +3,67 @@ Servicio de Recompensas
 Gestiona las operaciones CRUD de recompensas con persistencia en BD
 """
 
-from typing import List, Optional, Dict, Any
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import asyncio
+import time
 from app.models.reward import Reward
 from app.services.database_service import DatabaseService
 
 
+REWARDS_TABLE = "rewards"
+REWARD_COLUMNS = (
+    "id", "title", "description", "points_required", "icon", "color",
+    "is_active", "category", "claimed", "created_at", "updated_at",
+)
+
+# Operaciones de la cola de escritura
+_OP_UPSERT = "upsert"
+_OP_DELETE = "delete"
+
+
+class _RewardIndex:
+    """Lista de recompensas ordenada por (points_required, id) con búsqueda por bisect"""
+
+    def __init__(self):
+        self._keys: List[Tuple[float, str]] = []
+        self._rewards: List[Reward] = []
+        self._key_by_id: Dict[str, Tuple[float, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rewards)
+
+    def add(self, reward: Reward):
+        key = (reward.points_required, reward.id)
+        pos = bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._rewards.insert(pos, reward)
+        self._key_by_id[reward.id] = key
+
+    def discard(self, reward_id: str):
+        # Se busca por la clave guardada: points_required pudo cambiar en sitio
+        key = self._key_by_id.pop(reward_id, None)
+        if key is None:
+            return
+        pos = bisect_left(self._keys, key)
+        del self._keys[pos]
+        del self._rewards[pos]
+
+    def clear(self):
+        self._keys.clear()
+        self._rewards.clear()
+        self._key_by_id.clear()
+
+    def position(self, points: float) -> int:
+        """Cantidad de recompensas con points_required <= points"""
+        return bisect_right(self._keys, (points, "\uffff"))
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> List[Reward]:
+        return self._rewards[start:stop]
+
+
 class RewardsService:
     """Servicio para gestionar recompensas con persistencia en BD"""
     
@@ -23,6 +77,27 @@ class RewardsService:
         self.rewards: Dict[str, Reward] = {}
         self.database_service = database_service or DatabaseService()
         self._initialized = False
+        # Índices ordenados por puntos, mantenidos al crear/actualizar/eliminar
+        self._all_index = _RewardIndex()
+        self._active_index = _RewardIndex()
+        self._unclaimed_index = _RewardIndex()  # Activas y sin reclamar
+        self._claimed_index = _RewardIndex()
+        # Cola write-behind: reward_id -> (operación, recompensa, nueva sin persistir).
+        # Conserva el orden de llegada y agrupa varias escrituras de la misma recompensa.
+        self.write_behind_window = 0.0
+        self._pending: "OrderedDict[str, Tuple[str, Optional[Reward], bool]]" = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._metrics = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "max_queue_depth": 0,
+            "last_flush_seconds": 0.0,
+            "total_flush_seconds": 0.0,
+        }
         self._valid_categories = {
             "Recompensas pequeñas",
             "Recompensas medianas",
@@ -30,8 +105,13 @@ class RewardsService:
             "Recompensas épicas",
         }
     
-    async def initialize(self):
-        """Inicializa la BD y carga las recompensas existentes"""
+    async def initialize(self, load: bool = True):
+        """
+        Inicializa la BD y carga las recompensas existentes
+
+        Args:
+            load: Si False, conserva el espejo en memoria (p. ej. restaurado de un snapshot)
+        """
         if self._initialized:
             return
         
@@ -56,8 +136,12 @@ class RewardsService:
             """)
             await self.database_service.commit()
             
+            # Confirmar escrituras encoladas antes de recargar desde BD
+            await self.flush()
+            
             # Cargar recompensas desde BD
-            await self._load_from_db()
+            if load:
+                await self._load_from_db()
 
             # Migrar recompensas existentes a las categorías actuales
             await self._migrate_rewards_data()
@@ -78,6 +162,7 @@ class RewardsService:
             for reward_dict in rewards:
                 reward = Reward.from_dict(reward_dict)
                 self.rewards[reward.id] = reward
+            self._rebuild_index()
             print(f"[RewardsService] Cargadas {len(self.rewards)} recompensas desde BD")
         except Exception as e:
             print(f"[RewardsService] Error al cargar desde BD: {e}")
@@ -120,11 +205,9 @@ class RewardsService:
         for data in defaults:
             reward = Reward.from_dict(data)
             self.rewards[reward.id] = reward
-            try:
-                db_data = reward.to_dict()
-                await self.database_service.create("rewards", db_data)
-            except Exception as e:
-                print(f"[RewardsService] Error al guardar recompensa por defecto: {e}")
+            self._index_reward(reward)
+            self._enqueue(_OP_UPSERT, reward.id, reward, is_new=True)
+        await self.flush()
         
         print(f"[RewardsService] Agregadas {len(defaults)} recompensas por defecto")
     
@@ -140,24 +223,11 @@ class RewardsService:
         """
         reward = Reward.from_dict(reward_data)
         self.rewards[reward.id] = reward
-        
-        try:
-            # Guardar en BD de forma asíncrona
-            asyncio.create_task(self._save_to_db(reward))
-        except Exception as e:
-            print(f"[RewardsService] Error al agendar guardado en BD: {e}")
-        
+        self._index_reward(reward)
+        # Se guarda en BD con la cola write-behind
+        self._enqueue(_OP_UPSERT, reward.id, reward, is_new=True)
         return reward
     
-    async def _save_to_db(self, reward: Reward):
-        """Guarda una recompensa en BD de forma asíncrona"""
-        try:
-            db_data = reward.to_dict()
-            await self.database_service.create("rewards", db_data)
-            print(f"[RewardsService] Recompensa '{reward.title}' guardada en BD")
-        except Exception as e:
-            print(f"[RewardsService] Error al guardar en BD: {e}")
-    
     def get_reward(self, reward_id: str) -> Optional[Reward]:
         """
         Obtiene una recompensa por ID
@@ -170,6 +240,11 @@ class RewardsService:
         """
         return self.rewards.get(reward_id)
     
+    def load_rewards(self, rewards: Dict[str, Reward]):
+        """Reemplaza el espejo en memoria (p. ej. desde un snapshot) y reconstruye los índices"""
+        self.rewards = rewards
+        self._rebuild_index()
+
     def get_all_rewards(self, active_only: bool = False) -> List[Reward]:
         """
         Obtiene todas las recompensas
@@ -180,15 +255,9 @@ class RewardsService:
         Returns:
             Lista de recompensas
         """
-        rewards = list(self.rewards.values())
-        
-        if active_only:
-            rewards = [r for r in rewards if r.is_active]
-        
-        # Ordenar por puntos requeridos
-        rewards.sort(key=lambda x: x.points_required)
-        
-        return rewards
+        # Los índices ya están ordenados por puntos requeridos
+        index = self._active_index if active_only else self._all_index
+        return index.slice()
     
     def get_rewards_by_category(self, category: str) -> List[Reward]:
         """
@@ -218,13 +287,8 @@ class RewardsService:
             return None
         
         reward.update(**reward_data)
-        
-        try:
-            # Actualizar en BD de forma asíncrona
-            asyncio.create_task(self._update_in_db(reward_id, reward))
-        except Exception as e:
-            print(f"[RewardsService] Error al agendar actualización en BD: {e}")
-        
+        self._index_reward(reward)
+        self._enqueue(_OP_UPSERT, reward.id, reward)
         return reward
 
     async def _migrate_rewards_data(self):
@@ -249,24 +313,13 @@ class RewardsService:
             if new_category != reward.category:
                 reward.update(category=new_category)
                 self.rewards[reward.id] = reward
-                try:
-                    await self.database_service.update("rewards", reward.id, reward.to_dict())
-                    updated += 1
-                except Exception as e:
-                    print(f"[RewardsService] Error al migrar recompensa '{reward.title}': {e}")
+                self._enqueue(_OP_UPSERT, reward.id, reward)
+                updated += 1
 
         if updated:
+            await self.flush()
             print(f"[RewardsService] Migradas {updated} recompensas a las nuevas categorías")
     
-    async def _update_in_db(self, reward_id: str, reward: Reward):
-        """Actualiza una recompensa en BD de forma asíncrona"""
-        try:
-            db_data = reward.to_dict()
-            await self.database_service.update("rewards", reward_id, db_data)
-            print(f"[RewardsService] Recompensa '{reward.title}' actualizada en BD")
-        except Exception as e:
-            print(f"[RewardsService] Error al actualizar en BD: {e}")
-    
     def delete_reward(self, reward_id: str) -> bool:
         """
         Elimina una recompensa
@@ -279,24 +332,123 @@ class RewardsService:
         """
         if reward_id in self.rewards:
             del self.rewards[reward_id]
-            
-            try:
-                # Eliminar de BD de forma asíncrona
-                asyncio.create_task(self._delete_from_db(reward_id))
-            except Exception as e:
-                print(f"[RewardsService] Error al agendar eliminación en BD: {e}")
-            
+            self._unindex_reward(reward_id)
+            self._enqueue(_OP_DELETE, reward_id)
             return True
         return False
     
-    async def _delete_from_db(self, reward_id: str):
-        """Elimina una recompensa de BD de forma asíncrona"""
+    # Cola write-behind -------------------------------------------------------
+    def configure_write_behind(self, window: float):
+        """
+        Ajusta la ventana de la cola de escritura
+        
+        Args:
+            window: Segundos que se esperan para agrupar escrituras en un lote.
+                0 confirma en la siguiente vuelta del event loop.
+        """
+        self.write_behind_window = max(0.0, float(window))
+
+    def _enqueue(self, op: str, reward_id: str, reward: Optional[Reward] = None, is_new: bool = False):
+        """Encola una escritura agrupándola con las pendientes de la misma recompensa"""
+        self._metrics["enqueued"] += 1
+        previous = self._pending.get(reward_id)
+        if previous is not None:
+            self._metrics["coalesced"] += 1
+            prev_op, _, prev_new = previous
+            if op == _OP_DELETE and prev_new:
+                # Creada y eliminada antes de persistir: no hay nada que escribir
+                del self._pending[reward_id]
+                return
+            # Conserva la posición original en la cola y si aún es nueva
+            is_new = is_new or (prev_new and prev_op == _OP_UPSERT)
+        self._pending[reward_id] = (op, reward, is_new)
+        self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], len(self._pending))
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Programa un flush si hay event loop; si no, queda pendiente hasta flush()"""
+        if self._flush_handle is not None:
+            return
         try:
-            await self.database_service.delete("rewards", reward_id)
-            print(f"[RewardsService] Recompensa eliminada de BD")
-        except Exception as e:
-            print(f"[RewardsService] Error al eliminar de BD: {e}")
-    
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        def start_flush():
+            self._flush_handle = None
+            # Se guarda la tarea para que no la recoja el GC ni se pierda al cerrar
+            self._flush_task = loop.create_task(self.flush())
+
+        self._flush_handle = loop.call_later(self.write_behind_window, start_flush)
+
+    async def flush(self):
+        """Escribe todas las operaciones pendientes en una sola transacción, en orden"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, OrderedDict()
+            started = time.perf_counter()
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                print(f"[RewardsService] Error al escribir lote en BD: {e}")
+                # Reencolar delante de lo llegado durante la escritura (lo nuevo gana)
+                for reward_id, (op, reward, is_new) in self._pending.items():
+                    previous = batch.get(reward_id)
+                    batch[reward_id] = (op, reward, is_new or bool(previous and previous[2]))
+                self._pending = batch
+                raise
+            elapsed = time.perf_counter() - started
+            self._metrics["flushes"] += 1
+            self._metrics["rows_written"] += len(batch)
+            self._metrics["last_flush_seconds"] = elapsed
+            self._metrics["total_flush_seconds"] += elapsed
+        if self._pending:
+            self._schedule_flush()
+
+    async def _write_batch(self, batch: "OrderedDict[str, Tuple[str, Optional[Reward], bool]]"):
+        """Aplica un lote: upserts y borrados en orden, agrupando los consecutivos"""
+        db = self.database_service
+        columns = ", ".join(REWARD_COLUMNS)
+        placeholders = ", ".join("?" for _ in REWARD_COLUMNS)
+        assignments = ", ".join(f"{col} = excluded.{col}" for col in REWARD_COLUMNS if col != "id")
+        upsert_sql = (
+            f"INSERT INTO {REWARDS_TABLE} ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {assignments}"
+        )
+        delete_sql = f"DELETE FROM {REWARDS_TABLE} WHERE id = ?"
+
+        run_op: Optional[str] = None
+        run_rows: List[tuple] = []
+        # Savepoint: si el lote falla se deshace solo el lote, no lo pendiente
+        # de otros servicios en la conexión compartida (p. ej. puntos write-behind)
+        async with db.savepoint("rewards_batch"):
+            for reward_id, (op, reward, _) in batch.items():
+                if op != run_op and run_rows:
+                    await db.executemany(upsert_sql if run_op == _OP_UPSERT else delete_sql, run_rows)
+                    run_rows = []
+                run_op = op
+                run_rows.append(self._reward_row(reward) if op == _OP_UPSERT else (reward_id,))
+            if run_rows:
+                await db.executemany(upsert_sql if run_op == _OP_UPSERT else delete_sql, run_rows)
+        await db.commit()
+
+    @staticmethod
+    def _reward_row(reward: Reward) -> tuple:
+        data = reward.to_dict()
+        return tuple(int(data[col]) if isinstance(data[col], bool) else data[col] for col in REWARD_COLUMNS)
+
+    def get_write_metrics(self) -> Dict[str, Any]:
+        """Métricas de la cola: profundidad actual y máxima, flushes y latencia"""
+        metrics = dict(self._metrics)
+        metrics["queue_depth"] = len(self._pending)
+        flushes = metrics["flushes"]
+        metrics["avg_flush_seconds"] = metrics["total_flush_seconds"] / flushes if flushes else 0.0
+        return metrics
+
     def get_unlocked_rewards(self, user_points: float) -> List[Reward]:
         """
         Obtiene las recompensas desbloqueadas por puntos que no han sido reclamadas
@@ -307,10 +459,7 @@ class RewardsService:
         Returns:
             Lista de recompensas desbloqueadas y no reclamadas
         """
-        return [
-            r for r in self.get_all_rewards(active_only=True)
-            if r.points_required <= user_points and not r.claimed
-        ]
+        return self._unclaimed_index.slice(0, self._unclaimed_index.position(user_points))
     
     def get_next_rewards(self, user_points: float, limit: int = 5) -> List[Reward]:
         """
@@ -323,9 +472,58 @@ class RewardsService:
         Returns:
             Lista de próximas recompensas
         """
-        locked = [
-            r for r in self.get_all_rewards(active_only=True)
-            if r.points_required > user_points
-        ]
-        locked.sort(key=lambda x: x.points_required)
-        return locked[:limit]
+        start = self._active_index.position(user_points)
+        return self._active_index.slice(start, start + limit)
+
+    def get_claimed_rewards(self) -> List[Reward]:
+        """Recompensas ya reclamadas, ordenadas por puntos requeridos"""
+        return self._claimed_index.slice()
+
+    def get_newly_unlocked_rewards(self, old_points: float, new_points: float) -> List[Reward]:
+        """
+        Recompensas sin reclamar que se desbloquean al pasar de old_points a new_points
+        
+        Args:
+            old_points: Puntos antes del cambio
+            new_points: Puntos después del cambio
+            
+        Returns:
+            Recompensas con old_points < points_required <= new_points
+            (vacío si los puntos no aumentaron)
+        """
+        if new_points <= old_points:
+            return []
+        index = self._unclaimed_index
+        return index.slice(index.position(old_points), index.position(new_points))
+
+    def crosses_threshold(self, old_points: float, new_points: float) -> bool:
+        """
+        Indica si algún umbral de recompensa activa queda entre dos totales de puntos
+        
+        Si es False, las listas de desbloqueadas, próximas y reclamadas no cambian.
+        """
+        low, high = sorted((old_points, new_points))
+        return self._active_index.position(low) != self._active_index.position(high)
+
+    # Índices ordenados -------------------------------------------------------
+    def _index_reward(self, reward: Reward):
+        """(Re)inserta una recompensa en los índices según su estado actual"""
+        self._unindex_reward(reward.id)
+        self._all_index.add(reward)
+        if reward.claimed:
+            self._claimed_index.add(reward)
+        if reward.is_active:
+            self._active_index.add(reward)
+            if not reward.claimed:
+                self._unclaimed_index.add(reward)
+
+    def _unindex_reward(self, reward_id: str):
+        for index in (self._all_index, self._active_index, self._unclaimed_index, self._claimed_index):
+            index.discard(reward_id)
+
+    def _rebuild_index(self):
+        for index in (self._all_index, self._active_index, self._unclaimed_index, self._claimed_index):
+            index.clear()
+        # En orden de clave cada inserción cae al final de las listas
+        for reward in sorted(self.rewards.values(), key=lambda r: (r.points_required, r.id)):
+            self._index_reward(reward)
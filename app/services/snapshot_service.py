@@ -0,0 +1,332 @@
+"""
+Servicio de Snapshots (Snapshot Service)
+Guarda en un archivo binario (pickle, protocolo 5) los espejos en memoria de
+HabitsService.habits, RewardsService.rewards y TaskService._tasks para que un
+arranque en caliente no tenga que releer todo el historial.
+
+Triggers de SQLite registran en `snapshot_changes` cada fila escrita de las
+tablas de origen, en la misma transacción que la escritura. El snapshot guarda
+la última secuencia del registro (watermark); al restaurar solo se releen las
+filas con cambios posteriores. Si el archivo falta, es de otra BD o el
+registro ya no cubre su watermark, restore() devuelve None y el arranque hace
+la carga completa de siempre.
+"""
+
+import asyncio
+import os
+import pickle
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+from uuid import uuid4
+
+from app.models.habit import Habit
+from app.models.reward import Reward
+from app.models.task import Task
+from app.services.database_service import DatabaseService
+from app.utils.helpers import get_database_path
+
+CHANGES_TABLE = "snapshot_changes"
+META_TABLE = "snapshot_meta"
+SNAPSHOT_VERSION = 1
+PICKLE_PROTOCOL = 5
+
+# tabla de origen -> (espejo afectado, id de la fila del espejo);
+# {row} se sustituye por NEW u OLD
+SNAPSHOT_SOURCES = {
+    "tasks": ("tasks", "{row}.id"),
+    "subtasks": ("tasks", "{row}.task_id"),
+    "habits": ("habits", "{row}.id"),
+    "rewards": ("rewards", "{row}.id"),
+}
+
+
+class SnapshotService:
+    """Snapshots de los espejos en memoria con reproducción de cambios posteriores"""
+
+    def __init__(
+        self,
+        database_service: Optional[DatabaseService] = None,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            database_service: Servicio de BD (crea uno nuevo si no se proporciona)
+            path: Archivo del snapshot (default: database/app.snapshot)
+        """
+        self.database_service = database_service or DatabaseService()
+        self.path = Path(path) if path is not None else get_database_path("app.snapshot")
+        self._initialized = False
+        self._periodic_task: Optional[asyncio.Task] = None
+
+    async def initialize(self):
+        """
+        Crea el registro de cambios y los triggers de las tablas de origen que ya existen
+
+        Conviene llamarlo tras inicializar los demás servicios: save() exige que
+        todas las tablas de origen tengan sus triggers.
+        """
+        if self._initialized:
+            return
+        db = self.database_service
+        await db.connect()
+        await db.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {CHANGES_TABLE} (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                mirror TEXT NOT NULL,
+                row_id TEXT NOT NULL
+            )
+            """
+        )
+        await db.execute(f"CREATE TABLE IF NOT EXISTS {META_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+        # Identifica esta BD: un snapshot de otra copia no se aplica
+        await db.execute(f"INSERT OR IGNORE INTO {META_TABLE} (key, value) VALUES ('generation', ?)", (uuid4().hex,))
+        await db.execute(f"INSERT OR IGNORE INTO {META_TABLE} (key, value) VALUES ('pruned_through', '0')")
+
+        cursor = await db.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {(kind, name) for kind, name in await cursor.fetchall()}
+        installed = 0
+        for table, (mirror, row_id) in SNAPSHOT_SOURCES.items():
+            if ("trigger", self._trigger_name(table, "insert")) in existing:
+                installed += 1
+                continue
+            if ("table", table) not in existing:
+                continue  # Se instalará cuando su servicio cree la tabla
+            for statement in self._trigger_statements(table, mirror, row_id):
+                await db.execute(statement)
+            installed += 1
+        await db.commit()
+        self._initialized = installed == len(SNAPSHOT_SOURCES)
+
+    async def save(self) -> Dict:
+        """
+        Escribe el snapshot y descarta los cambios que ya contiene
+
+        Se fija primero el watermark y después se leen las filas: todo cambio
+        queda en el archivo o en el registro con una secuencia posterior.
+
+        Returns:
+            {"watermark", "rows", "bytes", "seconds"}
+        """
+        started = time.perf_counter()
+        await self.initialize()
+        if not self._initialized:
+            raise RuntimeError("Faltan tablas de origen; no se puede guardar el snapshot")
+        db = self.database_service
+        async with db.savepoint("snapshot_capture"):
+            watermark = await self._last_sequence()
+            generation = await self._meta("generation")
+            habits = [Habit.from_dict(row) for row in await db.get_all("habits")]
+            rewards = [Reward.from_dict(row) for row in await db.get_all("rewards")]
+            tasks = await self._read_tasks()
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "generation": generation,
+            "watermark": watermark,
+            "created_at": datetime.now().isoformat(),
+            "habits": {habit.id: habit for habit in habits},
+            "rewards": {reward.id: reward for reward in rewards},
+            "tasks": {task.id: task for task in tasks},
+        }
+        data = pickle.dumps(payload, protocol=PICKLE_PROTOCOL)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+
+        # El archivo ya cubre hasta el watermark: el registro anterior sobra
+        async with db.savepoint("snapshot_prune"):
+            await db.execute(f"DELETE FROM {CHANGES_TABLE} WHERE seq <= ?", (watermark,))
+            await db.execute(
+                f"UPDATE {META_TABLE} SET value = ? WHERE key = 'pruned_through'", (str(watermark),)
+            )
+        await db.commit()
+
+        result = {
+            "watermark": watermark,
+            "rows": len(habits) + len(rewards) + len(tasks),
+            "bytes": len(data),
+            "seconds": time.perf_counter() - started,
+        }
+        print(
+            f"[SnapshotService] Snapshot guardado: {result['rows']} filas, "
+            f"{result['bytes']} bytes en {result['seconds']:.3f}s"
+        )
+        return result
+
+    async def restore(self, task_service, habits_service, rewards_service) -> Optional[Dict]:
+        """
+        Carga el snapshot en los espejos y relee las filas cambiadas después
+
+        Args:
+            task_service: TaskService cuyo `_tasks` se rellena
+            habits_service: HabitsService cuyo `habits` se rellena
+            rewards_service: RewardsService cuyo `rewards` se rellena
+
+        Returns:
+            {"watermark", "replayed", "seconds"}, o None si el snapshot no sirve
+            (los espejos no se tocan y hay que hacer la carga completa)
+        """
+        started = time.perf_counter()
+        payload = self._read_file()
+        if payload is None:
+            return None
+        db = self.database_service
+        await db.connect()
+        if not await self._table_exists(META_TABLE):
+            return None
+        watermark = payload["watermark"]
+        pruned_through = int(await self._meta("pruned_through") or 0)
+        if payload["generation"] != await self._meta("generation"):
+            print("[SnapshotService] El snapshot es de otra base de datos; se ignora")
+            return None
+        if watermark < pruned_through or watermark > await self._last_sequence():
+            # Registro recortado por un snapshot más nuevo, o cambios revertidos tras guardarlo
+            print("[SnapshotService] El registro de cambios no cubre el snapshot; se ignora")
+            return None
+
+        habits: Dict[str, Habit] = payload["habits"]
+        rewards: Dict[str, Reward] = payload["rewards"]
+        tasks: Dict[str, Task] = payload["tasks"]
+        changed = await self._changed_since(watermark)
+        for habit_id in changed["habits"]:
+            row = await db.get("habits", habit_id)
+            self._replace(habits, habit_id, Habit.from_dict(row) if row else None)
+        for reward_id in changed["rewards"]:
+            row = await db.get("rewards", reward_id)
+            self._replace(rewards, reward_id, Reward.from_dict(row) if row else None)
+        for task_id in changed["tasks"]:
+            tasks_found = await self._read_tasks(task_id)
+            self._replace(tasks, task_id, tasks_found[0] if tasks_found else None)
+
+        habits_service.habits = habits
+        habits_service.invalidate_streak()
+        habits_service.invalidate_series()
+        rewards_service.load_rewards(rewards)
+        task_service.load_cache(tasks)
+
+        result = {
+            "watermark": watermark,
+            "replayed": sum(len(ids) for ids in changed.values()),
+            "seconds": time.perf_counter() - started,
+        }
+        print(
+            f"[SnapshotService] Snapshot restaurado: {len(habits)} hábitos, {len(rewards)} recompensas, "
+            f"{len(tasks)} tareas; {result['replayed']} filas releídas en {result['seconds']:.3f}s"
+        )
+        return result
+
+    def start(self, interval: float):
+        """Guarda un snapshot cada `interval` segundos hasta stop()"""
+        if interval <= 0 or (self._periodic_task is not None and not self._periodic_task.done()):
+            return
+        self._periodic_task = asyncio.get_running_loop().create_task(self._save_periodically(interval))
+
+    def stop(self):
+        """Cancela los guardados periódicos"""
+        if self._periodic_task is not None:
+            self._periodic_task.cancel()
+            self._periodic_task = None
+
+    async def _save_periodically(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.save()
+            except Exception as e:
+                print(f"[SnapshotService] Error guardando snapshot: {e}")
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def _read_file(self) -> Optional[Dict]:
+        # El archivo lo escribe la propia aplicación en su carpeta de datos
+        try:
+            with open(self.path, "rb") as handle:
+                payload = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[SnapshotService] Snapshot ilegible ({e}); se ignora")
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            return None
+        return payload
+
+    async def _read_tasks(self, task_id: Optional[str] = None) -> List[Task]:
+        """Tareas con sus subtareas en dos consultas (todas, o solo `task_id`)"""
+        db = self.database_service
+        task_filters = {"id": task_id} if task_id is not None else None
+        subtask_filters = {"task_id": task_id} if task_id is not None else None
+        task_rows = await db.get_all("tasks", filters=task_filters, order_by="created_at DESC")
+        subtasks_by_task: Dict[str, List[Dict]] = {}
+        for row in await db.get_all("subtasks", filters=subtask_filters, order_by="created_at ASC"):
+            subtasks_by_task.setdefault(row["task_id"], []).append(row)
+        for row in task_rows:
+            row["subtasks"] = subtasks_by_task.get(row["id"], [])
+        return [Task.from_dict(row) for row in task_rows]
+
+    async def _changed_since(self, watermark: int) -> Dict[str, Set[str]]:
+        changed: Dict[str, Set[str]] = {mirror: set() for mirror, _ in SNAPSHOT_SOURCES.values()}
+        cursor = await self.database_service.execute(
+            f"SELECT DISTINCT mirror, row_id FROM {CHANGES_TABLE} WHERE seq > ?", (watermark,)
+        )
+        for mirror, row_id in await cursor.fetchall():
+            changed.setdefault(mirror, set()).add(row_id)
+        return changed
+
+    async def _last_sequence(self) -> int:
+        # sqlite_sequence no baja al recortar el registro y vuelve atrás con un ROLLBACK
+        cursor = await self.database_service.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = ?", (CHANGES_TABLE,)
+        )
+        row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    async def _meta(self, key: str) -> Optional[str]:
+        cursor = await self.database_service.execute(f"SELECT value FROM {META_TABLE} WHERE key = ?", (key,))
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def _table_exists(self, table: str) -> bool:
+        cursor = await self.database_service.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        )
+        return await cursor.fetchone() is not None
+
+    @staticmethod
+    def _replace(mirror: Dict, key: str, value):
+        if value is None:
+            mirror.pop(key, None)
+        else:
+            mirror[key] = value
+
+    # ------------------------------------------------------------------
+    # Triggers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _trigger_name(table: str, operation: str) -> str:
+        return f"trg_{CHANGES_TABLE}_{table}_{operation}"
+
+    @classmethod
+    def _trigger_statements(cls, table: str, mirror: str, row_id: str) -> List[str]:
+        """Triggers AFTER INSERT/UPDATE/DELETE que anotan la fila del espejo afectada"""
+        log_new = f"INSERT INTO {CHANGES_TABLE} (mirror, row_id) VALUES ('{mirror}', {row_id.format(row='NEW')});"
+        log_old = f"INSERT INTO {CHANGES_TABLE} (mirror, row_id) VALUES ('{mirror}', {row_id.format(row='OLD')});"
+        moved = (
+            f"INSERT INTO {CHANGES_TABLE} (mirror, row_id) SELECT '{mirror}', {row_id.format(row='OLD')} "
+            f"WHERE {row_id.format(row='OLD')} IS NOT {row_id.format(row='NEW')};"
+        )
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {cls._trigger_name(table, 'insert')} "
+            f"AFTER INSERT ON {table} BEGIN {log_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {cls._trigger_name(table, 'update')} "
+            f"AFTER UPDATE ON {table} BEGIN {log_new} {moved} END",
+            f"CREATE TRIGGER IF NOT EXISTS {cls._trigger_name(table, 'delete')} "
+            f"AFTER DELETE ON {table} BEGIN {log_old} END",
+        ]
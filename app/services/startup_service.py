@@ -0,0 +1,209 @@
+"""
+Servicio de Arranque (Startup Service)
+Orquesta la apertura de la BD y la precarga de datos mientras se muestra
+la pantalla de carga, para que las vistas se construyan con datos listos.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from app.config.settings import (
+    POINTS_WRITE_BEHIND_SECONDS,
+    REWARDS_WRITE_BEHIND_SECONDS,
+    SNAPSHOT_INTERVAL_SECONDS,
+)
+from app.models.goal import Goal
+from app.models.task import Task
+from app.services.database_service import DatabaseService
+from app.services.progress_service import ProgressService
+from app.services.task_service import TaskService
+from app.services.habits_service import HabitsService
+from app.services.rewards_service import RewardsService
+from app.services.goals_service import GoalsService
+from app.services.dashboard_counters_service import DashboardCountersService
+from app.services.maintenance_service import MaintenanceService
+from app.services.snapshot_service import SnapshotService
+
+DEFAULT_USER_ID = "default_user"
+
+# Fases de arranque en orden; la pantalla de carga espera cada una
+STARTUP_PHASES = ("connect", "migrate", "preload")
+
+
+class StartupService:
+    """Orquestador de arranque: conecta, migra y precarga en paralelo"""
+
+    def __init__(
+        self,
+        database_service: Optional[DatabaseService] = None,
+        user_id: str = DEFAULT_USER_ID,
+        snapshot_service: Optional[SnapshotService] = None,
+        snapshot_interval: float = SNAPSHOT_INTERVAL_SECONDS,
+    ):
+        """
+        Inicializa el orquestador con servicios que comparten una sola conexión
+
+        Args:
+            database_service: Servicio de BD (crea uno nuevo si no se proporciona)
+            user_id: Usuario cuyas tareas se precargan
+            snapshot_service: Snapshots de los espejos en memoria (default: uno
+                propio si snapshot_interval > 0; None los desactiva)
+            snapshot_interval: Segundos entre snapshots (0 = solo al cerrar)
+        """
+        self.database_service = database_service or DatabaseService()
+        self.user_id = user_id
+
+        self.task_service = TaskService(self.database_service)
+        self.habits_service = HabitsService(self.database_service)
+        self.rewards_service = RewardsService(self.database_service)
+        self.rewards_service.configure_write_behind(REWARDS_WRITE_BEHIND_SECONDS)
+        self.goals_service = GoalsService(self.database_service)
+        self.progress_service = ProgressService(self.database_service)
+        self.progress_service.configure_write_behind(POINTS_WRITE_BEHIND_SECONDS)
+        self.counters_service = DashboardCountersService(self.database_service, user_id)
+        if snapshot_service is None and snapshot_interval > 0:
+            snapshot_service = SnapshotService(self.database_service)
+        self.snapshot_service = snapshot_service
+        self.maintenance_service = MaintenanceService(self.database_service)
+        self.snapshot_interval = snapshot_interval
+
+        # Datos precargados (None = no disponible, la vista hará su propia carga)
+        self.tasks: Optional[List[Task]] = None
+        self.goals: Optional[List[Goal]] = None
+        self.progress_stats: Optional[Dict[str, Any]] = None
+        self.counters: Optional[Dict[str, int]] = None
+        self.loaded: Dict[str, bool] = {
+            "tasks": False,
+            "habits": False,
+            "goals": False,
+            "rewards": False,
+            "progress": False,
+        }
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.errors: Dict[str, Exception] = {}
+        self._phase_events: Dict[str, asyncio.Event] = {name: asyncio.Event() for name in STARTUP_PHASES}
+
+    @property
+    def ready(self) -> bool:
+        """Indica si todas las fases de arranque terminaron"""
+        return all(event.is_set() for event in self._phase_events.values())
+
+    def is_loaded(self, name: str) -> bool:
+        """Indica si un conjunto de datos se precargó correctamente"""
+        return self.loaded.get(name, False)
+
+    async def run(self):
+        """Ejecuta las fases de arranque; la precarga corre con asyncio.gather"""
+        try:
+            await self.database_service.connect()
+        except Exception as e:
+            self.errors["connect"] = e
+            print(f"[StartupService] Error conectando BD: {e}")
+        self._phase_events["connect"].set()
+
+        try:
+            # TaskService.initialize registra sus esquemas y crea todas las tablas registradas
+            await self.task_service.initialize()
+        except Exception as e:
+            self.errors["migrate"] = e
+            print(f"[StartupService] Error aplicando migraciones: {e}")
+        self._phase_events["migrate"].set()
+
+        # Con snapshot válido los espejos ya están llenos: solo se crean las tablas
+        await self._restore_snapshot()
+        full_load = self.snapshot is None
+        loaders = {
+            "tasks": self._load_tasks,
+            "habits": lambda: self.habits_service.initialize(load=full_load),
+            "goals": self._load_goals,
+            "rewards": lambda: self.rewards_service.initialize(load=full_load),
+            "progress": self._load_progress,
+        }
+        results = await asyncio.gather(
+            *(loader() for loader in loaders.values()),
+            return_exceptions=True,
+        )
+        for name, result in zip(loaders, results):
+            if isinstance(result, Exception):
+                self.errors[name] = result
+                print(f"[StartupService] Error precargando {name}: {result}")
+            else:
+                self.loaded[name] = True
+
+        # Tras crear todas las tablas: triggers de contadores y publicación de cambios
+        try:
+            self.counters = await self.counters_service.refresh()
+            self.counters_service.start()
+        except Exception as e:
+            self.errors["counters"] = e
+            print(f"[StartupService] Error preparando contadores del resumen: {e}")
+        if self.snapshot_service is not None:
+            try:
+                await self.snapshot_service.initialize()
+                self.snapshot_service.start(self.snapshot_interval)
+            except Exception as e:
+                self.errors["snapshot"] = e
+                print(f"[StartupService] Error preparando snapshots: {e}")
+        # Backup y compactación cuando la aplicación quede ociosa
+        self.maintenance_service.start()
+        self._phase_events["preload"].set()
+        print(f"[StartupService] Arranque completado: {sum(self.loaded.values())}/{len(self.loaded)} conjuntos precargados")
+
+    async def shutdown(self):
+        """Confirma las escrituras pendientes antes de cerrar la aplicación"""
+        self.counters_service.stop()
+        self.maintenance_service.stop()
+        try:
+            await self.progress_service.shutdown()
+        except Exception as e:
+            print(f"[StartupService] Error confirmando puntos pendientes: {e}")
+        try:
+            await self.rewards_service.flush()
+        except Exception as e:
+            print(f"[StartupService] Error guardando recompensas pendientes: {e}")
+        if self.snapshot_service is not None:
+            self.snapshot_service.stop()
+            try:
+                await self.snapshot_service.save()
+            except Exception as e:
+                print(f"[StartupService] Error guardando snapshot: {e}")
+
+    async def wait_phase(self, name: str):
+        """Espera a que termine una fase de arranque"""
+        await self._phase_events[name].wait()
+
+    def loading_steps(self) -> list:
+        """
+        Pasos para LoadingScreen que siguen el avance real del arranque
+
+        Returns:
+            Lista de tuplas (etiqueta, función async)
+        """
+        labels = {
+            "connect": "Conectando base de datos...",
+            "migrate": "Aplicando migraciones...",
+            "preload": "Cargando tareas, hábitos, metas y recompensas...",
+        }
+        return [(labels[name], lambda name=name: self.wait_phase(name)) for name in STARTUP_PHASES]
+
+    async def _restore_snapshot(self):
+        if self.snapshot_service is None:
+            return
+        try:
+            self.snapshot = await self.snapshot_service.restore(
+                self.task_service, self.habits_service, self.rewards_service
+            )
+        except Exception as e:
+            self.errors["snapshot"] = e
+            print(f"[StartupService] Error restaurando snapshot, se hace la carga completa: {e}")
+
+    async def _load_tasks(self):
+        if self.snapshot is not None:
+            self.tasks = self.task_service.get_cached_tasks(self.user_id)
+            return
+        self.tasks = await self.task_service.get_all_tasks(user_id=self.user_id)
+
+    async def _load_goals(self):
+        self.goals = await self.goals_service.list_goals()
+
+    async def _load_progress(self):
+        self.progress_stats = await self.progress_service.load_stats()
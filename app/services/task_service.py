@@ -17,6 +17,7 @@ from app.utils.task_helper import (
 )
 from app.utils.eisenhower_matrix import get_eisenhower_quadrant
 from app.services.database_service import DatabaseService, TableSchema
+from app.services.event_bus import SubtaskToggled, TaskCompleted, TaskDeleted, TaskStatusChanged, event_bus
 
 
 class TaskService:
@@ -167,6 +168,9 @@ class TaskService:
                         print(f"Error guardando subtarea {idx+1}: {e}")
                 
                 print(f"DEBUG: Tarea {task_id} creada exitosamente con {len(subtasks_data)} subtareas")
+                if task.status == TASK_STATUS_COMPLETED:
+                    event_bus.publish(TaskStatusChanged(task_id=task.id, status=task.status))
+                    event_bus.publish(TaskCompleted(task_id=task.id, title=task.title))
                 
             except Exception as e:
                 # Si falla la BD, mantener en memoria
@@ -207,6 +211,19 @@ class TaskService:
         
         return task
     
+    def load_cache(self, tasks: Dict[str, Task]):
+        """Reemplaza el caché en memoria por un conjunto completo de tareas (p. ej. de un snapshot)"""
+        self._tasks = tasks
+
+    def get_cached_tasks(self, user_id: Optional[str] = None) -> List[Task]:
+        """
+        Tareas del caché en memoria sin consultar la BD, más recientes primero
+
+        Solo es completo tras load_cache(); en otro caso contiene lo ya leído.
+        """
+        tasks = [t for t in self._tasks.values() if not user_id or t.user_id == user_id]
+        return sorted(tasks, key=lambda t: str(t.created_at), reverse=True)
+
     async def get_all_tasks(self, user_id: Optional[str] = None, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
         """
         Obtiene todas las tareas, opcionalmente filtradas
@@ -333,6 +350,9 @@ class TaskService:
         task = await self.get_task(task_id)
         if not task:
             return None
+        # Estado guardado en BD antes de escribir (la tarea en memoria puede
+        # ser el mismo objeto que la vista ya modificó)
+        stored_status, stored_subtasks = await self._stored_completion_state(task_id, task_data)
         
         # Actualizar campos
         if "title" in task_data:
@@ -416,10 +436,45 @@ class TaskService:
                 update_data["updated_at"] = task.updated_at.isoformat()
                 
                 await self.database_service.update('tasks', task_id, update_data)
+                self._publish_completion_changes(task, stored_status, stored_subtasks)
             except Exception as e:
                 print(f"Error actualizando tarea en BD: {e}")
         
         return task
+
+    async def _stored_completion_state(self, task_id: str, task_data: Dict[str, Any]):
+        """Estado y subtareas completadas guardados en BD, solo si la actualización los toca"""
+        if not self.database_service:
+            return None, None
+        status = subtasks = None
+        try:
+            if "status" in task_data:
+                cursor = await self.database_service.execute("SELECT status FROM tasks WHERE id = ?", (task_id,))
+                row = await cursor.fetchone()
+                status = row[0] if row else None
+            if "subtasks" in task_data:
+                cursor = await self.database_service.execute(
+                    "SELECT id, completed FROM subtasks WHERE task_id = ?", (task_id,)
+                )
+                subtasks = {subtask_id: bool(completed) for subtask_id, completed in await cursor.fetchall()}
+        except Exception as e:
+            print(f"Error leyendo estado guardado de la tarea: {e}")
+        return status, subtasks
+
+    def _publish_completion_changes(self, task: Task, stored_status: Optional[str], stored_subtasks: Optional[Dict[str, bool]]):
+        """Publica en el bus los cambios de estado y de completado ya escritos en BD"""
+        if stored_status is not None and stored_status != task.status:
+            event_bus.publish(TaskStatusChanged(task_id=task.id, status=task.status, previous_status=stored_status))
+            if task.status == TASK_STATUS_COMPLETED:
+                event_bus.publish(TaskCompleted(task_id=task.id, title=task.title))
+        if stored_subtasks is None:
+            return
+        current = {subtask.id: subtask.completed for subtask in task.subtasks}
+        for subtask_id in stored_subtasks.keys() | current.keys():
+            if stored_subtasks.get(subtask_id, False) != current.get(subtask_id, False):
+                event_bus.publish(SubtaskToggled(
+                    subtask_id=subtask_id, task_id=task.id, completed=current.get(subtask_id, False)
+                ))
     
     async def delete_task(self, task_id: str) -> bool:
         """
@@ -448,6 +503,7 @@ class TaskService:
         if self.database_service:
             try:
                 await self.database_service.delete('tasks', task_id)
+                event_bus.publish(TaskDeleted(task_id=task_id))
             except Exception as e:
                 print(f"Error eliminando tarea de BD: {e}")
         
@@ -566,6 +622,7 @@ class TaskService:
         subtask = await self.get_subtask(subtask_id)
         if not subtask:
             return None
+        was_completed = subtask.completed
         
         # Actualizar campos
         if "title" in subtask_data:
@@ -622,6 +679,10 @@ class TaskService:
                     update_data["notes"] = subtask.notes
                 
                 await self.database_service.update('subtasks', subtask_id, update_data)
+                if subtask.completed != was_completed:
+                    event_bus.publish(SubtaskToggled(
+                        subtask_id=subtask_id, task_id=subtask.task_id, completed=subtask.completed
+                    ))
             except Exception as e:
                 print(f"Error actualizando subtarea en BD: {e}")
         
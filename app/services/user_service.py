@@ -0,0 +1,294 @@
+"""
+Servicio de Usuarios (User Service)
+Gestiona usuarios, sus puntos y niveles con persistencia en SQLite
+mediante DatabaseService. Pensado para muchos usuarios: las columnas de
+puntos y nivel están indexadas y el ranking se resuelve con LIMIT sobre el índice.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from app.logic.system_points import PointsSystem, Level, LEVEL_POINTS, POINTS_BY_ACTION
+from app.models.user import User
+from app.services.database_service import DatabaseService, TableSchema
+
+USERS_TABLE = "users"
+
+# Tamaño de lote para consultas con IN (...) (límite de variables de SQLite)
+_CHUNK_SIZE = 500
+
+
+class UserService:
+    """Servicio de usuarios multiusuario con persistencia"""
+
+    def __init__(self, database_service: Optional[DatabaseService] = None):
+        """
+        Inicializa el servicio
+
+        Args:
+            database_service: Servicio de BD (crea uno nuevo si no se proporciona)
+        """
+        self.database_service = database_service or DatabaseService()
+        self._initialized = False
+
+    async def initialize(self):
+        """Registra el esquema de usuarios y crea la tabla e índices"""
+        if self._initialized:
+            return
+        users_schema = TableSchema(
+            table_name=USERS_TABLE,
+            columns={
+                "id": "TEXT PRIMARY KEY",
+                "username": "TEXT NOT NULL",
+                "email": "TEXT",
+                "points": "REAL NOT NULL DEFAULT 0",
+                "level": "TEXT NOT NULL DEFAULT 'Nadie'",
+                "total_actions": "INTEGER NOT NULL DEFAULT 0",
+                "created_at": "TEXT NOT NULL",
+                "updated_at": "TEXT NOT NULL",
+                "is_active": "INTEGER NOT NULL DEFAULT 1",
+            },
+            # (points DESC, id) sirve el ranking sin ordenar toda la tabla
+            indexes=["points DESC, id", "level", "username"],
+        )
+        self.database_service.register_table_schema(users_schema)
+        await self.database_service.initialize()
+        self._initialized = True
+
+    # ============================================================================
+    # CRUD DE USUARIOS
+    # ============================================================================
+
+    async def create_user(self, username: str, email: str = "") -> User:
+        """
+        Crea un usuario nuevo
+
+        Args:
+            username: Nombre de usuario
+            email: Correo electrónico (opcional)
+
+        Returns:
+            Usuario creado
+        """
+        await self.initialize()
+        user = User(username=username, email=email)
+        await self.database_service.create(USERS_TABLE, user.to_dict())
+        return user
+
+    async def get_user(self, user_id: str) -> Optional[User]:
+        """Obtiene un usuario por su ID"""
+        await self.initialize()
+        record = await self.database_service.get(USERS_TABLE, user_id)
+        return self._to_user(record) if record else None
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        """Obtiene un usuario por su nombre de usuario"""
+        await self.initialize()
+        records = await self.database_service.get_all(USERS_TABLE, filters={"username": username})
+        return self._to_user(records[0]) if records else None
+
+    async def delete_user(self, user_id: str) -> bool:
+        """Elimina un usuario"""
+        await self.initialize()
+        return await self.database_service.delete(USERS_TABLE, user_id)
+
+    async def count_users(self) -> int:
+        """Cuenta los usuarios registrados"""
+        await self.initialize()
+        return await self.database_service.count(USERS_TABLE)
+
+    # ============================================================================
+    # PUNTOS Y NIVELES
+    # ============================================================================
+
+    async def add_points_to_user(self, user_id: str, action: str, amount: Optional[float] = None) -> bool:
+        """
+        Añade puntos a un usuario por una acción
+
+        Args:
+            user_id: ID del usuario
+            action: Acción realizada (clave de POINTS_BY_ACTION)
+            amount: Cantidad específica de puntos (opcional)
+
+        Returns:
+            True si el usuario cambió de nivel
+        """
+        points = amount if amount is not None else POINTS_BY_ACTION.get(action, 0.0)
+        changed = await self.add_points_bulk({user_id: points})
+        return user_id in changed
+
+    async def add_points_bulk(
+        self,
+        updates: Union[Mapping[str, float], Iterable[Tuple]],
+    ) -> Dict[str, Level]:
+        """
+        Aplica muchas sumas de puntos en una sola transacción
+
+        Args:
+            updates: {user_id: puntos}, pares (user_id, puntos) o ternas
+                (user_id, puntos, acciones) cuando una entrada agrupa varias
+                asignaciones; un mismo usuario puede aparecer varias veces.
+                Sin número de acciones cada entrada cuenta como una.
+
+        Returns:
+            {user_id: nuevo nivel} de los usuarios que cambiaron de nivel
+        """
+        await self.initialize()
+        pairs = updates.items() if isinstance(updates, Mapping) else updates
+        totals: Dict[str, List[float]] = {}
+        for user_id, points, *actions in pairs:
+            entry = totals.setdefault(user_id, [0.0, 0])
+            entry[0] += points
+            entry[1] += actions[0] if actions else 1
+        if not totals:
+            return {}
+
+        db = self.database_service
+        now = datetime.now().isoformat()
+        async with db.savepoint("users_points"):
+            await db.executemany(
+                f"UPDATE {USERS_TABLE} SET points = points + ?, total_actions = total_actions + ?, "
+                f"updated_at = ? WHERE id = ?",
+                [(points, actions, now, user_id) for user_id, (points, actions) in totals.items()],
+            )
+
+            # Recalcular el nivel solo de los usuarios tocados
+            changed: Dict[str, Level] = {}
+            user_ids = list(totals)
+            for start in range(0, len(user_ids), _CHUNK_SIZE):
+                chunk = user_ids[start:start + _CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor = await db.execute(
+                    f"SELECT id, points, level FROM {USERS_TABLE} WHERE id IN ({placeholders})", tuple(chunk)
+                )
+                rows = await cursor.fetchall()
+                new_levels = PointsSystem.levels_for(row[1] for row in rows)
+                for (user_id, _, old_level), level in zip(rows, new_levels):
+                    if level.value != old_level:
+                        changed[user_id] = level
+            if changed:
+                await db.executemany(
+                    f"UPDATE {USERS_TABLE} SET level = ? WHERE id = ?",
+                    [(level.value, user_id) for user_id, level in changed.items()],
+                )
+        await db.commit()
+        return changed
+
+    async def get_user_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene estadísticas de nivel y progreso de un usuario
+
+        Returns:
+            Diccionario con estadísticas o None si no existe
+        """
+        user = await self.get_user(user_id)
+        if user is None:
+            return None
+        info = PointsSystem.get_level_info(user.points)
+        points_in_current, total_for_next = PointsSystem.get_progress_to_next_level(user.points)
+        return {
+            "user_id": user.id,
+            "username": user.username,
+            "points": user.points,
+            "level": info.level.value,
+            "icon": PointsSystem.get_level_icon(info.level),
+            "color": PointsSystem.get_level_color(info.level),
+            "progress_percent": (points_in_current / total_for_next * 100.0) if total_for_next else 100.0,
+            "points_in_current_level": points_in_current,
+            "total_for_next_level": total_for_next,
+            "next_level": info.next_level.value if info.next_level else None,
+            "next_level_points": LEVEL_POINTS[info.next_level] if info.next_level else None,
+            "rank": await self.get_user_rank(user_id),
+        }
+
+    # ============================================================================
+    # RANKING
+    # ============================================================================
+
+    async def get_leaderboard(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Obtiene el top-N de usuarios por puntos
+
+        Recorre el índice (points DESC, id) y se detiene tras `limit` filas,
+        por lo que el coste no depende del número total de usuarios.
+
+        Args:
+            limit: Cantidad máxima de usuarios
+            offset: Usuarios a saltar (paginación)
+
+        Returns:
+            Lista de diccionarios con rank, user_id, username, level, points e icon
+        """
+        await self.initialize()
+        cursor = await self.database_service.execute(
+            f"SELECT id, username, points, level FROM {USERS_TABLE} "
+            f"ORDER BY points DESC, id LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        rows = await cursor.fetchall()
+        leaderboard = []
+        for idx, (user_id, username, points, level) in enumerate(rows):
+            level_enum = self._level_from_value(level)
+            leaderboard.append({
+                "rank": offset + idx + 1,
+                "user_id": user_id,
+                "username": username,
+                "level": level_enum.value,
+                "points": points,
+                "icon": PointsSystem.get_level_icon(level_enum),
+            })
+        return leaderboard
+
+    async def get_ranking(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Alias de get_leaderboard (misma forma que LevelManager.get_ranking)"""
+        return await self.get_leaderboard(limit=limit)
+
+    async def get_user_rank(self, user_id: str) -> Optional[int]:
+        """
+        Posición de un usuario en el ranking (1 = primero)
+
+        Cuenta sobre el índice de puntos los usuarios por delante; no ordena la tabla.
+        """
+        await self.initialize()
+        cursor = await self.database_service.execute(
+            f"SELECT points FROM {USERS_TABLE} WHERE id = ?", (user_id,)
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return None
+        points = row[0]
+        # Dos rangos sobre el índice (points, id): más puntos, o empate con id menor
+        cursor = await self.database_service.execute(
+            f"""
+            SELECT 1
+                + (SELECT COUNT(*) FROM {USERS_TABLE} WHERE points > ?)
+                + (SELECT COUNT(*) FROM {USERS_TABLE} WHERE points = ? AND id < ?)
+            """,
+            (points, points, user_id),
+        )
+        row = await cursor.fetchone()
+        return int(row[0])
+
+    async def count_by_level(self) -> Dict[str, int]:
+        """Cantidad de usuarios por nivel (usa el índice de nivel)"""
+        await self.initialize()
+        cursor = await self.database_service.execute(
+            f"SELECT level, COUNT(*) FROM {USERS_TABLE} GROUP BY level"
+        )
+        return {level: count for level, count in await cursor.fetchall()}
+
+    # ============================================================================
+    # UTILIDADES
+    # ============================================================================
+
+    @staticmethod
+    def _level_from_value(value: str) -> Level:
+        try:
+            return Level(value)
+        except ValueError:
+            return Level.NADIE
+
+    @staticmethod
+    def _to_user(record: Dict[str, Any]) -> User:
+        data = dict(record)
+        data["is_active"] = bool(data.get("is_active", 1))
+        return User.from_dict(data)
@@ -0,0 +1,25 @@
+"""
+Módulo de interfaz de usuario
+Expone las vistas principales de la aplicación.
+Las exportaciones se resuelven de forma perezosa al primer acceso.
+"""
+
+from app.utils.lazy import lazy_exports
+
+# ============================================================================
+# EXPORTACIONES PEREZOSAS (PEP 562)
+# Cada vista se importa desde su submódulo la primera vez que se accede,
+# así la pantalla de carga no espera a que se importe toda la UI.
+# ============================================================================
+_LAZY_EXPORTS = {
+    'HomeView': '.home_view',
+    'ResumeView': '.resume.resume_view',
+    'TaskView': '.task.task_view',
+    'HabitsView': '.habits.habits_view',
+    'GoalsView': '.goals.goals_view',
+    'SettingsView': '.settings.settings_view',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _LAZY_EXPORTS)
@@ -16,7 +16,7 @@ class GoalsCard(ft.Card):
         self.desc = ft.Text(goal.description, size=14, color="#FF8A80")
         self.type = ft.Text(f"Tipo: {goal.goal_type}", size=12, color="#FF1744")
         self.unit = ft.Text(f"Unidad: {goal.unit_type if goal.unit_type != 'otro' else goal.custom_unit}", size=12, color="#FF1744")
-        self.goal_class = getattr(goal, "goal_class", "incremental")
+        self.goal_class = goal.goal_class
         self.target = ft.Text(f"Objetivo: {goal.target}", size=12, color="#FF5252")
         self.progress = ft.Text(f"Progreso: {goal.progress}", size=12, color="#FF5252")
 
@@ -31,10 +31,7 @@ class GoalsCard(ft.Card):
         self.delete_btn = ft.IconButton(ft.Icons.DELETE.value, tooltip="Eliminar", on_click=lambda _: self.on_delete(goal), icon_color="#FF1744", bgcolor="#1a1a1a")
 
         # Determinar si la meta está cumplida según el tipo
-        if self.goal_class == "incremental":
-            self.is_completed = goal.target > 0 and goal.progress >= goal.target
-        else:
-            self.is_completed = goal.target > 0 and goal.progress <= goal.target
+        self.is_completed = goal.completed
 
         # Botón para actualizar progreso (deshabilitado si está cumplida)
         if self.goal_class == "reductual":
@@ -5,6 +5,7 @@ import flet as ft
 from typing import List, Callable
 from app.models.goal import Goal
 from app.ui.goals.goals_card import GoalsCard
+from app.utils.update_scheduler import request_update
 
 class GoalsList(ft.Column):
     def __init__(self, goals: List[Goal], on_edit: Callable, on_delete: Callable, on_progress_update: Callable = None):
@@ -40,27 +41,9 @@ class GoalsList(ft.Column):
     def refresh(self):
         # Mantener la barra de filtro arriba
         self.controls = [self.filter_bar]
-        filtered_goals = []
-        for g in self.goals:
-            goal_class = getattr(g, "goal_class", "incremental")
-            if self.filter_state == "in_progress":
-                if goal_class == "incremental":
-                    # Incremental: meta NO cumplida si progreso < objetivo
-                    if not (g.target > 0 and g.progress >= g.target):
-                        filtered_goals.append(g)
-                else:  # reductual
-                    # Reductual: meta NO cumplida si progreso > objetivo
-                    if not (g.target > 0 and g.progress <= g.target):
-                        filtered_goals.append(g)
-            else:  # completed
-                if goal_class == "incremental":
-                    # Incremental: meta cumplida si progreso >= objetivo
-                    if g.target > 0 and g.progress >= g.target:
-                        filtered_goals.append(g)
-                else:  # reductual
-                    # Reductual: meta cumplida si progreso <= objetivo
-                    if g.target > 0 and g.progress <= g.target:
-                        filtered_goals.append(g)
+        # Goal.completed aplica la regla incremental/reductual
+        want_completed = self.filter_state != "in_progress"
+        filtered_goals = [g for g in self.goals if g.completed == want_completed]
         for goal in filtered_goals:
             card = GoalsCard(
                 goal,
@@ -73,5 +56,4 @@ class GoalsList(ft.Column):
     def set_goals(self, goals: List[Goal]):
         self.goals = goals
         self.refresh()
-        if hasattr(self, 'page') and self.page:
-            self.update()
+        request_update(self)
@@ -6,12 +6,15 @@ from app.services.goals_service import GoalsService
 from app.models.goal import Goal
 from app.ui.goals.goals_list import GoalsList
 from app.ui.goals.goals_form import GoalsForm
+from app.utils.update_scheduler import request_update
 
 class GoalsView(ft.Container):
-    def __init__(self, goals_service: GoalsService = None):
+    def __init__(self, goals_service: GoalsService = None, goals: list = None):
         super().__init__()
         self.goals_service = goals_service or GoalsService()
-        self.goals = []
+        # Metas precargadas en el arranque (None = cargarlas en build)
+        self._preloaded = goals is not None
+        self.goals = list(goals) if goals is not None else []
         self.selected_goal = None
         self.showing_form = False
         self.form_container = ft.Container(visible=False)
@@ -46,8 +49,10 @@ class GoalsView(ft.Container):
 
     def build(self, page=None):
         import asyncio
+        if self._preloaded:
+            return self
         async def load_goals():
-            await self.goals_service.db.initialize()
+            await self.goals_service.initialize()
             self.goals = await self.goals_service.list_goals()
             self.goals_list.set_goals(self.goals)
         asyncio.create_task(load_goals())
@@ -62,7 +67,7 @@ class GoalsView(ft.Container):
         self.form_container.visible = True
         self.list_container.visible = False
         self.add_btn.visible = False
-        self.update()
+        request_update(self)
 
     def _show_edit_form(self, goal: Goal):
         self.selected_goal = goal
@@ -74,13 +79,13 @@ class GoalsView(ft.Container):
         self.form_container.visible = True
         self.list_container.visible = False
         self.add_btn.visible = False
-        self.update()
+        request_update(self)
 
     def _hide_form(self, *_):
         self.form_container.visible = False
         self.list_container.visible = True
         self.add_btn.visible = True
-        self.update()
+        request_update(self)
 
     def _add_goal(self, values):
         import asyncio
@@ -106,24 +111,26 @@ class GoalsView(ft.Container):
             await self.goals_service.delete_goal(goal.id)
             self.goals = await self.goals_service.list_goals()
             self.goals_list.set_goals(self.goals)
-            self.update()
+            request_update(self)
         asyncio.create_task(delete())
 
     def _update_progress(self, goal: Goal, action="incremental"):
         import asyncio
         from app.services.progress_service import ProgressService
         async def update():
-            if getattr(goal, "goal_class", "incremental") == "reductual" or action == "reductual":
-                new_progress = max(goal.progress - 1, goal.target)
+            # Resta si la meta es reductual o si se pulsó el botón de reducir
+            updated = await self.goals_service.step_progress(goal.id, action=action)
+            if updated is None:
+                return
+            if updated.goal_class == "reductual" or action == "reductual":
                 points_action = "goal_decrement_completed"
             else:
-                new_progress = goal.progress + 1
                 points_action = "goal_increment_completed"
-            await self.goals_service.update_goal(goal.id, progress=new_progress)
             # Sumar puntos usando ProgressService
             progress_service = ProgressService()
             await progress_service.add_points(points_action)
-            self.goals = await self.goals_service.list_goals()
+            # Reemplazar solo la meta modificada en lugar de recargar el listado
+            self.goals = [updated if g.id == updated.id else g for g in self.goals]
             self.goals_list.set_goals(self.goals)
-            self.update()
+            request_update(self)
         asyncio.create_task(update())
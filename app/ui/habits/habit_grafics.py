@@ -2,15 +2,34 @@
 Vista de gráficos para un hábito.
 """
 
+from datetime import date
+from typing import Dict, List, Optional
+
 import flet as ft
 from app.models.habit import Habit
 
+HEATMAP_CELL_SIZE = 12
+TREND_BAR_HEIGHT = 80
+
 
 class HabitGraphics:
 	"""Construye una vista simple de gráficos para un hábito."""
 
-	def __init__(self, habit: Habit):
+	def __init__(
+		self,
+		habit: Habit,
+		daily_series: Optional[List[Dict]] = None,
+		trend_series: Optional[List[Dict]] = None,
+	):
+		"""
+		Args:
+			habit: Hábito a mostrar
+			daily_series: Serie diaria de HabitsService.get_completion_series (mapa de calor)
+			trend_series: Serie semanal o mensual (gráfico de tendencia)
+		"""
 		self.habit = habit
+		self.daily_series = daily_series
+		self.trend_series = trend_series
 
 	def build(self) -> ft.Column:
 		habit = self.habit
@@ -28,7 +47,7 @@ class HabitGraphics:
 				),
 				ft.Divider(color=ft.Colors.WHITE_10),
 				ft.Text("Progreso del periodo", weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
-				ft.ProgressBar(value=progress_value, color=ft.Colors.RED_400, bgcolor=ft.Colors.WHITE24),
+				ft.ProgressBar(value=progress_value, color=ft.Colors.RED_400, bgcolor=ft.Colors.WHITE_24),
 				ft.Text(
 					f"{min(habit.streak, target)}/{target} completado(s) del periodo",
 					size=12,
@@ -42,7 +61,72 @@ class HabitGraphics:
 						ft.Text(f"Racha actual: {habit.streak}", color=ft.Colors.WHITE),
 					]
 				),
+				ft.Divider(color=ft.Colors.WHITE_10),
+				ft.Text("Calendario", weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
+				self._build_heatmap(),
+				ft.Divider(color=ft.Colors.WHITE_10),
+				ft.Text("Tendencia", weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
+				self._build_trend(),
 			],
 			spacing=10,
 			width=350,
 		)
+
+	@staticmethod
+	def _loading_text() -> ft.Text:
+		return ft.Text("Cargando historial...", size=12, color=ft.Colors.WHITE_70)
+
+	@staticmethod
+	def _rate_color(rate: float) -> str:
+		if rate <= 0:
+			return ft.Colors.WHITE_10
+		return ft.Colors.with_opacity(0.35 + 0.65 * min(rate, 1.0), ft.Colors.RED_400)
+
+	def _build_heatmap(self) -> ft.Control:
+		"""Cuadrícula semana x día (lunes arriba) coloreada por tasa diaria"""
+		if self.daily_series is None:
+			return self._loading_text()
+		weeks: List[ft.Column] = []
+		cells: List[ft.Control] = []
+		for index, point in enumerate(self.daily_series):
+			weekday = date.fromisoformat(point["period"]).weekday()
+			if index == 0:
+				# Huecos antes del primer día para alinear las filas por día de la semana
+				cells = [ft.Container(width=HEATMAP_CELL_SIZE, height=HEATMAP_CELL_SIZE) for _ in range(weekday)]
+			elif weekday == 0:
+				weeks.append(ft.Column(cells, spacing=2))
+				cells = []
+			cells.append(
+				ft.Container(
+					width=HEATMAP_CELL_SIZE,
+					height=HEATMAP_CELL_SIZE,
+					bgcolor=self._rate_color(point["rate"]),
+					border_radius=2,
+					tooltip=f"{point['period']}: {point['count']}",
+				)
+			)
+		if cells:
+			weeks.append(ft.Column(cells, spacing=2))
+		return ft.Row(weeks, spacing=2, scroll=ft.ScrollMode.AUTO)
+
+	def _build_trend(self) -> ft.Control:
+		"""Barras con la tasa de cumplimiento de cada periodo"""
+		if self.trend_series is None:
+			return self._loading_text()
+		bars = [
+			ft.Container(
+				width=14,
+				height=max(2, point["rate"] * TREND_BAR_HEIGHT),
+				bgcolor=ft.Colors.RED_400 if point["count"] else ft.Colors.WHITE_24,
+				border_radius=2,
+				tooltip=f"{point['period']}: {point['count']} ({point['rate']:.0%})",
+			)
+			for point in self.trend_series
+		]
+		return ft.Row(
+			bars,
+			spacing=4,
+			height=TREND_BAR_HEIGHT,
+			vertical_alignment=ft.CrossAxisAlignment.END,
+			scroll=ft.ScrollMode.AUTO,
+		)
@@ -21,6 +21,7 @@ class HabitsList:
         on_edit: Callable[[Habit], None],
         on_delete: Callable[[str], None],
         on_show_graphs: Callable[[Habit], None],
+        on_complete_all: Optional[Callable] = None,
     ):
         self.habits_service = habits_service
         self.on_add = on_add
@@ -28,6 +29,7 @@ class HabitsList:
         self.on_edit = on_edit
         self.on_delete = on_delete
         self.on_show_graphs = on_show_graphs
+        self.on_complete_all = on_complete_all
 
         self.list_container: Optional[ft.Container] = None
 
@@ -38,6 +40,26 @@ class HabitsList:
             expand=True,
         )
 
+        actions = [
+            ft.IconButton(
+                icon=ft.Icons.ADD_CIRCLE,
+                icon_size=28,
+                icon_color=ft.Colors.RED_400,
+                on_click=self.on_add,
+            ),
+        ]
+        if self.on_complete_all:
+            actions.insert(
+                0,
+                ft.IconButton(
+                    icon=ft.Icons.DONE_ALL,
+                    icon_size=28,
+                    icon_color=ft.Colors.WHITE_70,
+                    tooltip="Completar todos hoy",
+                    on_click=self.on_complete_all,
+                ),
+            )
+
         header = ft.Container(
             content=ft.Row(
                 [
@@ -47,12 +69,7 @@ class HabitsList:
                         weight=ft.FontWeight.BOLD,
                         color=ft.Colors.WHITE,
                     ),
-                    ft.IconButton(
-                        icon=ft.Icons.ADD_CIRCLE,
-                        icon_size=28,
-                        icon_color=ft.Colors.RED_400,
-                        on_click=self.on_add,
-                    ),
+                    ft.Row(actions, spacing=0),
                 ],
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
             ),
@@ -5,6 +5,7 @@ Sistema completo de hábitos con persistencia en BD, racha diaria y CRUD
 
 import flet as ft
 import asyncio
+from datetime import date
 from typing import Optional, Callable
 
 from app.services.habits_service import HabitsService
@@ -17,19 +18,22 @@ from app.ui.habits.habit_grafics import HabitGraphics
 class HabitsView:
     """Clase que representa la vista de hábitos con CRUD y persistencia BD"""
     
-    def __init__(self, on_update: Optional[Callable] = None):
+    def __init__(self, on_update: Optional[Callable] = None, habits_service: Optional[HabitsService] = None):
         """
         Inicializa la vista de hábitos
         
         Args:
             on_update: Callback opcional al actualizar hábitos
+            habits_service: Servicio ya inicializado con hábitos cargados (opcional)
         """
-        self.habits_service = HabitsService()
+        self._preloaded = habits_service is not None
+        self.habits_service = habits_service or HabitsService()
         self.progress_service = ProgressService()
         self.on_update = on_update
         self.showing_form = False
         self.showing_graphs = False
         self.graph_habit = None
+        self.graph_series = None
         self.editing_habit_id: Optional[str] = None
 
         # UI Components
@@ -41,6 +45,7 @@ class HabitsView:
             on_edit=self._start_edit,
             on_delete=self._delete_habit,
             on_show_graphs=self._show_graphs,
+            on_complete_all=lambda e: self._complete_all_habits(),
         )
         self.main_column = None
     
@@ -96,15 +101,36 @@ class HabitsView:
         """Marca/desmarca un hábito como completado de forma asíncrona"""
         try:
             was_completed = await self.habits_service.complete_habit(habit_id)
+            action = self._get_points_action_for_habit(habit_id)
+            # Un otorgamiento vigente por hábito y día: desmarcar lo revierte
+            source_id = f"{habit_id}:{date.today().isoformat()}"
             if was_completed:
-                action = self._get_points_action_for_habit(habit_id)
-                await self.progress_service.add_points(action)
+                await self.progress_service.add_points(action, source_id=source_id)
+            else:
+                await self.progress_service.revoke_points(action, source_id=source_id)
             self._refresh_list()
             if self.on_update:
                 self.on_update()
         except Exception as e:
             print(f"[HabitsView] Error completando hábito: {e}")
     
+    def _complete_all_habits(self):
+        """Marca como completados hoy todos los hábitos pendientes"""
+        asyncio.create_task(self._async_complete_all_habits())
+
+    async def _async_complete_all_habits(self):
+        """Completa los pendientes en un solo lote (completados, rachas y puntos)"""
+        try:
+            pending = [h.id for h in self.habits_service.get_all_habits() if not h.was_completed_today()]
+            if not pending:
+                return
+            await self.habits_service.complete_habits(pending, progress_service=self.progress_service)
+            self._refresh_list()
+            if self.on_update:
+                self.on_update()
+        except Exception as e:
+            print(f"[HabitsView] Error completando hábitos: {e}")
+
     def _delete_habit(self, habit_id: str):
         """Elimina un hábito"""
         asyncio.create_task(self._async_delete_habit(habit_id))
@@ -130,13 +156,28 @@ class HabitsView:
     def _show_graphs(self, habit):
         """Muestra vista de gráficos del hábito en la misma página"""
         self.graph_habit = habit
+        self.graph_series = None
         self.showing_graphs = True
         self.showing_form = False
         self._update_view()
+        asyncio.create_task(self._load_graph_series(habit))
+
+    async def _load_graph_series(self, habit):
+        """Carga las series agregadas del hábito y redibuja los gráficos"""
+        try:
+            daily = await self.habits_service.get_completion_series(habit.id, "day")
+            weekly = await self.habits_service.get_completion_series(habit.id, "week")
+        except Exception as e:
+            print(f"[HabitsView] Error cargando gráficas: {e}")
+            return
+        if self.graph_habit is habit:
+            self.graph_series = (daily, weekly)
+            self._update_view()
 
     def _hide_graphs(self):
         self.showing_graphs = False
         self.graph_habit = None
+        self.graph_series = None
         self._update_view()
 
     def _get_points_action_for_habit(self, habit_id: str) -> str:
@@ -184,7 +225,8 @@ class HabitsView:
         """Construye la vista de gráficos para el hábito seleccionado"""
         if not self.graph_habit:
             return ft.Container()
-        graph_content = HabitGraphics(self.graph_habit).build()
+        daily, trend = self.graph_series or (None, None)
+        graph_content = HabitGraphics(self.graph_habit, daily, trend).build()
         return ft.Container(
             content=ft.Column(
                 [
@@ -227,13 +269,14 @@ class HabitsView:
             expand=True,
         )
         
-        # Inicializar BD de forma asíncrona
-        async def init():
-            await self.habits_service.initialize()
-            # Actualizar la lista después de cargar los hábitos
-            self._refresh_list()
-        
-        asyncio.create_task(init())
+        # Inicializar BD de forma asíncrona si los hábitos no vienen precargados
+        if not self._preloaded:
+            async def init():
+                await self.habits_service.initialize()
+                # Actualizar la lista después de cargar los hábitos
+                self._refresh_list()
+            
+            asyncio.create_task(init())
         
         return ft.Container(
             content=self.main_column,
@@ -10,6 +10,7 @@ from app.ui.task.task_view import TaskView
 from app.ui.settings.settings_view import SettingsView
 from app.ui.habits.habits_view import HabitsView
 from app.ui.goals.goals_view import GoalsView
+from app.services.startup_service import StartupService
 from typing import Callable, Dict, List, Optional, Any
 
 class HomeView:
@@ -19,12 +20,13 @@ class HomeView:
         """Inicializa la vista principal"""
         self.page_ref = None
     
-    def build(self, page: ft.Page) -> ft.Container:
+    def build(self, page: ft.Page, startup: Optional[StartupService] = None) -> ft.Container:
         """
         Construye y retorna el widget principal de la vista con BottomNav
         
         Args:
             page: Objeto Page de Flet (requerido)
+            startup: Orquestador de arranque con servicios y datos precargados (opcional)
         
         Returns:
             Container con el contenido de la vista principal y navegación
@@ -32,20 +34,44 @@ class HomeView:
         # Guardar referencia a la página
         self.page_ref = page
         
-        # Crear ResumeView primero para obtener la referencia a PointsAndLevelsView
-        resume_view = ResumeView()
-        task_view = TaskView(page, rewards_view=resume_view.rewards_view)
+        # Sin orquestador, cada vista inicializa sus propios servicios
+        if startup is None:
+            resume_view = ResumeView()
+            task_view = TaskView(page, rewards_view=resume_view.rewards_view)
+            habits_view = HabitsView
+            goals_view = GoalsView
+        else:
+            resume_view = ResumeView(
+                progress_service=startup.progress_service,
+                rewards_service=startup.rewards_service,
+                counters_service=startup.counters_service if "counters" not in startup.errors else None,
+            )
+            task_view = TaskView(
+                page,
+                rewards_view=resume_view.rewards_view,
+                database_service=startup.database_service,
+                task_service=startup.task_service if startup.is_loaded("tasks") else None,
+                tasks=startup.tasks,
+            )
+            habits_view = lambda: HabitsView(
+                habits_service=startup.habits_service if startup.is_loaded("habits") else None,
+            )
+            goals_view = lambda: GoalsView(
+                goals_service=startup.goals_service,
+                goals=startup.goals if startup.is_loaded("goals") else None,
+            )
         
         # Conectar el callback de verificación de integridad desde TaskView a ResumeView
         resume_view.set_verify_integrity_callback(task_view._async_verify_points_integrity)
         
-        # Lista de vistas en orden
+        # Lista de vistas en orden; hábitos, metas y configuración se pasan como
+        # fábricas para instanciarlas solo cuando se abre su pestaña
         views = [
             resume_view,  # Índice 0 - Pantalla principal
             task_view,     # Índice 1
-            HabitsView(),   # Índice 2
-            GoalsView(),    # Índice 3
-            SettingsView(), # Índice 4
+            habits_view,    # Índice 2
+            goals_view,     # Índice 3
+            SettingsView,   # Índice 4
         ]
         
         # Definir iconos para cada vista
@@ -66,12 +92,17 @@ class HomeView:
             4: "Configuración",
         }
         
-        # Crear el BottomNav con las vistas, iconos y etiquetas
+        # Crear el BottomNav con las vistas, iconos y etiquetas. Cada pantalla se
+        # construye al seleccionarla; solo con el arranque terminado y todos los
+        # datos precargados el resto se construye en tiempo ocioso (ya no toca la BD)
+        prefetch = startup is not None and startup.ready and all(startup.loaded.values())
         bottom_nav = create_bottom_nav_with_views(
             views=views,
             page=page,
             icons=icons,
             labels=labels,
+            lazy=True,
+            prefetch=prefetch,
         )
         # Retornar el layout completo con BottomNav
         return bottom_nav.build(page)
@@ -4,43 +4,31 @@ Interfaz para mostrar nivel, puntos y progreso del usuario
 """
 
 import flet as ft
-from typing import Optional, Callable
+from typing import List, Optional, Callable
+from app.services.event_bus import CountersChanged, DomainEvent, PointsChanged, event_bus
 from app.services.progress_service import ProgressService
 from app.services.database_service import DatabaseService
-from app.services.habits_service import HabitsService
+from app.services.dashboard_counters_service import DashboardCountersService
 from app.logic.system_points import LEVELS_ORDER, Level
-from app.utils.task_helper import TASK_STATUS_COMPLETED
+from app.utils.update_scheduler import request_update
 
 
 class PointsAndLevelsView(ft.Container):
-    async def _load_completed_goals_count(self):
-        """Carga desde BD cuántas metas se completaron y actualiza el header"""
-        try:
-            await self._ensure_database_service()
-            # Considera meta completada si progress >= target
-            query = f"SELECT COUNT(*) FROM goals WHERE progress >= target"
-            result = await self.database_service.execute(query)
-            count = 0
-            if result and hasattr(result, 'fetchone'):
-                row = await result.fetchone()
-                if row:
-                    count = row[0]
-                elif result and isinstance(result, list):
-                    count = result[0][0] if result else 0
-                self.set_goals_completed(count)
-        except Exception as e:
-            print(f"[PointsAndLevelsView] Error cargando metas completadas: {e}")
-
     """Vista principal de puntos y niveles con paneles de información"""
     
-    def __init__(self, progress_service: Optional[ProgressService] = None, user_id: str = "default_user", on_verify_integrity=None, on_points_change: Optional[Callable[[float], None]] = None):
+    def __init__(self, progress_service: Optional[ProgressService] = None, user_id: str = "default_user", on_verify_integrity=None, on_points_change: Optional[Callable[[float], None]] = None, counters_service: Optional[DashboardCountersService] = None):
         super().__init__()
         
         self.progress_service = progress_service if progress_service else ProgressService()
         self.user_id = user_id
         self.on_verify_integrity = on_verify_integrity  # Callback para verificar integridad
         self.on_points_change = on_points_change  # Callback para propagar cambios de puntos
-        self.database_service: Optional[DatabaseService] = None
+        self.database_service: Optional[DatabaseService] = counters_service.database_service if counters_service else None
+        self._database_ready = False
+        # Contadores materializados; si no se recibe uno se crea al cargar (y se detiene al desmontar)
+        self.counters_service = counters_service
+        self._owns_counters_service = False
+        self._unsubscribe: Optional[Callable[[], None]] = None
         self.current_user_points = 0.0
         self.current_user_level = "Nadie"
         self.progress_percent = 0.0
@@ -258,10 +246,46 @@ class PointsAndLevelsView(ft.Container):
     
     def did_mount(self):
         """Se llama cuando el control es añadido a la página"""
+        if self._unsubscribe is None:
+            self._unsubscribe = event_bus.subscribe(self._on_domain_events, PointsChanged, CountersChanged)
         if self.page:
             self.page.run_task(self.refresh_from_progress_service)
+
+    def will_unmount(self):
+        """Cancela la suscripción al bus al quitar el control de la página"""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._owns_counters_service:
+            self.counters_service.stop()
+
+    async def _on_domain_events(self, events: List[DomainEvent]):
+        """
+        Aplica los eventos de una vuelta del event loop con una sola actualización de UI
+
+        Solo cuenta el último PointsChanged (trae las stats completas) y el último
+        CountersChanged del usuario; ninguno vuelve a consultar la BD.
+        """
+        points_events = [event for event in events if isinstance(event, PointsChanged)]
+        if points_events:
+            stats = points_events[-1].stats
+            self.set_user_points(points_events[-1].points, update_ui=False)
+            self.set_user_level(points_events[-1].level, update_ui=False)
+            if stats:
+                self.update_progress_from_stats(stats, update_ui=False)
+        counters_events = [
+            event for event in events
+            if isinstance(event, CountersChanged) and event.user_id == self.user_id
+        ]
+        if counters_events:
+            self._apply_counters(counters_events[-1].counters)
+        self._update_ui()
+
+    def _update_ui(self):
+        # Agrupado por frame: varios setters seguidos producen un solo envío
+        request_update(self)
     
-    def set_user_points(self, points: float):
+    def set_user_points(self, points: float, update_ui: bool = True):
         """Establece los puntos del usuario"""
         self.current_user_points = float(points)
         # Asegurar siempre 2 decimales
@@ -275,13 +299,10 @@ class PointsAndLevelsView(ft.Container):
             except Exception as e:
                 print(f"[PointsAndLevelsView] Error notificando cambio de puntos: {e}")
 
-        if self.page:
-            try:
-                self.update()
-            except Exception as e:
-                print(f"[PointsAndLevelsView] Error actualizando UI: {e}")
+        if update_ui:
+            self._update_ui()
     
-    def set_user_level(self, level: str):
+    def set_user_level(self, level: str, update_ui: bool = True):
         """Establece el nivel del usuario"""
         self.current_user_level = level
         self.level_text.value = level
@@ -290,31 +311,28 @@ class PointsAndLevelsView(ft.Container):
         # Actualizar la descripción del nivel
         self.level_description.value = self.level_descriptions.get(level, "")
         print(f"[PointsAndLevelsView] Actualizando nivel a: {level}")
-        if self.page:
-            try:
-                self.update()
-            except Exception as e:
-                print(f"[PointsAndLevelsView] Error actualizando UI: {e}")
+        if update_ui:
+            self._update_ui()
 
-    def set_tasks_completed(self, count: int):
+    def set_tasks_completed(self, count: int, update_ui: bool = True):
         """Actualiza el contador de tareas completadas"""
         self.tasks_completed_text.value = f"{int(count)} tareas completadas"
-        if self.page:
-            try:
-                self.update()
-            except Exception as e:
-                print(f"[PointsAndLevelsView] Error actualizando tareas completadas: {e}")
+        if update_ui:
+            self._update_ui()
+
+    def set_goals_completed(self, count: int, update_ui: bool = True):
+        """Actualiza el contador de metas completadas"""
+        self.goals_completed_text.value = f"{int(count)} metas completadas"
+        if update_ui:
+            self._update_ui()
 
-    def set_habits_completed(self, count: int):
+    def set_habits_completed(self, count: int, update_ui: bool = True):
         """Actualiza el contador de hábitos completados (eventos, usando racha)"""
         self.habits_completed_text.value = f"{int(count)} hábitos completados"
-        if self.page:
-            try:
-                self.update()
-            except Exception as e:
-                print(f"[PointsAndLevelsView] Error actualizando hábitos completados: {e}")
+        if update_ui:
+            self._update_ui()
 
-    def update_progress_from_stats(self, stats: dict):
+    def update_progress_from_stats(self, stats: dict, update_ui: bool = True):
         """Actualiza barra y textos de progreso usando stats completas"""
         progress_percent = float(stats.get("progress_percent", 0.0))
         next_level = stats.get("next_level") or "Nivel máximo"
@@ -353,11 +371,8 @@ class PointsAndLevelsView(ft.Container):
         else:
             self.levels_remaining_text.value = f"Faltan {points_remaining:.2f} para el nivel {next_level}"
 
-        if self.page:
-            try:
-                self.update()
-            except Exception as e:
-                print(f"[PointsAndLevelsView] Error actualizando progreso: {e}")
+        if update_ui:
+            self._update_ui()
     
     async def refresh_from_progress_service(self):
         """Actualiza los puntos y nivel desde el ProgressService"""
@@ -365,9 +380,7 @@ class PointsAndLevelsView(ft.Container):
         self.set_user_points(stats.get("points", 0.0))
         self.set_user_level(stats.get("level", "Nadie"))
         self.update_progress_from_stats(stats)
-        await self._load_completed_tasks_count()
-        await self._load_completed_habits_count()
-        await self._load_completed_goals_count()
+        await self._load_counters()
         print(f"[PointsAndLevelsView] Stats cargados desde ProgressService")
     
     def _on_verify_integrity_click(self, e):
@@ -389,8 +402,7 @@ class PointsAndLevelsView(ft.Container):
         )
         self.integrity_panel.visible = True
         
-        if self.page:
-            self.page.update()
+        request_update(self)
         
         if self.on_verify_integrity:
             # Ejecutar el callback de verificación de integridad
@@ -401,8 +413,7 @@ class PointsAndLevelsView(ft.Container):
             self.integrity_log_text.controls.append(
                 ft.Text("⚠️  No hay callback de verificación configurado", size=13, color="#FF9800")
             )
-            if self.page:
-                self.page.update()
+            request_update(self)
     
     async def _run_verification_and_update_panel(self):
         """Ejecuta la verificación y actualiza el panel con los resultados"""
@@ -416,21 +427,15 @@ class PointsAndLevelsView(ft.Container):
             except asyncio.TimeoutError:
                 print(f"[PointsAndLevelsView] ⚠️ Timeout en verificación (5s), cerrando panel de carga")
                 self.integrity_panel.visible = False
-                if self.page:
-                    self.page.update()
+                request_update(self)
                 return
             
             # Pequeño delay para asegurar que show_integrity_result se completó
             await asyncio.sleep(0.3)
             
-            # Forzar actualización explícita del panel y del contenedor
-            if self.page:
-                # Actualizar todos los controles internos
-                self.integrity_log_text.update()
-                self.integrity_panel.update()
-                self.update()
-                self.page.update()
-                print(f"[PointsAndLevelsView] Panel actualizado exitosamente después de verificación")
+            # Panel y header en un solo envío
+            request_update(self)
+            print(f"[PointsAndLevelsView] Panel actualizado exitosamente después de verificación")
                 
         except Exception as e:
             print(f"[PointsAndLevelsView] Error ejecutando verificación: {e}")
@@ -440,17 +445,12 @@ class PointsAndLevelsView(ft.Container):
             self.integrity_log_text.controls.append(
                 ft.Text(f"❌ Error: {str(e)}", size=13, color="#F44336")
             )
-            if self.page:
-                self.integrity_log_text.update()
-                self.integrity_panel.update()
-                self.update()
-                self.page.update()
+            request_update(self)
     
     def _close_integrity_panel(self, e):
         """Cierra el panel de verificación de integridad"""
         self.integrity_panel.visible = False
-        if self.page:
-            self.page.update()
+        request_update(self)
     
     def show_integrity_result(
         self,
@@ -497,48 +497,40 @@ class PointsAndLevelsView(ft.Container):
         # Asegurar que el panel sea visible
         self.integrity_panel.visible = True
         
-        # Forzar actualización de la UI
-        try:
-            if self.page:
-                self.update()
-                self.page.update()
-                print(f"[PointsAndLevelsView] UI actualizada exitosamente")
-        except Exception as e:
-            print(f"[PointsAndLevelsView] Error actualizando UI: {e}")
+        # Actualización agrupada con el resto de cambios del frame
+        request_update(self)
     
     def update_points_display(self, points: float):
         """Actualiza la visualización de puntos"""
         self.set_user_points(points)
 
-    async def _load_completed_tasks_count(self):
-        """Carga desde BD cuántas tareas se completaron y actualiza el header"""
+    async def _load_counters(self):
+        """Lee los contadores del header con un solo SELECT sobre dashboard_counters"""
         try:
-            await self._ensure_database_service()
-
-            count = await self.database_service.count(
-                table_name="tasks",
-                filters={"status": TASK_STATUS_COMPLETED, "user_id": self.user_id},
-            )
-            self.set_tasks_completed(count)
+            if self.counters_service is None:
+                await self._ensure_database_service()
+                self.counters_service = DashboardCountersService(self.database_service, self.user_id)
+                self.counters_service.start()
+                self._owns_counters_service = True
+            self._apply_counters(await self.counters_service.get_counters(self.user_id))
+            self._update_ui()
         except Exception as e:
-            print(f"[PointsAndLevelsView] Error cargando tareas completadas: {e}")
+            print(f"[PointsAndLevelsView] Error cargando contadores: {e}")
 
-    async def _load_completed_habits_count(self):
-        """Carga hábitos y calcula cuántas finalizaciones hay registradas"""
-        try:
-            await self._ensure_database_service()
-            habits_service = HabitsService(self.database_service)
-            await habits_service.initialize()
-            completions = await habits_service.get_completion_records()
-            self.set_habits_completed(len(completions))
-        except Exception as e:
-            print(f"[PointsAndLevelsView] Error cargando hábitos completados: {e}")
+    def _apply_counters(self, counters: dict):
+        """Aplica tareas, hábitos y metas completados sin actualizar la UI"""
+        self.set_tasks_completed(counters.get("tasks_completed", 0), update_ui=False)
+        self.set_habits_completed(counters.get("habits_completed", 0), update_ui=False)
+        self.set_goals_completed(counters.get("goals_completed", 0), update_ui=False)
 
     async def _ensure_database_service(self):
-        """Inicializa DatabaseService en caso de no existir"""
+        """Crea e inicializa DatabaseService una sola vez"""
         if self.database_service is None:
             self.database_service = DatabaseService()
+        if self._database_ready:
+            return
         try:
             await self.database_service.initialize()
+            self._database_ready = True
         except Exception as e:
             print(f"[PointsAndLevelsView] Error inicializando DatabaseService: {e}")
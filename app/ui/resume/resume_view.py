@@ -4,27 +4,43 @@ Vista de Resumen (Resume) de la aplicación
 
 import flet as ft
 import asyncio
+from typing import Optional
 from app.ui.resume.points_and_levels.points_and_levels_view import PointsAndLevelsView
 from app.ui.resume.rewards.rewards_view import RewardsView
 from app.services.progress_service import ProgressService
 from app.services.rewards_service import RewardsService
+from app.services.dashboard_counters_service import DashboardCountersService
 
 
 class ResumeView:
     """Clase que representa la vista de resumen"""
     
-    def __init__(self):
-        """Inicializa la vista de resumen"""
+    def __init__(
+        self,
+        progress_service: Optional[ProgressService] = None,
+        rewards_service: Optional[RewardsService] = None,
+        counters_service: Optional[DashboardCountersService] = None,
+    ):
+        """
+        Inicializa la vista de resumen
+        
+        Args:
+            progress_service: Servicio de progreso ya cargado (opcional)
+            rewards_service: Servicio de recompensas ya inicializado (opcional)
+            counters_service: Contadores del resumen ya publicando cambios (opcional)
+        """
         self.points_levels_view = None
         self.rewards_view = None
-        self.progress_service = ProgressService()  # Sistema de progreso sin usuarios
-        self.rewards_service = RewardsService()  # Servicio de recompensas
+        self.progress_service = progress_service or ProgressService()  # Sistema de progreso sin usuarios
+        self.rewards_service = rewards_service or RewardsService()  # Servicio de recompensas
+        self.counters_service = counters_service
         self.user_id = "default_user"
         self.verify_integrity_callback = None  # Callback para verificar integridad
         print(f"[ResumeView] Vista de resumen inicializada")
         
-        # Inicializar el servicio de recompensas de forma asíncrona
-        asyncio.create_task(self.rewards_service.initialize())
+        # Inicializar el servicio de recompensas de forma asíncrona si no viene precargado
+        if not self.rewards_service._initialized:
+            asyncio.create_task(self.rewards_service.initialize())
     
     def set_verify_integrity_callback(self, callback):
         """Establece el callback para verificar integridad de puntos"""
@@ -45,7 +61,7 @@ class ResumeView:
             progress_service=self.progress_service,
             user_id=self.user_id,
             on_verify_integrity=self.verify_integrity_callback,
-            on_points_change=self._on_points_change,
+            counters_service=self.counters_service,
         )
         # Evitar que ocupe todo el alto; deja espacio para recompensas debajo
         self.points_levels_view.expand = False
@@ -88,11 +104,3 @@ class ResumeView:
     def get_progress_service(self):
         """Retorna el servicio de progreso para compartir con otras vistas"""
         return self.progress_service
-
-    def _on_points_change(self, points: float):
-        """Propaga los puntos actualizados al panel de recompensas."""
-        if self.rewards_view:
-            try:
-                self.rewards_view.set_user_points(points)
-            except Exception as e:
-                print(f"[ResumeView] Error al actualizar puntos en RewardsView: {e}")
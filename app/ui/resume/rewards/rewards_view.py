@@ -4,8 +4,10 @@ Muestra recompensas desbloqueadas y próximas según los puntos del usuario.
 """
 
 import flet as ft
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
+from app.services.event_bus import DomainEvent, PointsChanged, event_bus
 from app.services.rewards_service import RewardsService
+from app.utils.update_scheduler import request_update
 from app.models.reward import Reward
 from app.ui.resume.rewards.rewards_form import RewardsForm
 
@@ -30,6 +32,11 @@ class RewardsView(ft.Container):
 		self.locked_list = ft.Column(spacing=8)
 		self.claimed_list = ft.Column(spacing=8)
 		self.showing_form = False
+		# Tarjetas por (lista, reward_id) con la firma de los datos que muestran;
+		# refresh_lists solo reconstruye las que cambiaron
+		self._tiles: Dict[Tuple[str, str], Tuple[tuple, ft.Control]] = {}
+		self._list_keys: Dict[str, List[str]] = {}
+		self._unsubscribe: Optional[Callable[[], None]] = None
 
 		self.form = RewardsForm(
 			rewards_service=self.rewards_service,
@@ -107,11 +114,25 @@ class RewardsView(ft.Container):
 
 	def did_mount(self):
 		"""Se llama cuando el control se agrega a la página; refresca listas con page disponible."""
+		if self._unsubscribe is None:
+			self._unsubscribe = event_bus.subscribe(self._on_points_changed, PointsChanged)
 		self.refresh_lists()
 
+	def will_unmount(self):
+		"""Cancela la suscripción al bus al quitar el control de la página."""
+		if self._unsubscribe is not None:
+			self._unsubscribe()
+			self._unsubscribe = None
+
+	def _on_points_changed(self, events: List[DomainEvent]):
+		"""Aplica solo el último total de puntos de la vuelta del event loop."""
+		self.set_user_points(events[-1].points)
+
 	def set_user_points(self, points: float):
-		"""Actualiza puntos del usuario y refresca las listas."""
-		self.user_points = float(points)
+		"""Actualiza puntos del usuario; solo refresca si se cruzó el umbral de alguna recompensa."""
+		old_points, self.user_points = self.user_points, float(points)
+		if not self.rewards_service.crosses_threshold(old_points, self.user_points):
+			return
 		self.refresh_lists()
 
 	def _set_filter(self, filter_name: str):
@@ -119,8 +140,7 @@ class RewardsView(ft.Container):
 		self.current_filter = filter_name
 		self._update_filter_bar_style()
 		self._update_dynamic_content()
-		if self.page:
-			self.update()
+		request_update(self)
 
 	def _update_filter_bar_style(self):
 		"""Actualiza el estilo de los botones de filtro según el seleccionado."""
@@ -158,27 +178,55 @@ class RewardsView(ft.Container):
 			]
 
 	def refresh_lists(self):
-		"""Reconstruye las listas de recompensas desbloqueadas, próximas y reclamadas."""
+		"""Actualiza las listas de desbloqueadas, próximas y reclamadas reutilizando las tarjetas sin cambios."""
 		unlocked = self.rewards_service.get_unlocked_rewards(self.user_points)
 		locked = self.rewards_service.get_next_rewards(self.user_points, limit=5)
-		
-		# Obtener recompensas reclamadas
-		all_rewards = self.rewards_service.get_all_rewards()
-		claimed = [r for r in all_rewards if r.claimed]
+		claimed = self.rewards_service.get_claimed_rewards()
 
-		self.unlocked_list.controls = self._build_tiles(unlocked, unlocked=True)
-		self.locked_list.controls = self._build_tiles(locked, unlocked=False)
-		self.claimed_list.controls = self._build_tiles(claimed, unlocked=False, show_claim=False)
+		changed = self._patch_list("unlocked", self.unlocked_list, unlocked, unlocked=True)
+		changed = self._patch_list("locked", self.locked_list, locked, unlocked=False) or changed
+		changed = self._patch_list("claimed", self.claimed_list, claimed, unlocked=False, show_claim=False) or changed
+		if not changed:
+			return
 
 		self._update_dynamic_content()
+		# Sin page aún no hace nada: did_mount vuelve a refrescar
+		request_update(self)
+
+	def _patch_list(self, name: str, column: ft.Column, rewards: List[Reward], unlocked: bool, show_claim: bool = True) -> bool:
+		"""
+		Sincroniza una lista con las recompensas indicadas
+
+		Returns:
+			True si la lista cambió (alguna tarjeta entró, salió, se movió o cambió)
+		"""
+		keys = [reward.id for reward in rewards]
+		signatures = {reward.id: self._tile_signature(reward) for reward in rewards}
+		previous = self._list_keys.get(name)
+		if previous == keys and all(self._tiles[(name, key)][0] == signatures[key] for key in keys):
+			return False
 
-		try:
-			self.update()
-		except RuntimeError:
-			# Puede ocurrir si aún no está asignada la page; se ignorará hasta did_mount
-			pass
-		except Exception:
-			pass
+		if not rewards:
+			column.controls = self._build_tiles([], unlocked=unlocked, show_claim=show_claim)
+		else:
+			controls = []
+			for reward in rewards:
+				cached = self._tiles.get((name, reward.id))
+				if cached is None or cached[0] != signatures[reward.id]:
+					tile = self._build_tiles([reward], unlocked=unlocked, show_claim=show_claim)[0]
+					cached = (signatures[reward.id], tile)
+					self._tiles[(name, reward.id)] = cached
+				controls.append(cached[1])
+			column.controls = controls
+		# Olvidar las tarjetas que salieron de esta lista
+		for key in set(previous or ()) - set(keys):
+			self._tiles.pop((name, key), None)
+		self._list_keys[name] = keys
+		return True
+
+	@staticmethod
+	def _tile_signature(reward: Reward) -> tuple:
+		return (reward.title, reward.icon, reward.points_required)
 
 	def _build_tiles(self, rewards: List[Reward], unlocked: bool, show_claim: bool = True) -> List[ft.Control]:
 		"""Crea tarjetas visuales para cada recompensa con icono, título, puntos y acciones."""
@@ -227,7 +275,7 @@ class RewardsView(ft.Container):
 				bgcolor="#222",
 				border_radius=10,
 				padding=12,
-				border=ft.border.all(1, "#333"),
+				border=ft.Border.all(1, "#333"),
 				content=ft.Column(spacing=8, controls=controls),
 			)
 			tiles.append(tile)
@@ -241,8 +289,7 @@ class RewardsView(ft.Container):
 		else:
 			self.form.reset_form()
 		self.dynamic_container.content = self.form
-		if self.page:
-			self.update()
+		request_update(self)
 
 	def _on_form_submit(self, reward: Reward):
 		# Tras guardar, volver a la lista y refrescar contenido
@@ -250,15 +297,13 @@ class RewardsView(ft.Container):
 		self.editing_reward = None
 		self.refresh_lists()
 		self.dynamic_container.content = self.lists_column
-		if self.page:
-			self.update()
+		request_update(self)
 
 	def _cancel_form(self):
 		self.showing_form = False
 		self.editing_reward = None
 		self.dynamic_container.content = self.lists_column
-		if self.page:
-			self.update()
+		request_update(self)
 
 	def _claim_reward(self, reward_id: str):
 		"""Marca una recompensa como reclamada."""
@@ -271,7 +316,6 @@ class RewardsView(ft.Container):
 			except Exception:
 				pass
 			self.refresh_lists()
-			if self.page:
-				self.update()
+			request_update(self)
 
 
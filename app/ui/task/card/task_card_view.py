@@ -8,6 +8,7 @@ from typing import Callable, TYPE_CHECKING
 
 import flet as ft
 from app.logic.system_points import POINTS_BY_ACTION
+from app.utils.update_scheduler import request_update
 
 if TYPE_CHECKING:
     from app.models.task import Task
@@ -36,7 +37,6 @@ class TaskCardView:
         self.page = page
         self.expanded_tasks = set()  # Almacenar IDs de tareas expandidas
         self.subtasks_containers = {}  # Almacenar referencias a los containers de subtareas
-        self.processed_transitions = {}  # Rastrear cambios de estado (incomp->comp) con timestamp
         self.task_card_refs = {}  # Almacenar referencias a las tarjetas de tareas para reconstruirlas
 
     def build(self, task: Task) -> ft.Card:
@@ -337,10 +337,6 @@ class TaskCardView:
             print(f"  📊 Transición de estado:")
             print(f"     Antes: {was_completed} → Después: {is_now_completed}")
             
-            # Crear una clave única basada en el timestamp del cambio
-            transition_key = f"{task.id}_{subtask.id}_{subtask.updated_at.isoformat()}"
-            print(f"  🔑 Clave transición: {transition_key}")
-            
             # Actualizar el estado de la tarea basado en sus subtareas
             task.update_status_from_subtasks()
             print(f"  📋 Estado de tarea padre actualizado: {task.status}")
@@ -348,42 +344,24 @@ class TaskCardView:
             # Forzar actualización del checkbox ANTES de guardar
             e.control.value = is_now_completed
             
-            # Actualizar el contenedor del checkbox
-            try:
-                if hasattr(e.control, 'parent'):
-                    e.control.parent.update()
-                    print(f"  ♻️  Contenedor padre actualizado visualmente")
-            except Exception as parent_error:
-                print(f"  ⚠️  No se pudo actualizar contenedor padre: {parent_error}")
-            
             # Guardar cambios en la base de datos
             if self.on_task_updated:
                 self.on_task_updated(task)
                 print(f"  💾 Cambios guardados en la base de datos")
             
-            # Si la subtarea acaba de completarse, sumar puntos (evitar duplicados con timestamp)
+            # Si la subtarea acaba de completarse, sumar puntos; al desmarcarla, revertirlos
+            # (el libro mayor de ProgressService descarta duplicados por subtarea)
             if not was_completed and is_now_completed:
                 print(f"  ⭐ Subtarea completada: sumando puntos...")
-                # Verificar si este cambio específico ya fue procesado
-                if transition_key not in self.processed_transitions:
-                    print(f"    ✅ Puntos sumados por PRIMERA VEZ")
-                    self.processed_transitions[transition_key] = True
-                    # Ejecutar suma de puntos de forma asincrónica
-                    if self.progress_service and self.page:
-                        self.page.run_task(self._async_add_points_for_subtask, subtask, task)
-                else:
-                    print(f"    ⏭️  Puntos ya procesados para esta transición - IGNORANDO DUPLICADO")
-                    print(f"    Transition key ya en registro: {list(self.processed_transitions.keys())[-1]}")
+                if self.progress_service and self.page:
+                    self.page.run_task(self._async_add_points_for_subtask, subtask, task)
             elif was_completed and not is_now_completed:
                 print(f"  ↩️  Subtarea desmarcada")
+                if self.progress_service and self.page:
+                    self.page.run_task(self._async_revoke_points_for_subtask, subtask)
             
-            # Actualizar toda la página para reflejar cambios visuales
-            try:
-                if self.page:
-                    self.page.update()
-                    print(f"  🔄 Página actualizada")
-            except Exception as page_error:
-                print(f"  ⚠️  Error actualizando página: {page_error}")
+            # Un solo envío por frame para checkbox, estado y página
+            request_update(self.page)
             
             print(f"  ✓ Evento procesado correctamente\n")
             
@@ -399,26 +377,27 @@ class TaskCardView:
             print(f"[TaskCardView] Añadiendo puntos por completar subtarea: {subtask.title}")
             
             # Añadir puntos usando ProgressService con persistencia
-            stats = await self.progress_service.add_points("subtask_completed")
+            stats = await self.progress_service.add_points("subtask_completed", source_id=subtask.id)
+            if stats.get("duplicate"):
+                return
             print(f"[TaskCardView] Stats actualizados: Puntos={stats['points']:.2f}, Nivel={stats['level']}")
             
-            # Actualizar PointsAndLevelsView si está disponible
-            if self.rewards_view:
-                current_points = stats.get("points", 0.0)
-                current_level = stats.get("level", "Nadie")
-                
-                print(f"[TaskCardView] Actualizando PointsAndLevelsView - Puntos: {current_points:.2f}, Nivel: {current_level}")
-                self.rewards_view.set_user_points(current_points)
-                self.rewards_view.set_user_level(current_level)
-                self.rewards_view.update_progress_from_stats(stats)
-                
-                # Mostrar notificación si hubo subida de nivel
-                if stats.get("level_up", False):
-                    old_level = stats.get("old_level", "")
-                    print(f"[TaskCardView] 🎉 ¡NIVEL SUBIDO! {old_level} → {current_level}")
+            # PointsAndLevelsView recibe PointsChanged por el bus de eventos
+            if stats.get("level_up", False):
+                old_level = stats.get("old_level", "")
+                print(f"[TaskCardView] 🎉 ¡NIVEL SUBIDO! {old_level} → {stats.get('level', 'Nadie')}")
             
             print(f"✓ Puntos añadidos por completar subtarea: {subtask.title}")
         except Exception as e:
             print(f"[TaskCardView] Error añadiendo puntos por subtarea: {str(e)}")
             import traceback
             traceback.print_exc()
+
+    async def _async_revoke_points_for_subtask(self, subtask):
+        """Revierte los puntos de una subtarea desmarcada."""
+        try:
+            stats = await self.progress_service.revoke_points("subtask_completed", source_id=subtask.id)
+            if stats.get("revoked"):
+                print(f"[TaskCardView] Puntos revertidos por desmarcar subtarea: {subtask.title}")
+        except Exception as e:
+            print(f"[TaskCardView] Error revirtiendo puntos por subtarea: {str(e)}")
@@ -18,9 +18,9 @@ from app.models.subtask import Subtask
 from app.utils.task_helper import TASK_STATUS_PENDING, TASK_STATUS_COMPLETED
 from app.services.database_service import DatabaseService
 from app.services.task_service import TaskService
-from app.logic.system_points import POINTS_BY_ACTION
-from app.services.habits_service import HabitsService
+from app.services.points_integrity_service import PointsIntegrityService
 from app.services.progress_service import ProgressService
+from app.utils.update_scheduler import request_update
 
 # Permite ejecución directa añadiendo la raíz del proyecto al path
 ROOT_DIR = Path(__file__).resolve().parents[2]
@@ -29,18 +29,28 @@ if str(ROOT_DIR) not in sys.path:
 
 
 class TaskView:
-	def __init__(self, page: Optional[ft.Page] = None, rewards_view=None):
+	def __init__(
+		self,
+		page: Optional[ft.Page] = None,
+		rewards_view=None,
+		database_service: Optional[DatabaseService] = None,
+		task_service: Optional[TaskService] = None,
+		tasks: Optional[List[Task]] = None,
+	):
 		self.page = page
 		self.rewards_view = rewards_view  # Referencia a PointsAndLevelsView para actualizar puntos
 
-		self.tasks: List[Task] = []
+		# Tareas precargadas en el arranque (se usan solo si llega también el servicio)
+		self.tasks: List[Task] = list(tasks) if tasks is not None else []
+		self._preloaded = task_service is not None and tasks is not None
 		self.editing: Optional[Task] = None
 		self.user_id: str = "default_user"  # ID del usuario actual
 
 		# Servicios
-		self.database_service: Optional[DatabaseService] = None
-		self.task_service: Optional[TaskService] = None
+		self.database_service: Optional[DatabaseService] = database_service
+		self.task_service: Optional[TaskService] = task_service
 		self.progress_service = ProgressService()  # Sistema de progreso sin usuarios
+		self.integrity_service: Optional[PointsIntegrityService] = None
 
 		# UI refs
 		self.form: TaskForm = TaskForm(self._handle_save, self._handle_cancel, self._on_subtask_changed)
@@ -85,8 +95,12 @@ class TaskView:
 			expand=True,
 		)
 
-		# Inicializar servicios y cargar tareas
-		if self.page:
+		# Inicializar servicios y cargar tareas (o usar las precargadas en el arranque)
+		if self._preloaded:
+			self.task_list.render(self.tasks)
+			if self.page:
+				self.page.run_task(self._async_after_tasks_loaded)
+		elif self.page:
 			self.page.run_task(self._initialize_services)
 		
 		return host
@@ -134,8 +148,7 @@ class TaskView:
 		self.form.set_values(task.title, task.description, task.subtasks)
 		self._hide_list()
 		self._show_form()
-		if self.page:
-			self.page.update()
+		request_update(self.page)
 
 	def _delete_task(self, task: Task):
 		self.tasks = [t for t in self.tasks if t.id != task.id]
@@ -152,42 +165,36 @@ class TaskView:
 	# ------------------------------------------------------------------
 	def _reset_form(self):
 		self.form.reset()
-		if self.page:
-			self.page.update()
+		request_update(self.page)
 
 	def _show_form(self):
 		if self.form_container:
 			self.form_container.visible = True
-			if self.page:
-				self.page.update()
+			request_update(self.page)
 
 	def _hide_form(self):
 		if self.form_container:
 			self.form_container.visible = False
-			if self.page:
-				self.page.update()
+			request_update(self.page)
 
 	def _hide_list(self):
 		self.task_list.hide()
-		if self.page:
-			self.page.update()
+		request_update(self.page)
 
 	def _show_list(self):
 		self.task_list.show()
-		if self.page:
-			self.page.update()
+		request_update(self.page)
 
 	def _refresh_list(self):
 		self.task_list.render(self.tasks)
-		if self.page:
-			self.page.update()
+		request_update(self.page)
 
 	def _show_message(self, text: str):
 		if not self.page:
 			return
 		self.page.snack_bar = ft.SnackBar(content=ft.Text(text))
 		self.page.snack_bar.open = True
-		self.page.update()
+		request_update(self.page)
 
 	def _on_subtask_changed(self, subtask):
 		"""Callback cuando cambia una subtarea en el formulario."""
@@ -197,9 +204,11 @@ class TaskView:
 
 	def _on_task_updated(self, task: Task):
 		"""Callback cuando se actualiza una tarea (ej: checkbox toggle)."""
-		# Si la tarea está completada, añadir puntos
+		# Si la tarea está completada, añadir puntos; si no, revertir los que tuviera
 		if task.status == TASK_STATUS_COMPLETED:
 			self.page.run_task(self._async_add_points_for_task, task)
+		elif self.page:
+			self.page.run_task(self._async_revoke_points_for_task, task)
 		
 		# Ejecutar operación asincrónica para actualizar
 		if self.page:
@@ -213,21 +222,26 @@ class TaskView:
 	async def _initialize_services(self):
 		"""Inicializa los servicios de base de datos y tareas."""
 		try:
-			self.database_service = DatabaseService()
-			await self.database_service.initialize()
-			
-			# Usar la misma conexión para el progreso si aún no tiene una
-			if self.progress_service.database_service is None:
-				self.progress_service.database_service = self.database_service
-			await self.progress_service.ensure_persistence()
-			
-			self.task_service = TaskService(self.database_service)
-			await self.task_service.initialize()
+			await self._setup_services()
 			
 			# Cargar tareas existentes
 			await self._async_load_tasks()
 		except Exception as e:
 			self.form.show_error(f"Error inicializando servicios: {str(e)}")
+
+	async def _setup_services(self):
+		"""Crea e inicializa DatabaseService, ProgressService y TaskService."""
+		if self.database_service is None:
+			self.database_service = DatabaseService()
+		await self.database_service.initialize()
+		
+		# Usar la misma conexión para el progreso si aún no tiene una
+		if self.progress_service.database_service is None:
+			self.progress_service.database_service = self.database_service
+		await self.progress_service.ensure_persistence()
+		
+		self.task_service = TaskService(self.database_service)
+		await self.task_service.initialize()
 	
 	async def _async_load_tasks(self):
 		"""Carga las tareas de la base de datos."""
@@ -235,11 +249,15 @@ class TaskView:
 			all_tasks = await self.task_service.get_all_tasks(user_id=self.user_id)
 			self.tasks = all_tasks
 			self._refresh_list()
-			await self._async_update_completed_tasks_count()
-			# Calcular y sumar puntos por subtareas completadas
-			await self._async_sync_subtask_points()
+			await self._async_after_tasks_loaded()
 		except Exception as e:
 			self.form.show_error(f"Error cargando tareas: {str(e)}")
+
+	async def _async_after_tasks_loaded(self):
+		"""Actualiza contadores y sincroniza puntos una vez disponibles las tareas."""
+		await self._async_update_completed_tasks_count()
+		# Calcular y sumar puntos por subtareas completadas
+		await self._async_sync_subtask_points()
 	
 	async def _async_save_task(self, title: str, description: str, subtasks: List[Subtask]):
 		"""Guarda una tarea en la base de datos."""
@@ -299,38 +317,32 @@ class TaskView:
 		try:
 			print(f"[TaskView] Añadiendo puntos por completar tarea: {task.title}")
 			
-			# Añadir puntos usando ProgressService con persistencia
-			stats = await self.progress_service.add_points("task_completed")
+			# Añadir puntos usando ProgressService con persistencia; publica PointsChanged
+			stats = await self.progress_service.add_points("task_completed", source_id=task.id)
+			if stats.get("duplicate"):
+				return
 			print(f"[TaskView] Stats actualizados: Puntos={stats['points']:.2f}, Nivel={stats['level']}")
 			
-			# Actualizar PointsAndLevelsView si está disponible
-			if self.rewards_view:
-				current_points = stats.get("points", 0.0)
-				current_level = stats.get("level", "Nadie")
-				
-				print(f"[TaskView] Actualizando PointsAndLevelsView - Puntos: {current_points:.2f}, Nivel: {current_level}")
-				self.rewards_view.set_user_points(current_points)
-				self.rewards_view.set_user_level(current_level)
-				self.rewards_view.update_progress_from_stats(stats)
-				
-				# Mostrar notificación si hubo subida de nivel
-				if stats.get("level_up", False):
-					old_level = stats.get("old_level", "")
-					print(f"[TaskView] 🎉 ¡NIVEL SUBIDO! {old_level} → {current_level}")
-				
-				# Forzar actualización de la página
-				if self.page:
-					self.page.update()
-					print(f"[TaskView] Página actualizada")
+			# Mostrar notificación si hubo subida de nivel
+			if stats.get("level_up", False):
+				old_level = stats.get("old_level", "")
+				print(f"[TaskView] 🎉 ¡NIVEL SUBIDO! {old_level} → {stats.get('level', 'Nadie')}")
 			
 			print(f"✓ Puntos añadidos por completar tarea: {task.title}")
-			# Actualizar contador de tareas completadas
-			await self._async_update_completed_tasks_count()
 		except Exception as e:
 			print(f"[TaskView] Error añadiendo puntos: {str(e)}")
 			import traceback
 			traceback.print_exc()
 
+	async def _async_revoke_points_for_task(self, task: Task):
+		"""Revierte los puntos de una tarea que deja de estar completada."""
+		try:
+			stats = await self.progress_service.revoke_points("task_completed", source_id=task.id)
+			if stats.get("revoked"):
+				print(f"[TaskView] Puntos revertidos por desmarcar tarea: {task.title}")
+		except Exception as e:
+			print(f"[TaskView] Error revirtiendo puntos: {str(e)}")
+
 	async def _async_update_completed_tasks_count(self):
 		"""Calcula tareas completadas y actualiza la vista de recompensas"""
 		try:
@@ -348,21 +360,6 @@ class TaskView:
 		except Exception as e:
 			print(f"[TaskView] Error actualizando tareas completadas: {e}")
 
-	def _get_points_action_for_habit(self, habit):
-		"""Obtiene la acción de puntos asociada a la frecuencia del hábito"""
-		mapping = {
-			"daily": "habit_daily_completed",
-			"weekly": "habit_weekly_completed",
-			"monthly": "habit_monthly_completed",
-			"semiannual": "habit_semiannual_completed",
-			"annual": "habit_annual_completed",
-		}
-		if isinstance(habit, str):
-			frequency = habit
-		else:
-			frequency = getattr(habit, "frequency", "")
-		return mapping.get(frequency, "habit_daily_completed")
-
 	async def _async_verify_points_integrity(self):
 		"""Verifica la integridad de los puntos y corrige si hay inconsistencias"""
 		try:
@@ -370,69 +367,38 @@ class TaskView:
 			print(f"[TaskView] 🔍 VERIFICACIÓN DE INTEGRIDAD DE PUNTOS")
 			print(f"{'='*70}")
 			
-			# Obtener puntos actuales de la BD
-			stats = await self.progress_service.load_stats()
-			current_points = stats.get("points", 0.0)
-			print(f"  📊 Puntos actuales en BD: {current_points:.2f}")
-			
-			# Calcular puntos esperados basados en tareas y subtareas completadas
-			expected_points = 0.0
-			completed_tasks = 0
-			completed_subtasks = 0
-			habit_completions = 0
-			habit_points_estimated = 0.0
+			# La pestaña de tareas se construye de forma perezosa; si aún no se
+			# abrió, preparar la conexión antes de verificar
+			if self.database_service is None:
+				await self._setup_services()
+			if self.integrity_service is None:
+				self.integrity_service = PointsIntegrityService(self.database_service)
 			
-			for task in self.tasks:
-				if task.status == TASK_STATUS_COMPLETED:
-					completed_tasks += 1
-					expected_points += POINTS_BY_ACTION["task_completed"]
-				
-				if task.subtasks:
-					for subtask in task.subtasks:
-						if subtask.completed:
-							completed_subtasks += 1
-							expected_points += POINTS_BY_ACTION["subtask_completed"]
-
-			# Calcular puntos por hábitos basados en historial de completados
-			try:
-				habits_service = HabitsService(self.database_service)
-				await habits_service.initialize()
-				records = await habits_service.get_completion_records()
-				habit_completions = len(records)
-				for record in records:
-					freq = record.get("frequency", "daily")
-					action = self._get_points_action_for_habit(freq)
-					points_per_completion = POINTS_BY_ACTION.get(action, 0.0)
-					habit_points_estimated += points_per_completion
-			except Exception as e:
-				print(f"  ⚠️  Error al calcular puntos por hábitos: {e}")
+			# Agregados SQL; solo se examinan las filas cambiadas desde la última verificación
+			result = await self.integrity_service.verify(self.progress_service)
+			current_points = result["current_points"]
+			expected_points = result["expected_points"]
+			completed_tasks = result["completed_tasks"]
+			completed_subtasks = result["completed_subtasks"]
+			habit_completions = result["completed_habits"]
+			habit_points_estimated = result["habit_points"]
+			difference = result["difference"]
+			had_correction = result["had_correction"]
 			
-			task_and_subtask_points = completed_tasks * POINTS_BY_ACTION["task_completed"] + completed_subtasks * POINTS_BY_ACTION["subtask_completed"]
-			expected_points = task_and_subtask_points + habit_points_estimated
-			
-			print(f"  📋 Tareas completadas: {completed_tasks} x {POINTS_BY_ACTION['task_completed']:.2f} = {completed_tasks * POINTS_BY_ACTION['task_completed']:.2f} puntos")
-			print(f"  ✓ Subtareas completadas: {completed_subtasks} x {POINTS_BY_ACTION['subtask_completed']:.2f} = {completed_subtasks * POINTS_BY_ACTION['subtask_completed']:.2f} puntos")
+			print(f"  📊 Puntos actuales en BD: {current_points:.2f}")
+			print(f"  📋 Tareas completadas: {completed_tasks} → {result['task_points']:.2f} puntos")
+			print(f"  ✓ Subtareas completadas: {completed_subtasks} → {result['subtask_points']:.2f} puntos")
 			print(f"  🔁 Hábitos completados (historial): {habit_completions} → {habit_points_estimated:.2f} puntos")
-			print(f"  🎯 Total esperado: {expected_points:.2f} puntos")
+			print(f"  🎯 Total esperado: {expected_points:.2f} puntos ({result['examined_rows']} filas examinadas)")
 			
-			# Verificar si hay diferencia y corregir en ambos sentidos
-			difference = expected_points - current_points
-			had_correction = False
-			if abs(difference) > 0.001:  # Tolerancia de precisión flotante
+			if had_correction:
 				action = "aumentando" if difference > 0 else "reduciendo"
 				print(f"  ⚠️  INCONSISTENCIA DETECTADA")
 				print(f"  📉 Diferencia: {difference:.2f} puntos ({action})")
-				print(f"  🔧 Ajustando puntos al esperado...")
-				await self.progress_service.set_points(expected_points)
+				# El ajuste de ProgressService publica PointsChanged a las vistas
 				stats = await self.progress_service.load_stats()
 				print(f"  ✅ Puntos ajustados: {stats['points']:.2f}")
 				print(f"  📊 Nivel actualizado: {stats['level']}")
-				if self.rewards_view:
-					self.rewards_view.set_user_points(stats.get("points", 0.0))
-					self.rewards_view.set_user_level(stats.get("level", "Nadie"))
-					self.rewards_view.update_progress_from_stats(stats)
-					self.rewards_view.set_habits_completed(habit_completions)
-				had_correction = True
 			else:
 				print(f"  ✅ Integridad verificada - Los puntos son correctos")
 			
@@ -471,11 +437,11 @@ class TaskView:
 			
 			print(f"[TaskView] 📊 Puntos actuales en BD: {current_points:.2f}")
 			
-			# Contar subtareas completadas
-			total_completed_subtasks = 0
-			for task in self.tasks:
-				if task.subtasks:
-					total_completed_subtasks += sum(1 for st in task.subtasks if st.completed)
+			# Reunir subtareas completadas
+			completed_subtasks = [
+				st for task in self.tasks if task.subtasks for st in task.subtasks if st.completed
+			]
+			total_completed_subtasks = len(completed_subtasks)
 			
 			print(f"[TaskView] ✓ Subtareas completadas detectadas: {total_completed_subtasks}")
 			
@@ -483,9 +449,10 @@ class TaskView:
 			if current_points == 0.0 and total_completed_subtasks > 0:
 				print(f"[TaskView] 🆕 BD en 0.00 - Sumando puntos por primera vez...")
 				
-				# Sumar 0.02 puntos por cada subtarea completada
-				for _ in range(total_completed_subtasks):
-					stats = await self.progress_service.add_points("subtask_completed")
+				# Sumar 0.02 puntos por cada subtarea completada en un solo commit
+				stats = await self.progress_service.add_points_bulk(
+					"subtask_completed", source_ids=[st.id for st in completed_subtasks]
+				)
 				
 				print(f"[TaskView] ✅ {total_completed_subtasks} subtareas sumadas - Nuevos puntos: {stats['points']:.2f}")
 			else:
@@ -496,14 +463,8 @@ class TaskView:
 					await self._async_verify_points_integrity()
 				else:
 					print(f"[TaskView] ℹ️  No hay subtareas completadas para sumar")
-			
-			# Actualizar PointsAndLevelsView con los stats finales
-			if self.rewards_view:
-				stats = await self.progress_service.load_stats()
-				self.rewards_view.set_user_points(stats.get("points", 0.0))
-				self.rewards_view.set_user_level(stats.get("level", "Nadie"))
-				self.rewards_view.update_progress_from_stats(stats)
-				print(f"[TaskView] 🔄 PointsAndLevelsView actualizado - Puntos totales: {stats['points']:.2f}\n")
+			# add_points_bulk y el ajuste de integridad publican PointsChanged:
+			# PointsAndLevelsView y RewardsView se actualizan por el bus de eventos
 			
 		except Exception as e:
 			print(f"[TaskView] ❌ Error sincronizando puntos de subtareas: {e}")
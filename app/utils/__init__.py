@@ -1,119 +1,64 @@
 """
 Módulo de utilidades
-Importa componentes, helpers y funciones auxiliares para uso en toda la aplicación
+Expone componentes, helpers y funciones auxiliares para uso en toda la aplicación.
+Las exportaciones se resuelven de forma perezosa al primer acceso.
 """
 
-# ============================================================================
-# IMPORTACIONES DE EISENHOWER MATRIX
-# ============================================================================
-from .eisenhower_matrix import (
-    Quadrant,
-    get_eisenhower_quadrant,
-    get_quadrant_name,
-    get_quadrant_description,
-    get_quadrant_color,
-    get_quadrant_ft_color,
-    get_quadrant_icon,
-    get_priority_label,
-    get_priority_badge_text,
-    sort_tasks_by_quadrant,
-    get_quadrant_priority_order,
-    is_high_priority,
-    is_medium_priority,
-    is_low_priority,
-)
-
-# ============================================================================
-# IMPORTACIONES DE TASK HELPER
-# ============================================================================
-from .task_helper import (
-    TASK_STATUS_PENDING,
-    TASK_STATUS_IN_PROGRESS,
-    TASK_STATUS_COMPLETED,
-    TASK_STATUS_CANCELLED,
-    VALID_TASK_STATUSES,
-    format_task_status,
-    get_task_status_color,
-    get_task_status_ft_color,
-    get_task_status_icon,
-    calculate_completion_percentage,
-    format_completion_percentage,
-    is_task_overdue,
-    is_task_due_today,
-    is_task_due_soon,
-    get_task_urgency_indicator,
-    count_subtasks,
-    count_completed_subtasks,
-    has_subtasks,
-    is_task_completed,
-    is_task_pending,
-    is_task_in_progress,
-    filter_tasks_by_status,
-    get_task_summary,
-)
-
-# ============================================================================
-# IMPORTACIONES DE BOTTOM NAV
-# ============================================================================
-from .bottom_nav import (
-    BottomNav,
-    create_bottom_nav_with_views,
-    wrap_view_with_bottom_nav,
-)
-
-# ============================================================================
-# IMPORTACIONES DE LOADING SCREEN
-# ============================================================================
-from .screem_load import LoadingScreen
+from .lazy import lazy_exports
 
 # ============================================================================
-# EXPORTACIONES PÚBLICAS (__all__)
+# EXPORTACIONES PEREZOSAS (PEP 562)
+# Cada símbolo se importa desde su submódulo la primera vez que se accede,
+# así importar el paquete no arrastra Flet ni los demás submódulos.
 # ============================================================================
-__all__ = [
+_LAZY_EXPORTS = {
     # Eisenhower Matrix
-    'Quadrant',
-    'get_eisenhower_quadrant',
-    'get_quadrant_name',
-    'get_quadrant_description',
-    'get_quadrant_color',
-    'get_quadrant_ft_color',
-    'get_quadrant_icon',
-    'get_priority_label',
-    'get_priority_badge_text',
-    'sort_tasks_by_quadrant',
-    'get_quadrant_priority_order',
-    'is_high_priority',
-    'is_medium_priority',
-    'is_low_priority',
+    'Quadrant': '.eisenhower_matrix',
+    'get_eisenhower_quadrant': '.eisenhower_matrix',
+    'get_quadrant_name': '.eisenhower_matrix',
+    'get_quadrant_description': '.eisenhower_matrix',
+    'get_quadrant_color': '.eisenhower_matrix',
+    'get_quadrant_ft_color': '.eisenhower_matrix',
+    'get_quadrant_icon': '.eisenhower_matrix',
+    'get_priority_label': '.eisenhower_matrix',
+    'get_priority_badge_text': '.eisenhower_matrix',
+    'sort_tasks_by_quadrant': '.eisenhower_matrix',
+    'get_quadrant_priority_order': '.eisenhower_matrix',
+    'is_high_priority': '.eisenhower_matrix',
+    'is_medium_priority': '.eisenhower_matrix',
+    'is_low_priority': '.eisenhower_matrix',
     # Task Helper
-    'TASK_STATUS_PENDING',
-    'TASK_STATUS_IN_PROGRESS',
-    'TASK_STATUS_COMPLETED',
-    'TASK_STATUS_CANCELLED',
-    'VALID_TASK_STATUSES',
-    'format_task_status',
-    'get_task_status_color',
-    'get_task_status_ft_color',
-    'get_task_status_icon',
-    'calculate_completion_percentage',
-    'format_completion_percentage',
-    'is_task_overdue',
-    'is_task_due_today',
-    'is_task_due_soon',
-    'get_task_urgency_indicator',
-    'count_subtasks',
-    'count_completed_subtasks',
-    'has_subtasks',
-    'is_task_completed',
-    'is_task_pending',
-    'is_task_in_progress',
-    'filter_tasks_by_status',
-    'get_task_summary',
+    'TASK_STATUS_PENDING': '.task_helper',
+    'TASK_STATUS_IN_PROGRESS': '.task_helper',
+    'TASK_STATUS_COMPLETED': '.task_helper',
+    'TASK_STATUS_CANCELLED': '.task_helper',
+    'VALID_TASK_STATUSES': '.task_helper',
+    'format_task_status': '.task_helper',
+    'get_task_status_color': '.task_helper',
+    'get_task_status_ft_color': '.task_helper',
+    'get_task_status_icon': '.task_helper',
+    'calculate_completion_percentage': '.task_helper',
+    'format_completion_percentage': '.task_helper',
+    'is_task_overdue': '.task_helper',
+    'is_task_due_today': '.task_helper',
+    'is_task_due_soon': '.task_helper',
+    'get_task_urgency_indicator': '.task_helper',
+    'count_subtasks': '.task_helper',
+    'count_completed_subtasks': '.task_helper',
+    'has_subtasks': '.task_helper',
+    'is_task_completed': '.task_helper',
+    'is_task_pending': '.task_helper',
+    'is_task_in_progress': '.task_helper',
+    'filter_tasks_by_status': '.task_helper',
+    'get_task_summary': '.task_helper',
     # Bottom Nav
-    'BottomNav',
-    'create_bottom_nav_with_views',
-    'wrap_view_with_bottom_nav',
+    'BottomNav': '.bottom_nav',
+    'create_bottom_nav_with_views': '.bottom_nav',
+    'wrap_view_with_bottom_nav': '.bottom_nav',
     # Loading Screen
-    'LoadingScreen',
-]
+    'LoadingScreen': '.screem_load',
+}
+
+__all__ = list(_LAZY_EXPORTS)
 
+__getattr__, __dir__ = lazy_exports(globals(), _LAZY_EXPORTS)
@@ -48,8 +48,20 @@ Uso desde home_view.py o cualquier vista:
         )
         page.add(bottom_nav.build(page))
         page.update()
+
+    Opción 3 - Pantallas perezosas (se construyen al seleccionarlas por primera vez):
+        bottom_nav = BottomNav(
+            screens={0: home_view.build()},
+            screen_factories={
+                1: task_view.build,
+                2: settings_view.build,
+            },
+        )
+        page.add(bottom_nav.build(page))
+        bottom_nav.start_idle_prefetch(page)  # Opcional: construir el resto en segundo plano
 """
 
+import asyncio
 import flet as ft
 from typing import Callable, Dict, List, Optional, Any
 
@@ -59,29 +71,34 @@ class BottomNav:
     
     def __init__(
         self, 
-        screens: Dict[int, ft.Control], 
+        screens: Optional[Dict[int, ft.Control]] = None, 
         on_navigate: Optional[Callable] = None,
         icons: Optional[Dict[int, Any]] = None,
-        labels: Optional[Dict[int, str]] = None
+        labels: Optional[Dict[int, str]] = None,
+        screen_factories: Optional[Dict[int, Callable[[], ft.Control]]] = None,
     ):
         """
         Inicializa el componente de navegación inferior
         
         Args:
-            screens: Diccionario con las pantallas {índice: control}
+            screens: Diccionario con las pantallas ya construidas {índice: control}
             on_navigate: Callback opcional que se ejecuta al cambiar de pantalla
             icons: Diccionario con los iconos {índice: icono} (ej: {0: ft.Icons.HOME})
             labels: Diccionario con las etiquetas {índice: etiqueta} (ej: {0: "Inicio"})
+            screen_factories: Diccionario {índice: función} que construye la pantalla
+                la primera vez que se selecciona (opcional)
         """
-        self.screens = screens
+        self.screens: Dict[int, ft.Control] = dict(screens or {})
+        self.screen_factories: Dict[int, Callable[[], ft.Control]] = dict(screen_factories or {})
         self.on_navigate = on_navigate
         self.current_index = 0
         self.icons = icons or {}
         self.labels = labels or {}
+        self._prefetch_running = False
         
         # Crear los destinos de navegación con iconos y etiquetas personalizados
         destinations = []
-        num_screens = len(screens)
+        num_screens = len(set(self.screens) | set(self.screen_factories))
         
         # Iconos por defecto si no se proporcionan
         default_icons = [
@@ -123,6 +140,64 @@ class BottomNav:
             indicator_color="#FF1744",
         )
     
+    def has_screen(self, index: int) -> bool:
+        """
+        Indica si existe una pantalla (construida o pendiente) para el índice
+        
+        Args:
+            index: Índice de la pantalla
+        """
+        return index in self.screens or index in self.screen_factories
+    
+    def is_built(self, index: int) -> bool:
+        """
+        Indica si la pantalla del índice ya fue construida
+        
+        Args:
+            index: Índice de la pantalla
+        """
+        return index in self.screens
+    
+    def _get_screen(self, index: int) -> ft.Control:
+        """
+        Obtiene la pantalla de un índice, construyéndola si es la primera vez
+        
+        Args:
+            index: Índice de la pantalla (si no existe se usa la 0)
+        
+        Returns:
+            Control de la pantalla
+        """
+        if not self.has_screen(index):
+            index = 0
+        if index not in self.screens:
+            factory = self.screen_factories.pop(index)
+            self.screens[index] = factory()
+        return self.screens[index]
+    
+    def start_idle_prefetch(self, page: ft.Page, delay: float = 1.0):
+        """
+        Construye en segundo plano las pantallas pendientes, una por ciclo ocioso
+        
+        Args:
+            page: Objeto Page de Flet
+            delay: Segundos de espera antes de cada construcción
+        """
+        if self._prefetch_running or not self.screen_factories:
+            return
+        self._prefetch_running = True
+        page.run_task(self._prefetch_pending, delay)
+    
+    async def _prefetch_pending(self, delay: float):
+        """Construye las pantallas pendientes cediendo el loop entre cada una"""
+        try:
+            for index in sorted(self.screen_factories):
+                await asyncio.sleep(delay)
+                if index in self.screen_factories:
+                    self._get_screen(index)
+        finally:
+            self._prefetch_running = False
+    
     def _handle_navigation(self, e):
         """
         Maneja el evento de cambio de navegación
@@ -132,9 +207,9 @@ class BottomNav:
         """
         self.current_index = e.control.selected_index
         
-        # Actualizar la pantalla mostrada
+        # Actualizar la pantalla mostrada (se construye si aún no existe)
         if hasattr(self, 'screen_container'):
-            current_screen = self.screens.get(self.current_index, self.screens[0])
+            current_screen = self._get_screen(self.current_index)
             self.screen_container.content = current_screen
             e.page.update()
         
@@ -152,8 +227,8 @@ class BottomNav:
         Returns:
             Container con el layout completo
         """
-        # Obtener la pantalla actual
-        current_screen = self.screens.get(self.current_index, self.screens[0])
+        # Obtener la pantalla actual (solo se construye la visible)
+        current_screen = self._get_screen(self.current_index)
         
         # Contenedor para la pantalla actual (se puede actualizar dinámicamente)
         self.screen_container = ft.Container(
@@ -182,7 +257,7 @@ class BottomNav:
         Args:
             page: Objeto Page de Flet
         """
-        current_screen = self.screens.get(self.current_index, self.screens[0])
+        current_screen = self._get_screen(self.current_index)
         if hasattr(self, 'screen_container'):
             self.screen_container.content = current_screen
             page.update()
@@ -195,9 +270,11 @@ class BottomNav:
             index: Índice de la pantalla a la que navegar
             page: Objeto Page de Flet
         """
-        if index in self.screens:
+        if self.has_screen(index):
             self.current_index = index
             self.nav_bar.selected_index = index
+            if hasattr(self, 'screen_container'):
+                self.screen_container.content = self._get_screen(index)
             page.update()
     
     def update_screen(self, index: int, screen_content: ft.Control, page: ft.Page):
@@ -209,7 +286,8 @@ class BottomNav:
             screen_content: Nuevo contenido de la pantalla
             page: Objeto Page de Flet
         """
-        if index in self.screens:
+        if self.has_screen(index):
+            self.screen_factories.pop(index, None)
             self.screens[index] = screen_content
             if self.current_index == index:
                 # Si es la pantalla actual, actualizar inmediatamente
@@ -222,7 +300,7 @@ class BottomNav:
         Returns:
             Control de la pantalla actual
         """
-        return self.screens.get(self.current_index, self.screens[0])
+        return self._get_screen(self.current_index)
 
 
 # ============================================================================
@@ -235,18 +313,26 @@ def create_bottom_nav_with_views(
     on_navigate: Optional[Callable] = None,
     destinations: Optional[list] = None,
     icons: Optional[Dict[int, Any]] = None,
-    labels: Optional[Dict[int, str]] = None
+    labels: Optional[Dict[int, str]] = None,
+    lazy: bool = True,
+    prefetch: bool = False,
 ) -> BottomNav:
     """
     Crea un BottomNav con vistas que tienen método build()
     
+    Con lazy=True solo se construye la primera vista; el resto se construye
+    (y se inicializa) la primera vez que el usuario la selecciona.
+    
     Args:
-        views: Lista de objetos vista (deben tener método build())
+        views: Lista de objetos vista (deben tener método build()) o
+            funciones sin argumentos que retornan la vista
         page: Objeto Page de Flet
         on_navigate: Callback opcional que se ejecuta al cambiar de pantalla
         destinations: Lista opcional de NavigationBarDestination personalizados
         icons: Diccionario con los iconos {índice: icono} (ej: {0: ft.Icons.HOME})
         labels: Diccionario con las etiquetas {índice: etiqueta} (ej: {0: "Inicio"})
+        lazy: Construir cada pantalla al seleccionarla por primera vez (default: True)
+        prefetch: Construir las pantallas pendientes en tiempo ocioso (default: False)
         
     Returns:
         Instancia de BottomNav configurada
@@ -256,33 +342,48 @@ def create_bottom_nav_with_views(
         from app.ui.task.task_view import TaskView
         from app.ui.settings.settings_view import SettingsView
         
-        views = [HomeView(), TaskView(), SettingsView()]
+        views = [HomeView(), TaskView, SettingsView]
         icons = {0: ft.Icons.HOME, 1: ft.Icons.TASK, 2: ft.Icons.SETTINGS}
         labels = {0: "Inicio", 1: "Tareas", 2: "Config"}
         bottom_nav = create_bottom_nav_with_views(views, page, icons=icons, labels=labels)
     """
-    # Construir las pantallas desde las vistas
-    screens = {}
-    for i, view in enumerate(views):
-        if hasattr(view, 'build'):
-            screens[i] = view.build()
+    def make_factory(view_or_factory):
+        def factory():
+            # Las clases/funciones se instancian aquí, al construir la pantalla
+            view = view_or_factory
+            if isinstance(view, type) or (callable(view) and not hasattr(view, 'build')):
+                view = view()
+            if not hasattr(view, 'build'):
+                # Si no tiene método build, usar directamente
+                return view
+            screen = view.build()
             # Si la vista tiene método initialize async, llamarlo después
             if hasattr(view, 'initialize') and callable(getattr(view, 'initialize')):
                 # Programar la inicialización async
                 async def init_view(v=view):
                     await v.initialize()
                 page.run_task(init_view)
-        else:
-            # Si no tiene método build, usar directamente
-            screens[i] = view
+            return screen
+        return factory
+    
+    factories = {i: make_factory(view) for i, view in enumerate(views)}
+    
+    # En modo perezoso BottomNav.build construye solo la pantalla visible
+    screens = {}
+    if not lazy:
+        screens = {i: factory() for i, factory in factories.items()}
+        factories = {}
     
     # Crear el BottomNav con las pantallas construidas y los iconos/etiquetas
-    bottom_nav = BottomNav(screens, on_navigate, icons=icons, labels=labels)
+    bottom_nav = BottomNav(screens, on_navigate, icons=icons, labels=labels, screen_factories=factories)
     
     # Actualizar los destinos si se proporcionaron personalizados
     if destinations and len(destinations) == len(views):
         bottom_nav.nav_bar.destinations = destinations
     
+    if prefetch:
+        bottom_nav.start_idle_prefetch(page)
+    
     return bottom_nav
 
 
@@ -10,7 +10,6 @@ La Matriz de Eisenhower tiene 4 cuadrantes:
 """
 
 from typing import Literal, Optional
-import flet as ft
 
 
 # Tipos de cuadrantes
@@ -129,6 +128,8 @@ def get_quadrant_ft_color(quadrant: Quadrant) -> str:
         >>> get_quadrant_ft_color("Q1")
         ft.Colors.RED_500
     """
+    import flet as ft  # Import diferido: solo la UI necesita Flet
+
     colors = {
         "Q1": ft.Colors.RED_500,
         "Q2": ft.Colors.BLUE_500,
@@ -152,6 +153,8 @@ def get_quadrant_icon(quadrant: Quadrant) -> str:
         >>> get_quadrant_icon("Q1")
         ft.Icons.PRIORITY_HIGH
     """
+    import flet as ft  # Import diferido: solo la UI necesita Flet
+
     icons = {
         "Q1": ft.Icons.PRIORITY_HIGH,      # Urgente e Importante
         "Q2": ft.Icons.SCHEDULE,           # Programar
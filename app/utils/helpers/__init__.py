@@ -1,164 +1,86 @@
 """
 Módulo de funciones auxiliares
-Importa funciones organizadas por categoría para uso en toda la aplicación
+Expone funciones organizadas por categoría para uso en toda la aplicación.
+Las exportaciones se resuelven de forma perezosa al primer acceso.
 """
 
-# ============================================================================
-# IMPORTACIONES DE FILES
-# ============================================================================
-from .files import (
-    get_project_root,
-    get_asset_path,
-    get_database_path,
-    get_config_path,
-    ensure_directory_exists,
-    ensure_assets_directory,
-    ensure_database_directory,
-    file_exists,
-    directory_exists,
-    get_file_size,
-    get_file_extension,
-    get_file_name_without_extension,
-    is_image_file,
-    join_paths,
-    get_relative_path,
-    create_backup_path,
-    list_files_in_directory,
-    normalize_path,
-)
+from app.utils.lazy import lazy_exports
 
 # ============================================================================
-# IMPORTACIONES DE FORMATS
-# ============================================================================
-from .formats import (
-    format_date,
-    format_time,
-    format_datetime,
-    format_duration,
-    format_relative_time,
-    format_number,
-    format_percentage,
-    format_currency,
-    format_file_size,
-    format_points,
-    format_level,
-    format_completion_percentage,
-    format_task_count,
-    format_habit_streak,
-)
-
-# ============================================================================
-# IMPORTACIONES DE RESPONSIVES
-# ============================================================================
-from .responsives import (
-    MOBILE_BREAKPOINT,
-    TABLET_BREAKPOINT,
-    DESKTOP_BREAKPOINT,
-    get_responsive_padding,
-    get_responsive_size,
-    get_responsive_icon_size,
-    get_responsive_width,
-    get_responsive_columns,
-    get_responsive_spacing,
-    get_responsive_card_width,
-    get_responsive_border_radius,
-    get_responsive_elevation,
-    get_responsive_max_width,
-    is_mobile,
-    is_tablet,
-    is_desktop,
-    get_device_type,
-)
-
+# EXPORTACIONES PEREZOSAS (PEP 562)
+# Cada símbolo se importa desde su submódulo la primera vez que se accede,
+# así importar el paquete no arrastra Flet ni los demás submódulos.
 # ============================================================================
-# IMPORTACIONES DE VALIDATIONS
-# ============================================================================
-from .validators import (
-    is_valid_email,
-    is_valid_username,
-    is_valid_password,
-    is_valid_date,
-    is_valid_time,
-    is_valid_number,
-    is_valid_integer,
-    is_valid_string,
-    is_valid_url,
-    is_valid_phone,
-    is_valid_priority,
-    is_valid_status,
-    is_future_date,
-    is_past_date,
-)
-
-# ============================================================================
-# EXPORTACIONES PÚBLICAS (__all__)
-# ============================================================================
-__all__ = [
+_LAZY_EXPORTS = {
     # Files
-    'get_project_root',
-    'get_asset_path',
-    'get_database_path',
-    'get_config_path',
-    'ensure_directory_exists',
-    'ensure_assets_directory',
-    'ensure_database_directory',
-    'file_exists',
-    'directory_exists',
-    'get_file_size',
-    'get_file_extension',
-    'get_file_name_without_extension',
-    'is_image_file',
-    'join_paths',
-    'get_relative_path',
-    'create_backup_path',
-    'list_files_in_directory',
-    'normalize_path',
+    'get_project_root': '.files',
+    'get_asset_path': '.files',
+    'get_database_path': '.files',
+    'get_config_path': '.files',
+    'ensure_directory_exists': '.files',
+    'ensure_assets_directory': '.files',
+    'ensure_database_directory': '.files',
+    'file_exists': '.files',
+    'directory_exists': '.files',
+    'get_file_size': '.files',
+    'get_file_extension': '.files',
+    'get_file_name_without_extension': '.files',
+    'is_image_file': '.files',
+    'join_paths': '.files',
+    'get_relative_path': '.files',
+    'create_backup_path': '.files',
+    'list_files_in_directory': '.files',
+    'normalize_path': '.files',
     # Formats
-    'format_date',
-    'format_time',
-    'format_datetime',
-    'format_duration',
-    'format_relative_time',
-    'format_number',
-    'format_percentage',
-    'format_currency',
-    'format_file_size',
-    'format_points',
-    'format_level',
-    'format_completion_percentage',
-    'format_task_count',
-    'format_habit_streak',
+    'format_date': '.formats',
+    'format_time': '.formats',
+    'format_datetime': '.formats',
+    'format_duration': '.formats',
+    'format_relative_time': '.formats',
+    'format_number': '.formats',
+    'format_percentage': '.formats',
+    'format_currency': '.formats',
+    'format_file_size': '.formats',
+    'format_points': '.formats',
+    'format_level': '.formats',
+    'format_completion_percentage': '.formats',
+    'format_task_count': '.formats',
+    'format_habit_streak': '.formats',
     # Responsives
-    'MOBILE_BREAKPOINT',
-    'TABLET_BREAKPOINT',
-    'DESKTOP_BREAKPOINT',
-    'get_responsive_padding',
-    'get_responsive_size',
-    'get_responsive_icon_size',
-    'get_responsive_width',
-    'get_responsive_columns',
-    'get_responsive_spacing',
-    'get_responsive_card_width',
-    'get_responsive_border_radius',
-    'get_responsive_elevation',
-    'get_responsive_max_width',
-    'is_mobile',
-    'is_tablet',
-    'is_desktop',
-    'get_device_type',
+    'MOBILE_BREAKPOINT': '.responsives',
+    'TABLET_BREAKPOINT': '.responsives',
+    'DESKTOP_BREAKPOINT': '.responsives',
+    'get_responsive_padding': '.responsives',
+    'get_responsive_size': '.responsives',
+    'get_responsive_icon_size': '.responsives',
+    'get_responsive_width': '.responsives',
+    'get_responsive_columns': '.responsives',
+    'get_responsive_spacing': '.responsives',
+    'get_responsive_card_width': '.responsives',
+    'get_responsive_border_radius': '.responsives',
+    'get_responsive_elevation': '.responsives',
+    'get_responsive_max_width': '.responsives',
+    'is_mobile': '.responsives',
+    'is_tablet': '.responsives',
+    'is_desktop': '.responsives',
+    'get_device_type': '.responsives',
     # Validations
-    'is_valid_email',
-    'is_valid_username',
-    'is_valid_password',
-    'is_valid_date',
-    'is_valid_time',
-    'is_valid_number',
-    'is_valid_integer',
-    'is_valid_string',
-    'is_valid_url',
-    'is_valid_phone',
-    'is_valid_priority',
-    'is_valid_status',
-    'is_future_date',
-    'is_past_date',
-]
+    'is_valid_email': '.validators',
+    'is_valid_username': '.validators',
+    'is_valid_password': '.validators',
+    'is_valid_date': '.validators',
+    'is_valid_time': '.validators',
+    'is_valid_number': '.validators',
+    'is_valid_integer': '.validators',
+    'is_valid_string': '.validators',
+    'is_valid_url': '.validators',
+    'is_valid_phone': '.validators',
+    'is_valid_priority': '.validators',
+    'is_valid_status': '.validators',
+    'is_future_date': '.validators',
+    'is_past_date': '.validators',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _LAZY_EXPORTS)
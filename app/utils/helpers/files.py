@@ -244,12 +244,8 @@ def create_backup_path(original_path: str | Path, suffix: str = "_backup") -> Pa
         database/app_backup.db
     """
     path = Path(original_path)
-    stem = path.stem
-    suffix = path.suffix
-    directory = path.parent
-    
-    backup_name = f"{stem}{suffix}{suffix}"
-    return directory / backup_name
+    backup_name = f"{path.stem}{suffix}{path.suffix}"
+    return path.parent / backup_name
 
 
 def get_config_path(filename: str = "config.json") -> Path:
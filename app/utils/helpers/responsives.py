@@ -3,8 +3,12 @@ Funciones auxiliares para diseño responsive
 Calcula valores adaptativos basados en el tamaño de la ventana
 """
 
-from typing import Optional, Union
-import flet as ft
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    import flet as ft
 
 
 # Breakpoints comunes
@@ -0,0 +1,45 @@
+"""
+Exportaciones perezosas de paquetes (PEP 562)
+Cada símbolo se importa desde su submódulo la primera vez que se accede,
+así importar el paquete no arrastra Flet ni los demás submódulos.
+
+Uso en un __init__.py:
+    _LAZY_EXPORTS = {'HomeView': '.home_view'}
+    __all__ = list(_LAZY_EXPORTS)
+    __getattr__, __dir__ = lazy_exports(globals(), _LAZY_EXPORTS)
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    module_globals: Dict[str, Any],
+    exports: Dict[str, str],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Crea las funciones __getattr__ y __dir__ de un paquete con exportaciones perezosas
+
+    Args:
+        module_globals: globals() del paquete (allí se cachea cada símbolo importado)
+        exports: Nombre exportado -> submódulo relativo que lo define
+
+    Returns:
+        Tupla (__getattr__, __dir__) para asignar en el módulo
+    """
+    package = module_globals["__name__"]
+
+    def __getattr__(name: str):
+        """Importa bajo demanda el submódulo que define `name` (PEP 562)"""
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Cachear en el módulo para que los siguientes accesos no pasen por aquí
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | set(exports))
+
+    return __getattr__, __dir__
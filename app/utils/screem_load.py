@@ -2,30 +2,34 @@
 Pantalla de carga de la aplicación
 Muestra una imagen de fondo y una barra de carga horizontal
 
-Uso básico:
-    from app.utils.screem_load import LoadingScreen
+La barra refleja el trabajo real de arranque: cada paso registrado (conexión
+a BD, migraciones, precarga de datos) avanza la barra al completarse y la
+pantalla termina en cuanto todos los pasos finalizan, respetando un tiempo
+mínimo de visualización configurable (puede ser 0).
+
+Uso con pasos de arranque:
+    async def connect_db():
+        await database_service.connect()
     
-    # Crear la pantalla de carga
+    loading_screen = LoadingScreen(on_complete=show_home_view, min_display_time=0.0)
+    page.add(loading_screen.build(page))
+    loading_screen.start_loading(
+        page,
+        steps=[("Conectando base de datos", connect_db)],
+    )
+
+Uso básico (animación de duración fija, sin pasos):
     loading_screen = LoadingScreen()
-    
-    # Agregar a la página
     page.add(loading_screen.build())
     page.update()
-    
-    # Iniciar la animación
-    loading_screen.start_loading(page, duration=5.0)
-
-Uso con callback:
-    def on_loading_complete():
-        # Hacer algo cuando termine la carga
-        print("Carga completada!")
-    
-    loading_screen = LoadingScreen(on_complete=on_loading_complete)
-    page.add(loading_screen.build())
     loading_screen.start_loading(page, duration=5.0)
 """
 
+import asyncio
+import time
 import flet as ft
+from typing import Awaitable, Callable, List, Optional, Tuple
+from app.config.settings import LOADING_MIN_DISPLAY_SECONDS
 from app.utils.helpers import (
     get_asset_path,
     get_responsive_padding,
@@ -34,20 +38,31 @@ from app.utils.helpers import (
 )
 
 
+# Paso de arranque: (etiqueta visible, función asíncrona sin argumentos)
+StartupStep = Tuple[str, Callable[[], Awaitable]]
+
+
 class LoadingScreen:
     """Clase que representa la pantalla de carga"""
     
-    def __init__(self, on_complete=None):
+    def __init__(self, on_complete=None, min_display_time: Optional[float] = None):
         """
         Inicializa la pantalla de carga
         
         Args:
-            on_complete: Callback opcional que se ejecuta cuando la animación termina
+            on_complete: Callback opcional que se ejecuta cuando la carga termina
+            min_display_time: Tiempo mínimo en segundos que se muestra la pantalla
+                (default: LOADING_MIN_DISPLAY_SECONDS de la configuración, 0 lo desactiva)
         """
         self.bar_height = 20
         self.progress_value = 0.0
         self.animation_running = False
-        self.on_complete = on_complete  # Callback cuando termine la animación
+        self.on_complete = on_complete  # Callback cuando termine la carga
+        if min_display_time is None:
+            min_display_time = LOADING_MIN_DISPLAY_SECONDS
+        self.min_display_time = max(0.0, float(min_display_time))
+        self.current_step: Optional[str] = None
+        self.step_errors: List[Tuple[str, Exception]] = []
         
         # Contenedor del fondo de la barra (oscuro para combinar con la imagen)
         # Usamos un color oscuro que combine con la imagen dorada
@@ -81,6 +96,14 @@ class LoadingScreen:
             text_align=ft.TextAlign.CENTER,
         )
         
+        # Texto con el paso de arranque en curso (encima de la barra)
+        self.status_label = ft.Text(
+            value="",
+            size=12,
+            color=ft.Colors.WHITE_70,
+            text_align=ft.TextAlign.CENTER,
+        )
+        
         # Container para centrar el label sobre la barra
         # Usamos un Column centrado para alinear el texto
         self.label_container = ft.Container(
@@ -146,7 +169,11 @@ class LoadingScreen:
                     image_container,
                     # Barra de progreso en la parte inferior (bottom bar) - responsive
                     ft.Container(
-                        content=self.progress_bar,
+                        content=ft.Column(
+                            controls=[self.status_label, self.progress_bar],
+                            spacing=6,
+                            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        ),
                         bottom=0,
                         left=0,
                         right=0,
@@ -158,73 +185,97 @@ class LoadingScreen:
             bgcolor=ft.Colors.BLACK,  # Fondo negro por si la imagen no carga
         )
     
-    def start_loading(self, page: ft.Page, duration: float = 5.0):
+    def start_loading(
+        self,
+        page: ft.Page,
+        duration: float = 5.0,
+        steps: Optional[List[StartupStep]] = None,
+    ):
         """
-        Inicia la animación de carga usando un enfoque asíncrono
+        Inicia la carga usando un enfoque asíncrono
+        
+        Si se proporcionan pasos, la barra avanza a medida que cada paso termina
+        y la pantalla se cierra al completar el último (respetando
+        min_display_time). Sin pasos, se ejecuta una animación de duración fija.
         
         Args:
             page: Objeto Page de Flet
-            duration: Duración de la animación en segundos (default: 5.0)
+            duration: Duración de la animación fija en segundos (solo sin pasos)
+            steps: Lista opcional de pasos de arranque (etiqueta, función async)
         """
-        import asyncio
-        
         self.animation_running = True
+        self.step_errors = []
+        self._sync_bar_width(page)
+        
+        if steps is not None:
+            page.run_task(self._run_steps, page, list(steps))
+        else:
+            page.run_task(self._run_fixed_animation, page, duration)
+    
+    async def _run_steps(self, page: ft.Page, steps: List[StartupStep]):
+        """Ejecuta los pasos de arranque en orden y refleja su avance en la barra"""
+        started_at = time.monotonic()
+        total = len(steps)
         
-        # Calcular el ancho máximo disponible usando helper responsive
-        # get_responsive_width ya multiplica el padding por 2 internamente
-        def get_max_width():
-            # Usar helper para obtener el ancho con padding responsive
-            # get_responsive_width ya resta el padding * 2 automáticamente
-            return get_responsive_width(page=page)
+        for index, (label, step) in enumerate(steps):
+            if not self.animation_running:
+                break
+            self.current_step = label
+            self._render_progress(page, index / total if total else 1.0, label)
+            try:
+                await step()
+            except Exception as e:
+                # Un paso fallido no debe bloquear el arranque; la vista lo reintentará
+                self.step_errors.append((label, e))
+                print(f"[LoadingScreen] Error en paso '{label}': {e}")
         
-        max_width = get_max_width()
+        self.current_step = None
+        self._render_progress(page, 1.0, "")
+        
+        remaining = self.min_display_time - (time.monotonic() - started_at)
+        if remaining > 0 and self.animation_running:
+            await asyncio.sleep(remaining)
+        
+        self._finish()
+    
+    async def _run_fixed_animation(self, page: ft.Page, duration: float):
+        """Animación de duración fija (comportamiento sin pasos de arranque)"""
+        steps = 100
+        step_duration = duration / steps
         
-        # Actualizar el ancho del fondo de la barra y del label
+        for step in range(steps + 1):
+            if not self.animation_running:
+                break
+            self._render_progress(page, step / steps)
+            await asyncio.sleep(step_duration)
+        
+        self._finish()
+    
+    def _sync_bar_width(self, page: ft.Page) -> float:
+        """Ajusta el ancho de la barra al ancho responsive actual"""
+        # get_responsive_width ya resta el padding * 2 automáticamente
+        max_width = get_responsive_width(page=page)
         self.bar_background.width = max_width
         self.progress_bar.width = max_width
         self.label_container.width = max_width
-        
-        async def animate():
-            """Función asíncrona para animar la barra de progreso"""
-            steps = 100
-            step_duration = duration / steps
-            
-            for step in range(steps + 1):
-                if not self.animation_running:
-                    break
-                
-                # Recalcular el ancho en cada paso para ser responsive
-                current_max_width = get_max_width()
-                    
-                progress = step / steps
-                self.progress_value = progress
-                
-                # Calcular el ancho del progreso
-                progress_width = current_max_width * progress
-                
-                # Calcular el porcentaje usando helper de formateo
-                self.percentage_label.value = format_percentage(progress, decimals=0)
-                
-                # Actualizar los valores con el ancho actualizado
-                self.progress_fill.width = progress_width
-                self.bar_background.width = current_max_width
-                self.progress_bar.width = current_max_width
-                self.label_container.width = current_max_width
-                
-                # Actualizar la página
-                page.update()
-                
-                # Esperar antes del siguiente paso
-                await asyncio.sleep(step_duration)
-            
-            self.animation_running = False
-            
-            # Ejecutar callback si existe
-            if self.on_complete:
-                self.on_complete()
-        
-        # Ejecutar la animación asíncrona
-        page.run_task(animate)
+        return max_width
+    
+    def _render_progress(self, page: ft.Page, progress: float, label: Optional[str] = None):
+        """Actualiza barra, porcentaje y etiqueta de paso"""
+        # Recalcular el ancho en cada paso para ser responsive
+        current_max_width = self._sync_bar_width(page)
+        self.progress_value = progress
+        self.progress_fill.width = current_max_width * progress
+        self.percentage_label.value = format_percentage(progress, decimals=0)
+        if label is not None:
+            self.status_label.value = label
+        page.update()
+    
+    def _finish(self):
+        """Marca la carga como terminada y ejecuta el callback"""
+        self.animation_running = False
+        if self.on_complete:
+            self.on_complete()
     
     def stop_loading(self):
         """
@@ -5,7 +5,6 @@ Funciones generales de formateo, validación y cálculo relacionadas con tareas
 
 from datetime import datetime, date
 from typing import Optional, Union, Any
-import flet as ft
 
 
 # Estados válidos de tareas
@@ -86,6 +85,8 @@ def get_task_status_ft_color(status: str) -> str:
         >>> get_task_status_ft_color("pendiente")
         ft.Colors.ORANGE_500
     """
+    import flet as ft  # Import diferido: solo la UI necesita Flet
+
     colors = {
         TASK_STATUS_PENDING: ft.Colors.ORANGE_500,
         TASK_STATUS_IN_PROGRESS: ft.Colors.BLUE_500,
@@ -111,6 +112,8 @@ def get_task_status_icon(status: str) -> str:
         >>> get_task_status_icon("completada")
         ft.Icons.CHECK_CIRCLE
     """
+    import flet as ft  # Import diferido: solo la UI necesita Flet
+
     icons = {
         TASK_STATUS_PENDING: ft.Icons.PENDING,
         TASK_STATUS_IN_PROGRESS: ft.Icons.PLAY_CIRCLE,
@@ -0,0 +1,188 @@
+"""
+Planificador de actualizaciones de UI (Update Scheduler)
+Agrupa las llamadas a page.update() / control.update() en "frames": los
+handlers marcan controles como pendientes y el planificador los envía juntos
+una vez por vuelta del event loop, como máximo `max_fps` veces por segundo.
+
+Uso:
+    from app.utils.update_scheduler import request_update
+
+    self.points_text.value = "1.00"
+    request_update(self)          # solo este control
+    request_update(self.page)     # toda la página
+
+Sin event loop en marcha (tests síncronos) la actualización se envía de inmediato.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import UI_MAX_FPS
+
+
+class UpdateScheduler:
+    """Cola de controles pendientes de una página con envío agrupado por frame"""
+
+    def __init__(self, page: Any, max_fps: Optional[float] = None):
+        """
+        Args:
+            page: Página de Flet a la que pertenecen los controles
+            max_fps: Envíos máximos por segundo (default: UI_MAX_FPS; 0 = sin límite)
+        """
+        self.page = page
+        self.max_fps = UI_MAX_FPS if max_fps is None else max(0.0, float(max_fps))
+        # id(control) -> control, en orden de petición
+        self._dirty: Dict[int, Any] = {}
+        self._page_dirty = False
+        self._handle: Optional[asyncio.Handle] = None
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.flushes = 0
+
+    @property
+    def min_interval(self) -> float:
+        """Segundos mínimos entre dos envíos"""
+        return 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+
+    def request(self, *controls: Any):
+        """
+        Marca controles como pendientes (sin controles = toda la página)
+
+        Puede llamarse desde handlers síncronos que Flet ejecuta en otro hilo:
+        el envío se programa en el loop de la página.
+        """
+        with self._lock:
+            self.requests += 1
+            if not controls:
+                self._page_dirty = True
+            for control in controls:
+                self._dirty[id(control)] = control
+            if self._handle is not None:
+                return
+            loop = self._running_loop()
+            if loop is None:
+                schedule = None
+            else:
+                # Marcador hasta que el loop programe el envío real
+                self._handle = _PENDING
+                schedule = loop
+        if schedule is None:
+            self.flush()
+        elif _in_loop_thread(schedule):
+            self._schedule(schedule)
+        else:
+            schedule.call_soon_threadsafe(self._schedule, schedule)
+
+    def flush(self):
+        """Envía ahora todo lo pendiente con una sola llamada a page.update"""
+        with self._lock:
+            if self._handle not in (None, _PENDING):
+                self._handle.cancel()
+            self._handle = None
+            page_dirty, self._page_dirty = self._page_dirty, False
+            dirty, self._dirty = list(self._dirty.values()), {}
+        if not page_dirty and not dirty:
+            return
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+        try:
+            if page_dirty:
+                self.page.update()
+                return
+            controls = _outermost(_mounted(dirty), self.page)
+            if controls:
+                self.page.update(*controls)
+        except Exception as e:
+            print(f"[UpdateScheduler] Error actualizando UI: {e}")
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop):
+        delay = self._last_flush + self.min_interval - time.monotonic()
+        with self._lock:
+            if delay > 0:
+                self._handle = loop.call_later(delay, self.flush)
+            else:
+                self._handle = loop.call_soon(self.flush)
+
+    def _running_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        # Handler síncrono en un hilo del executor de Flet: usar el loop de la página
+        try:
+            loop = self.page.loop
+        except Exception:
+            return None
+        if isinstance(loop, asyncio.AbstractEventLoop) and loop.is_running():
+            return loop
+        return None
+
+
+# Marca "envío en camino" mientras call_soon_threadsafe llega al loop
+_PENDING = object()
+
+
+def _in_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _mounted(controls: List[Any]) -> List[Any]:
+    """Descarta controles que ya no están en la página"""
+    mounted = []
+    for control in controls:
+        try:
+            if control.page is not None:
+                mounted.append(control)
+        except RuntimeError:
+            continue
+    return mounted
+
+
+def _outermost(controls: List[Any], page: Any) -> List[Any]:
+    """Quita los controles cuyo ancestro ya está pendiente (su envío los incluye)"""
+    pending = {id(control) for control in controls}
+    result = []
+    for control in controls:
+        parent = getattr(control, "parent", None)
+        while parent is not None and parent is not page and id(parent) not in pending:
+            parent = getattr(parent, "parent", None)
+        if parent is None or parent is page:
+            result.append(control)
+    return result
+
+
+def get_update_scheduler(page: Any) -> UpdateScheduler:
+    """Planificador asociado a una página (se crea en el primer uso)"""
+    scheduler = getattr(page, "_update_scheduler", None)
+    if not isinstance(scheduler, UpdateScheduler):
+        scheduler = UpdateScheduler(page)
+        page._update_scheduler = scheduler
+    return scheduler
+
+
+def request_update(target: Any, *controls: Any):
+    """
+    Pide una actualización agrupada de un control o de una página
+
+    Args:
+        target: Página (se actualiza entera salvo que se pasen controles) o control
+            montado (se actualiza solo ese control)
+        controls: Controles concretos de la página `target`
+    """
+    if target is None:
+        return
+    if hasattr(target, "run_task"):
+        get_update_scheduler(target).request(*controls)
+        return
+    try:
+        page = target.page
+    except RuntimeError:
+        return  # Aún no está en la página: se dibujará al montarse
+    if page is not None:
+        get_update_scheduler(page).request(target)
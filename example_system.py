@@ -2,14 +2,26 @@
 Ejemplo de uso del Sistema de Puntos, Niveles y Recompensas
 """
 
+import asyncio
+
 from app.logic.system_points import PointsSystem, Level, LEVEL_POINTS
 from app.logic.system_levels import LevelManager, UserLevel
+from app.services.database_service import DatabaseService
 from app.services.user_service import UserService
 from app.services.rewards_service import RewardsService
 
 
-def example_system():
-    """Ejemplo completo del sistema"""
+async def example_system():
+    """Ejemplo completo del sistema; cierra la conexión a la BD al terminar"""
+    database_service = DatabaseService()
+    try:
+        await _run_example(database_service)
+    finally:
+        await database_service.disconnect()
+
+
+async def _run_example(database_service: DatabaseService):
+    """Recorrido del ejemplo sobre la BD indicada"""
     
     # ============================================================================
     # 1. CREAR USUARIOS Y COMENZAR A GANAR PUNTOS
@@ -18,10 +30,10 @@ def example_system():
     print("SISTEMA DE PUNTOS Y NIVELES")
     print("=" * 80)
     
-    user_service = UserService()
+    user_service = UserService(database_service)
     
     # Crear usuario
-    user = user_service.create_user("jhojan", "jhojan@example.com")
+    user = await user_service.create_user("jhojan", "jhojan@example.com")
     print(f"\n✅ Usuario creado: {user.username}")
     print(f"   - ID: {user.id}")
     print(f"   - Nivel: {user.level}")
@@ -44,8 +56,8 @@ def example_system():
     ]
     
     for action, description in actions:
-        level_up = user_service.add_points_to_user(user.id, action)
-        user = user_service.get_user(user.id)
+        level_up = await user_service.add_points_to_user(user.id, action)
+        user = await user_service.get_user(user.id)
         
         print(f"\n✓ {description}")
         print(f"  Nivel: {user.level} | Puntos: {user.points}")
@@ -60,7 +72,7 @@ def example_system():
     print("ESTADÍSTICAS DEL USUARIO")
     print("=" * 80)
     
-    stats = user_service.get_user_stats(user.id)
+    stats = await user_service.get_user_stats(user.id)
     print(f"\nUsuario: {stats['username']}")
     print(f"Nivel: {stats['icon']} {stats['level']}")
     print(f"Puntos: {stats['points']}")
@@ -91,7 +103,8 @@ def example_system():
     print("SISTEMA DE RECOMPENSAS")
     print("=" * 80)
     
-    rewards_service = RewardsService()
+    rewards_service = RewardsService(database_service)
+    await rewards_service.initialize()
     
     # Ver recompensas desbloqueadas
     unlocked = rewards_service.get_unlocked_rewards(user.points)
@@ -130,6 +143,7 @@ def example_system():
         "points_required": 1000,
     })
     print(f"✏️ Recompensa actualizada")
+    await rewards_service.flush()
     
     # ============================================================================
     # 7. RANKING DE USUARIOS
@@ -146,17 +160,16 @@ def example_system():
     ]
     
     for username, email, points_to_add in users_data:
-        new_user = user_service.create_user(username, email)
-        for _ in range(int(points_to_add / 10)):  # Aproximadamente
-            user_service.add_points_to_user(new_user.id, "task_completed")
+        new_user = await user_service.create_user(username, email)
+        await user_service.add_points_to_user(new_user.id, "bonus", amount=points_to_add)
     
     # Ver ranking
-    ranking = user_service.get_ranking(limit=5)
+    ranking = await user_service.get_ranking(limit=5)
     print(f"\n{'Posición':<12} {'Usuario':<15} {'Nivel':<20} {'Puntos':<10}")
     print("-" * 57)
     
     for rank_item in ranking:
-        print(f"{rank_item['rank']:<12} {rank_item['user_id']:<15} {rank_item['icon']} {rank_item['level']:<17} {int(rank_item['points']):<10}")
+        print(f"{rank_item['rank']:<12} {rank_item['username']:<15} {rank_item['icon']} {rank_item['level']:<17} {int(rank_item['points']):<10}")
     
     print("\n" + "=" * 80)
     print("FIN DEL EJEMPLO")
@@ -164,4 +177,4 @@ def example_system():
 
 
 if __name__ == "__main__":
-    example_system()
+    asyncio.run(example_system())
@@ -0,0 +1,23 @@
+"""
+Tests para la configuración leída de variables de entorno
+"""
+from app.config.settings import _env_float
+
+
+class TestEnvFloat:
+    """Tests de lectura tolerante de números"""
+
+    def test_reads_valid_value(self, monkeypatch):
+        """Test que un valor válido se usa tal cual"""
+        monkeypatch.setenv("JDTP_TEST_SECONDS", "1.5")
+        assert _env_float("JDTP_TEST_SECONDS", 0.5) == 1.5
+
+    def test_malformed_value_falls_back_to_default(self, monkeypatch):
+        """Test que un valor mal formado no lanza ValueError y usa el default"""
+        monkeypatch.setenv("JDTP_TEST_SECONDS", "medio segundo")
+        assert _env_float("JDTP_TEST_SECONDS", 0.5) == 0.5
+
+    def test_negative_value_is_clamped(self, monkeypatch):
+        """Test que un valor negativo se ajusta al mínimo"""
+        monkeypatch.setenv("JDTP_TEST_SECONDS", "-3")
+        assert _env_float("JDTP_TEST_SECONDS", 0.5) == 0.0
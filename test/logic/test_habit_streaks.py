@@ -0,0 +1,70 @@
+"""
+Tests para el cálculo de rachas por periodo (habit_streaks.py)
+"""
+from datetime import date
+from app.logic.habit_streaks import (
+    apply_completion,
+    compute_streaks,
+    next_period_start,
+    period_start,
+)
+
+
+class TestPeriods:
+    """Tests del agrupamiento por periodo"""
+
+    def test_period_start_by_frequency(self):
+        """Test del inicio de periodo para cada frecuencia"""
+        day = date(2026, 8, 13)  # jueves
+        assert period_start(day, "daily") == day
+        assert period_start(day, "weekly") == date(2026, 8, 10)
+        assert period_start(day, "monthly") == date(2026, 8, 1)
+        assert period_start(day, "semiannual") == date(2026, 7, 1)
+        assert period_start(day, "annual") == date(2026, 1, 1)
+
+    def test_next_period_rolls_over_year(self):
+        """Test que el periodo siguiente cruza el cambio de año"""
+        assert next_period_start(date(2026, 12, 1), "monthly") == date(2027, 1, 1)
+        assert next_period_start(date(2026, 7, 1), "semiannual") == date(2027, 1, 1)
+        assert next_period_start(date(2026, 12, 28), "weekly") == date(2027, 1, 4)
+
+
+class TestStreaks:
+    """Tests de rachas actuales y máximas"""
+
+    def test_weekly_streak_requires_times_per_week(self):
+        """Test que una semana sin los completados requeridos rompe la racha"""
+        buckets = [
+            (date(2026, 1, 5), 3),
+            (date(2026, 1, 12), 3),
+            (date(2026, 1, 19), 1),  # no cumple 3 por semana
+            (date(2026, 1, 26), 4),
+        ]
+        info = compute_streaks(buckets, "weekly", frequency_times=3)
+
+        assert info.longest == 2
+        assert info.current == 1
+        assert info.last_met_period == date(2026, 1, 26)
+
+    def test_effective_current_breaks_after_missed_period(self):
+        """Test que la racha vigente es 0 si el periodo anterior no se cumplió"""
+        info = compute_streaks([(date(2026, 3, 1), 1), (date(2026, 4, 1), 1)], "monthly")
+        assert info.effective_current(date(2026, 5, 20), "monthly") == 2
+        assert info.effective_current(date(2026, 6, 2), "monthly") == 0
+
+    def test_incremental_matches_full_computation(self):
+        """Test que aplicar completados uno a uno da lo mismo que recalcular"""
+        days = [date(2026, 1, d) for d in (5, 6, 8, 12, 13, 14, 26)]
+        info = compute_streaks([], "weekly", 2)
+        for day in days:
+            apply_completion(info, day, "weekly", 2)
+
+        counts = {}
+        for day in days:
+            start = period_start(day, "weekly")
+            counts[start] = counts.get(start, 0) + 1
+        expected = compute_streaks(sorted(counts.items()), "weekly", 2)
+
+        assert (info.current, info.longest, info.last_met_period) == (
+            expected.current, expected.longest, expected.last_met_period
+        )
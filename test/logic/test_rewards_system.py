@@ -54,10 +54,10 @@ class TestPointsSystem:
     def test_add_points(self):
         """Verifica la suma de puntos por acción"""
         current = PointsSystem.add_points(0, "task_completed")
-        assert current == 10.0
+        assert current == pytest.approx(POINTS_BY_ACTION["task_completed"])
         
-        current = PointsSystem.add_points(10, "habit_completed")
-        assert current == 25.0
+        current = PointsSystem.add_points(10, "habit_daily_completed")
+        assert current == pytest.approx(10 + POINTS_BY_ACTION["habit_daily_completed"])
 
 
 class TestUserLevel:
@@ -74,23 +74,22 @@ class TestUserLevel:
         """Verifica que se añaden puntos y sube de nivel"""
         user_level = UserLevel(user_id="user1")
         
+        task_points = POINTS_BY_ACTION["task_completed"]
+        threshold = LEVEL_POINTS[Level.DESCONOCIDO]
+        
         # Añadir puntos sin cambio de nivel
         level_up = user_level.add_points("task_completed")
-        assert user_level.current_points == 10.0
+        assert user_level.current_points == pytest.approx(task_points)
         assert level_up is False
         assert user_level.current_level == Level.NADIE
         
-        # Añadir puntos hasta cambiar de nivel (necesita 50)
-        for _ in range(3):  # 10 + 30 = 40 puntos
-            user_level.add_points("task_completed")
-        
-        # En este punto tiene 40 puntos, aún no cambió de nivel
-        assert user_level.current_points == 40.0
+        # Quedarse justo por debajo del umbral de Desconocido
+        user_level.add_points("task_completed", amount=threshold - task_points - task_points / 2)
         assert user_level.current_level == Level.NADIE
         
-        # Añadir uno más para que suba de nivel (40 + 10 = 50 >= 50)
+        # Una tarea más cruza el umbral
         level_up = user_level.add_points("task_completed")
-        assert user_level.current_points == 50.0
+        assert user_level.current_points == pytest.approx(threshold + task_points / 2)
         assert user_level.current_level == Level.DESCONOCIDO
         assert level_up is True
     
@@ -121,7 +120,7 @@ class TestLevelManager:
         
         info = manager.get_user_level_info("user1")
         assert info["user_id"] == "user1"
-        assert info["current_points"] == 10.0
+        assert info["current_points"] == pytest.approx(POINTS_BY_ACTION["task_completed"])
         assert "progress_percent" in info
 
 
@@ -239,41 +238,105 @@ class TestRewardsService:
         assert updated.title == "Updated Test"
         assert updated.points_required == 200.0
 
+    def test_next_and_claimed_follow_index(self):
+        """Verifica que próximas y reclamadas salen ordenadas y se reindexan al actualizar"""
+        service = RewardsService()
+        cheap = service.create_reward({"title": "Barata", "points_required": 50})
+        middle = service.create_reward({"title": "Media", "points_required": 300})
+        expensive = service.create_reward({"title": "Cara", "points_required": 900})
+        service.create_reward({"title": "Inactiva", "points_required": 400, "is_active": False})
+
+        assert service.get_next_rewards(100, limit=2) == [middle, expensive]
+
+        service.update_reward(expensive.id, {"points_required": 200})
+        service.update_reward(cheap.id, {"claimed": True})
+
+        assert service.get_next_rewards(100) == [expensive, middle]
+        assert service.get_unlocked_rewards(250) == [expensive]
+        assert service.get_claimed_rewards() == [cheap]
+        assert [r.points_required for r in service.get_all_rewards()] == [50, 200, 300, 400]
+
+    def test_newly_unlocked_rewards_between_totals(self):
+        """Verifica que solo se devuelven las recompensas cruzadas por el cambio de puntos"""
+        service = RewardsService()
+        for title, points in [("A", 10), ("B", 20), ("C", 20), ("D", 35)]:
+            service.create_reward({"title": title, "points_required": points})
+
+        crossed = service.get_newly_unlocked_rewards(10, 30)
+
+        assert sorted(r.title for r in crossed) == ["B", "C"]
+        assert service.get_newly_unlocked_rewards(30, 10) == []
+        service.delete_reward(crossed[0].id)
+        assert len(service.get_newly_unlocked_rewards(10, 30)) == 1
+
 
 class TestUserService:
     """Tests del servicio de usuario"""
     
-    def test_create_user(self):
+    async def test_create_user(self, database_service):
         """Verifica la creación de usuario"""
-        service = UserService()
-        user = service.create_user("jhojan", "jhojan@example.com")
+        service = UserService(database_service)
+        user = await service.create_user("jhojan", "jhojan@example.com")
         
         assert user.username == "jhojan"
         assert user.email == "jhojan@example.com"
-        assert service.get_user(user.id) == user
+        stored = await service.get_user(user.id)
+        assert stored.id == user.id
+        assert stored.username == "jhojan"
     
-    def test_add_points_to_user(self):
+    async def test_add_points_to_user(self, database_service):
         """Verifica la suma de puntos a usuario"""
-        service = UserService()
-        user = service.create_user("jhojan")
+        service = UserService(database_service)
+        user = await service.create_user("jhojan")
         
-        service.add_points_to_user(user.id, "task_completed")
+        await service.add_points_to_user(user.id, "task_completed")
         
-        updated_user = service.get_user(user.id)
-        assert updated_user.points == 10.0
+        updated_user = await service.get_user(user.id)
+        assert updated_user.points == POINTS_BY_ACTION["task_completed"]
     
-    def test_level_up(self):
+    async def test_level_up(self, database_service):
         """Verifica que el usuario sube de nivel"""
-        service = UserService()
-        user = service.create_user("jhojan")
+        service = UserService(database_service)
+        user = await service.create_user("jhojan")
         
         # Añadir 50 puntos
         for _ in range(5):
-            service.add_points_to_user(user.id, "task_completed")
+            level_up = await service.add_points_to_user(user.id, "task_completed", amount=10.0)
         
-        updated_user = service.get_user(user.id)
+        updated_user = await service.get_user(user.id)
+        assert level_up
         assert updated_user.level == "Desconocido"
         assert updated_user.points == 50.0
+    
+    async def test_add_points_bulk_and_leaderboard(self, database_service):
+        """Verifica la suma en lote y el ranking top-N"""
+        service = UserService(database_service)
+        users = [await service.create_user(f"user{i}") for i in range(5)]
+        
+        changed = await service.add_points_bulk(
+            [(users[0].id, 20.0), (users[1].id, 120.0), (users[2].id, 55.0), (users[0].id, 40.0)]
+        )
+        
+        assert changed == {users[0].id: Level.DESCONOCIDO, users[1].id: Level.NOVATO, users[2].id: Level.DESCONOCIDO}
+        top = await service.get_leaderboard(limit=2)
+        assert [row["user_id"] for row in top] == [users[1].id, users[0].id]
+        assert [row["rank"] for row in top] == [1, 2]
+        assert await service.get_user_rank(users[2].id) == 3
+    
+    async def test_level_manager_flush_counts_every_award(self, database_service):
+        """Verifica que el flush agrupado suma una acción por asignación, no por usuario"""
+        service = UserService(database_service)
+        user = await service.create_user("jhojan")
+        manager = LevelManager(user_service=service)
+        
+        for _ in range(3):
+            manager.add_points(user.id, "task_completed")
+        await manager.flush()
+        
+        cursor = await database_service.execute("SELECT points, total_actions FROM users WHERE id = ?", (user.id,))
+        points, total_actions = await cursor.fetchone()
+        assert points == pytest.approx(3 * POINTS_BY_ACTION["task_completed"])
+        assert total_actions == 3
 
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+"""
+Tests para la tabla de niveles precalculada de PointsSystem
+"""
+import random
+from app.logic.system_points import (
+    Level, PointsSystem, LEVEL_POINTS, LEVELS_ORDER, LEVEL_TABLE
+)
+
+
+def _linear_level(points: float) -> Level:
+    """Implementación lineal de referencia (recorre LEVELS_ORDER)"""
+    level = Level.NADIE
+    for lvl in LEVELS_ORDER:
+        if points >= LEVEL_POINTS[lvl]:
+            level = lvl
+        else:
+            break
+    return level
+
+
+class TestLevelTable:
+    """Tests de la búsqueda por bisect"""
+
+    def test_thresholds_map_to_their_level(self):
+        """Test que cada umbral exacto y el valor anterior caen en el nivel correcto"""
+        for info in LEVEL_TABLE:
+            assert PointsSystem.get_level_by_points(info.threshold) == info.level
+            if info.index > 0:
+                assert PointsSystem.get_level_by_points(info.threshold - 0.001) == LEVELS_ORDER[info.index - 1]
+
+    def test_matches_linear_reference(self):
+        """Test que bisect coincide con el recorrido lineal, incluidos negativos"""
+        rng = random.Random(7)
+        samples = [-5.0] + [rng.uniform(0, 600_000) for _ in range(2_000)]
+        assert PointsSystem.levels_for(samples) == [_linear_level(p) for p in samples]
+
+    def test_next_level_and_span(self):
+        """Test del siguiente nivel y el progreso precalculados"""
+        assert PointsSystem.get_next_level(Level.NOVATO) == Level.CONOCIDO
+        assert PointsSystem.get_next_level(Level.COMO_DIOS) is None
+        assert PointsSystem.get_progress_to_next_level(150) == (50.0, 400.0)
+        assert PointsSystem.get_progress_to_next_level(600_000) == (100_000.0, 0.0)
+
+    def test_levels_for_large_batch_matches_reference(self):
+        """Test que levels_for sobre 100k puntajes (con umbrales exactos) coincide con la referencia lineal"""
+        rng = random.Random(42)
+        samples = [rng.uniform(0, 600_000) for _ in range(100_000)]
+        samples += [info.threshold for info in LEVEL_TABLE] + [info.threshold - 0.001 for info in LEVEL_TABLE]
+
+        levels = PointsSystem.levels_for(samples)
+
+        assert levels == [_linear_level(p) for p in samples]
+        assert levels[:100] == [PointsSystem.get_level_by_points(p) for p in samples[:100]]
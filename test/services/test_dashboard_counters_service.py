@@ -0,0 +1,153 @@
+"""
+Tests para DashboardCountersService (contadores materializados del resumen)
+"""
+import pytest
+from app.models.subtask import Subtask
+from app.services.dashboard_counters_service import DashboardCountersService
+from app.services.event_bus import CountersChanged, event_bus
+from app.services.goals_service import GoalsService
+from app.services.habits_service import HabitsService
+from app.services.task_service import TaskService
+from app.utils.task_helper import TASK_STATUS_COMPLETED, TASK_STATUS_PENDING
+
+
+async def _services(database_service):
+    tasks = TaskService(database_service)
+    await tasks.initialize()
+    habits = HabitsService(database_service)
+    await habits.initialize()
+    goals = GoalsService(database_service)
+    await goals.initialize()
+    return tasks, habits, goals
+
+
+class TestDashboardCounters:
+    """Tests de triggers, lectura y publicación de contadores"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_then_triggers_follow_writes(self, database_service):
+        """Test que los contadores parten de los datos existentes y siguen cada escritura"""
+        tasks, habits, goals = await _services(database_service)
+        done = await tasks.create_task({
+            "title": "Hecha", "user_id": "u1", "status": TASK_STATUS_COMPLETED,
+            "subtasks": [Subtask(id="s1", task_id="", title="Sub", completed=True)],
+        })
+        await tasks.create_task({"title": "Otra", "user_id": "u2", "status": TASK_STATUS_COMPLETED})
+        habit = await habits.create_habit("Leer", "")
+        await habits.complete_habit(habit.id)
+
+        counters = DashboardCountersService(database_service, user_id="u1")
+        assert await counters.get_counters() == {
+            "tasks_completed": 1, "subtasks_completed": 1, "habits_completed": 1, "goals_completed": 0,
+        }
+
+        pending = await tasks.create_task({"title": "Pendiente", "user_id": "u1"})
+        await tasks.update_task(pending.id, {"status": TASK_STATUS_COMPLETED})
+        await tasks.update_task(done.id, {"status": TASK_STATUS_PENDING})
+        await goals.create_goal(title="Correr", target=1, progress=1)
+        await habits.complete_habit(habit.id)  # desmarcar hoy
+
+        assert await counters.get_counters() == {
+            "tasks_completed": 1, "subtasks_completed": 1, "habits_completed": 0, "goals_completed": 1,
+        }
+        assert (await counters.get_counters("u2"))["tasks_completed"] == 1
+
+        await tasks.delete_task(pending.id)
+        assert (await counters.get_counters())["tasks_completed"] == 0
+        assert await counters.rebuild() == await counters.get_counters()
+
+    @pytest.mark.asyncio
+    async def test_counters_read_by_primary_key(self, database_service):
+        """Test que la lectura del resumen usa la clave primaria de dashboard_counters"""
+        counters = DashboardCountersService(database_service)
+        await counters.initialize()
+
+        cursor = await database_service.execute(
+            "EXPLAIN QUERY PLAN SELECT name, SUM(value) FROM dashboard_counters WHERE scope IN (?, ?) GROUP BY name",
+            ("", "default_user"),
+        )
+        plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+
+        assert "PRIMARY KEY" in plan
+
+    @pytest.mark.asyncio
+    async def test_service_writes_push_counters_changed(self, database_service):
+        """Test que una escritura publicada en el bus llega como CountersChanged"""
+        tasks, _, goals = await _services(database_service)
+        counters = DashboardCountersService(database_service, user_id="u1")
+        await counters.refresh()
+        await event_bus.drain()
+        counters.start()
+        received = []
+        unsubscribe = event_bus.subscribe(received.append, CountersChanged)
+        try:
+            task = await tasks.create_task({"title": "T", "user_id": "u1"})
+            await tasks.update_task(task.id, {"status": TASK_STATUS_COMPLETED})
+            goal = await goals.create_goal(title="Meta", target=2, progress=0)
+            await goals.step_progress(goal.id)
+            await event_bus.drain()
+            await event_bus.drain()
+        finally:
+            unsubscribe()
+            counters.stop()
+
+        assert len(received) == 1
+        assert received[0][-1].counters["tasks_completed"] == 1
+        assert received[0][-1].counters["goals_completed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_uncomplete_create_and_delete_push_counters_changed(self, database_service):
+        """Test que desmarcar, crear completada y borrar una tarea también publican CountersChanged"""
+        tasks, _, _ = await _services(database_service)
+        task = await tasks.create_task({"title": "T", "user_id": "u1", "status": TASK_STATUS_COMPLETED})
+        counters = DashboardCountersService(database_service, user_id="u1")
+        await counters.refresh()
+        await event_bus.drain()
+        counters.start()
+        received = []
+        unsubscribe = event_bus.subscribe(received.append, CountersChanged)
+
+        async def pushed():
+            await event_bus.drain()
+            await event_bus.drain()
+            return received.pop()[-1].counters["tasks_completed"] if received else None
+
+        try:
+            await tasks.update_task(task.id, {"status": TASK_STATUS_PENDING})
+            assert await pushed() == 0
+            other = await tasks.create_task({"title": "Ya hecha", "user_id": "u1", "status": TASK_STATUS_COMPLETED})
+            assert await pushed() == 1
+            await tasks.delete_task(other.id)
+            assert await pushed() == 0
+        finally:
+            unsubscribe()
+            counters.stop()
+
+    @pytest.mark.asyncio
+    async def test_previous_counter_tables_are_replaced(self, database_service):
+        """Test que la tabla sin grupo y los conteos de la integridad se retiran y se recuentan"""
+        tasks, _, _ = await _services(database_service)
+        await tasks.create_task({"title": "Hecha", "user_id": "u1", "status": TASK_STATUS_COMPLETED})
+        await database_service.execute(
+            "CREATE TABLE dashboard_counters (scope TEXT, name TEXT, value INTEGER, PRIMARY KEY (scope, name))"
+        )
+        await database_service.execute(
+            "CREATE TABLE points_integrity_counts (source TEXT, bucket TEXT, completed INTEGER)"
+        )
+        for name, target in (("dashboard_counters_tasks_completed", "dashboard_counters (scope, name, value)"),
+                             ("points_integrity_counts_tasks", "points_integrity_counts (source, bucket, completed)")):
+            await database_service.execute(
+                f"CREATE TRIGGER trg_{name}_insert AFTER INSERT ON tasks "
+                f"BEGIN INSERT INTO {target} VALUES ('x', 'x', 1); END"
+            )
+        await database_service.commit()
+
+        counters = DashboardCountersService(database_service, user_id="u1")
+        assert (await counters.get_counters())["tasks_completed"] == 1
+        await tasks.create_task({"title": "Otra", "user_id": "u1", "status": TASK_STATUS_COMPLETED})
+
+        assert (await counters.get_counters())["tasks_completed"] == 2
+        cursor = await database_service.execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE '%points_integrity_counts%'"
+        )
+        assert await cursor.fetchall() == []
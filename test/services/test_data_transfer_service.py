@@ -0,0 +1,144 @@
+"""
+Tests para DataTransferService (exportación e importación en streaming)
+"""
+import os
+import pytest
+from app.models.subtask import Subtask
+from app.services.data_transfer_service import EXPORT_TABLES, DataTransferService
+from app.services.database_service import DatabaseService
+from app.services.goals_service import GoalsService
+from app.services.habits_service import HabitsService
+from app.services.progress_service import ProgressService
+from app.services.rewards_service import RewardsService
+from app.services.task_service import TaskService
+
+# Filas sintéticas del benchmark de ida y vuelta. Por defecto es una versión
+# reducida; JDTP_BENCHMARK_ROWS=1000000 ejecuta el de un millón de filas.
+BENCHMARK_ROWS = int(os.environ.get("JDTP_BENCHMARK_ROWS", "20000"))
+
+
+@pytest.fixture(autouse=True)
+def reset_progress_singleton():
+    """Aísla el singleton de ProgressService entre tests"""
+    ProgressService._instance = None
+    ProgressService._initialized = False
+    yield
+    ProgressService._instance = None
+    ProgressService._initialized = False
+
+
+@pytest.fixture
+async def target_database(tmp_path):
+    """BD vacía con todas las tablas creadas (sin las recompensas por defecto)"""
+    service = DatabaseService(db_path=str(tmp_path / "target.db"))
+    await _initialize_schema(service)
+    await service.execute("DELETE FROM rewards")
+    await service.commit()
+    yield service
+    await service.disconnect()
+
+
+async def _initialize_schema(db):
+    await TaskService(db).initialize()
+    await HabitsService(db).initialize()
+    await GoalsService(db).initialize()
+    await RewardsService(db).initialize()
+    ProgressService._instance = None
+    ProgressService._initialized = False
+    await ProgressService(db).ensure_persistence()
+
+
+async def _dump(db):
+    tables = {}
+    for table in EXPORT_TABLES:
+        rows = await (await db.execute(f"SELECT * FROM {table}")).fetchall()
+        tables[table] = sorted(rows, key=repr)
+    return tables
+
+
+async def _sample_data(db):
+    tasks = TaskService(db)
+    await tasks.initialize()
+    await tasks.create_task({
+        "title": "Con subtarea", "description": None, "user_id": "u1", "tags": ["a", "b"],
+        "subtasks": [Subtask(id="s1", task_id="", title="Sub", completed=True)],
+    })
+    habits = HabitsService(db)
+    await habits.initialize()
+    habit = await habits.create_habit("Leer", "Diario\ncon salto")
+    await habits.complete_habit(habit.id)
+    goals = GoalsService(db)
+    await goals.initialize()
+    await goals.create_goal(title="Correr", target=10.5, progress=2.25)
+    await RewardsService(db).initialize()
+    ProgressService._instance = None
+    ProgressService._initialized = False
+    await ProgressService(db).add_points("task_completed", source_id="t1")
+
+
+class TestDataTransfer:
+    """Tests de ida y vuelta, formatos y atomicidad"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fmt,compress", [("ndjson", True), ("csv", False), ("csv", True)])
+    async def test_round_trip_preserves_every_table(self, database_service, target_database, tmp_path, fmt, compress):
+        """Test que exportar e importar en otra BD reproduce todas las tablas"""
+        await _sample_data(database_service)
+        path = tmp_path / ("export.ndjson.gz" if fmt == "ndjson" else "export_csv")
+
+        exported = await DataTransferService(database_service).export_data(path, fmt=fmt, compress=compress)
+        imported = await DataTransferService(target_database).import_data(path, fmt=fmt)
+
+        assert imported["tables"] == {table: rows for table, rows in exported["tables"].items() if rows}
+        assert await _dump(target_database) == await _dump(database_service)
+        assert imported["rows_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_import_is_atomic_and_upserts(self, database_service, target_database, tmp_path):
+        """Test que una línea inválida no deja nada importado y reimportar actualiza sin duplicar"""
+        await _sample_data(database_service)
+        path = tmp_path / "export.ndjson"
+        await DataTransferService(database_service).export_data(path)
+        content = path.read_text(encoding="utf-8")
+        broken = tmp_path / "broken.ndjson"
+        broken.write_text(content + "{no es json\n", encoding="utf-8")
+        transfer = DataTransferService(target_database)
+
+        with pytest.raises(ValueError):
+            await transfer.import_data(broken)
+        assert await target_database.count("tasks") == 0
+
+        await transfer.import_data(path)
+        await target_database.execute("UPDATE goals SET progress = 0")
+        await target_database.commit()
+        await transfer.import_data(path)
+
+        assert await _dump(target_database) == await _dump(database_service)
+
+    @pytest.mark.asyncio
+    async def test_synthetic_round_trip_benchmark(self, database_service, target_database, tmp_path):
+        """Benchmark de ida y vuelta (reducido por defecto; ver BENCHMARK_ROWS)"""
+        await _initialize_schema(database_service)
+        await database_service.executemany(
+            "INSERT INTO tasks (id, title, status, urgent, important, created_at, updated_at, user_id) "
+            "VALUES (?, ?, 'pendiente', ?, 0, '2024-01-01', '2024-01-01', 'u1')",
+            [(f"t{i}", f"Tarea {i}", i % 2) for i in range(BENCHMARK_ROWS // 2)],
+        )
+        await database_service.executemany(
+            "INSERT INTO habit_completions (id, habit_id, frequency, completed_at, created_at) "
+            "VALUES (?, ?, 'daily', ?, '2024-01-01')",
+            [(f"c{i}", f"h{i % 100}", f"day-{i}") for i in range(BENCHMARK_ROWS - BENCHMARK_ROWS // 2)],
+        )
+        await database_service.commit()
+        path = tmp_path / "bench.ndjson.gz"
+
+        exported = await DataTransferService(database_service).export_data(path, compress=True)
+        imported = await DataTransferService(target_database).import_data(path)
+
+        assert exported["tables"]["tasks"] + exported["tables"]["habit_completions"] == BENCHMARK_ROWS
+        assert await target_database.count("tasks") == BENCHMARK_ROWS // 2
+        assert await target_database.count("habit_completions") == BENCHMARK_ROWS - BENCHMARK_ROWS // 2
+        print(
+            f"[Benchmark] {BENCHMARK_ROWS} filas: exportación {exported['rows_per_second']:.0f} filas/s, "
+            f"importación {imported['rows_per_second']:.0f} filas/s"
+        )
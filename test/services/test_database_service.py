@@ -1,6 +1,7 @@
 """
 Tests para DatabaseService
 """
+import asyncio
 import pytest
 from datetime import datetime, date
 from app.services.database_service import DatabaseService, TableSchema
@@ -403,3 +404,46 @@ class TestDatabaseService:
         indexes = await cursor.fetchall()
         assert len(indexes) == 2
 
+    
+    @pytest.mark.asyncio
+    async def test_savepoint_rolls_back_only_its_block(self, database_service):
+        """Test que un savepoint fallido conserva las escrituras pendientes previas"""
+        await database_service.execute("CREATE TABLE items (name TEXT)")
+        await database_service.commit()
+        await database_service.execute("INSERT INTO items (name) VALUES ('pendiente')")
+        
+        with pytest.raises(RuntimeError):
+            async with database_service.savepoint("failing_block"):
+                await database_service.execute("INSERT INTO items (name) VALUES ('revertida')")
+                raise RuntimeError("fallo")
+        async with database_service.savepoint("ok_block"):
+            await database_service.execute("INSERT INTO items (name) VALUES ('confirmada')")
+        await database_service.commit()
+        
+        cursor = await database_service.execute("SELECT name FROM items ORDER BY rowid")
+        assert [row[0] for row in await cursor.fetchall()] == ["pendiente", "confirmada"]
+
+    @pytest.mark.asyncio
+    async def test_other_task_write_waits_for_open_savepoint(self, database_service):
+        """Test que la escritura de otra tarea no cae dentro de un savepoint que luego falla"""
+        await database_service.execute("CREATE TABLE items (value INTEGER)")
+        await database_service.commit()
+        inside = asyncio.Event()
+
+        async def failing_block():
+            async with database_service.savepoint("failing_block"):
+                await database_service.execute("INSERT INTO items (value) VALUES (1)")
+                inside.set()
+                await asyncio.sleep(0.05)
+                raise RuntimeError("fallo")
+
+        async def other_writer():
+            await inside.wait()
+            await database_service.execute("INSERT INTO items (value) VALUES (2)")
+            await database_service.commit()
+
+        results = await asyncio.gather(failing_block(), other_writer(), return_exceptions=True)
+
+        assert isinstance(results[0], RuntimeError)
+        cursor = await database_service.execute("SELECT value FROM items")
+        assert [row[0] for row in await cursor.fetchall()] == [2]
@@ -0,0 +1,113 @@
+"""
+Tests para EventBus (entrega agrupada por vuelta del event loop)
+"""
+import asyncio
+import pytest
+from app.services.event_bus import (
+    EventBus,
+    HabitCompleted,
+    PointsChanged,
+    SubtaskToggled,
+    TaskCompleted,
+    event_bus,
+)
+from app.services.progress_service import ProgressService
+
+
+class TestEventBus:
+    """Tests de suscripción y entrega"""
+
+    @pytest.mark.asyncio
+    async def test_events_in_same_tick_arrive_in_one_call(self):
+        """Test que varios eventos publicados juntos llegan en una sola llamada"""
+        bus = EventBus()
+        calls = []
+        bus.subscribe(calls.append)
+
+        bus.publish(TaskCompleted(task_id="t1"))
+        bus.publish(SubtaskToggled(subtask_id="s1", task_id="t1", completed=True))
+        bus.publish(PointsChanged(points=1.0, level="Nadie", delta=0.05))
+        assert calls == []
+
+        await asyncio.sleep(0)
+
+        assert len(calls) == 1
+        assert [type(event) for event in calls[0]] == [TaskCompleted, SubtaskToggled, PointsChanged]
+
+    @pytest.mark.asyncio
+    async def test_filters_by_type_and_unsubscribes(self):
+        """Test que cada suscriptor recibe solo sus tipos y deja de recibir al cancelar"""
+        bus = EventBus()
+        habits, points = [], []
+        unsubscribe = bus.subscribe(habits.append, HabitCompleted)
+        bus.subscribe(points.append, PointsChanged)
+
+        bus.publish(HabitCompleted(habit_id="h1", day="2026-01-01"))
+        await bus.drain()
+        unsubscribe()
+        bus.publish(HabitCompleted(habit_id="h2", day="2026-01-01"))
+        await bus.drain()
+
+        assert [[event.habit_id for event in batch] for batch in habits] == [["h1"]]
+        assert points == []
+
+    @pytest.mark.asyncio
+    async def test_async_handler_awaited_by_drain_and_errors_isolated(self):
+        """Test que drain espera a los handlers asíncronos y un error no corta la entrega"""
+        bus = EventBus()
+        received = []
+
+        async def slow_handler(events):
+            await asyncio.sleep(0.01)
+            received.extend(events)
+
+        def failing_handler(events):
+            raise RuntimeError("boom")
+
+        bus.subscribe(failing_handler)
+        bus.subscribe(slow_handler)
+        bus.publish(TaskCompleted(task_id="t1"))
+        await bus.drain()
+
+        assert [event.task_id for event in received] == ["t1"]
+
+    def test_publish_without_loop_dispatches_immediately(self):
+        """Test que sin event loop la entrega es inmediata"""
+        bus = EventBus()
+        calls = []
+        bus.subscribe(calls.append)
+
+        bus.publish(TaskCompleted(task_id="t1"))
+
+        assert len(calls) == 1
+
+
+class TestProgressServiceEvents:
+    """Tests de PointsChanged publicado por ProgressService"""
+
+    @pytest.fixture(autouse=True)
+    def reset_progress_singleton(self):
+        ProgressService._instance = None
+        ProgressService._initialized = False
+        yield
+        ProgressService._instance = None
+        ProgressService._initialized = False
+
+    @pytest.mark.asyncio
+    async def test_add_points_publishes_points_changed(self, database_service):
+        """Test que add_points publica el nuevo total y un duplicado no publica nada"""
+        progress = ProgressService(database_service)
+        await progress.load_stats()
+        batches = []
+        unsubscribe = event_bus.subscribe(batches.append, PointsChanged)
+        try:
+            await progress.add_points("task_completed", source_id="t1")
+            await progress.add_points("task_completed", source_id="t1")
+            await event_bus.drain()
+        finally:
+            unsubscribe()
+
+        events = [event for batch in batches for event in batch]
+        assert len(events) == 1
+        assert events[0].points == pytest.approx(progress.current_points)
+        assert events[0].stats["level"] == events[0].level
@@ -0,0 +1,73 @@
+"""
+Tests para GoalsService (goal_class persistido y completed en SQL)
+"""
+import pytest
+from app.services.goals_service import GoalsService
+
+
+class TestGoalsService:
+    """Tests de columnas indexadas y actualización incremental"""
+
+    @pytest.mark.asyncio
+    async def test_completed_flag_respects_goal_class(self, database_service):
+        """Test que completed se guarda al escribir según incremental/reductual"""
+        service = GoalsService(database_service)
+        await service.create_goal(title="Correr", target=10, progress=10)
+        await service.create_goal(title="Bajar peso", goal_class="reductual", target=70, progress=72)
+        await service.create_goal(title="Leer", target=5, progress=1)
+
+        reductual = (await service.list_goals(goal_class="reductual"))[0]
+        assert reductual.goal_class == "reductual"
+        assert not reductual.completed
+        assert [g.title for g in await service.list_goals(completed=True)] == ["Correr"]
+        assert await service.count_completed() == 1
+
+        await service.update_goal(reductual.id, progress=70)
+
+        assert await service.count_completed() == 2
+        assert await service.count_completed(goal_class="reductual") == 1
+
+    @pytest.mark.asyncio
+    async def test_step_progress_returns_only_changed_goal(self, database_service):
+        """Test que step_progress actualiza en SQL y respeta el piso de las reductuales"""
+        service = GoalsService(database_service)
+        up = await service.create_goal(title="Correr", target=2, progress=1)
+        down = await service.create_goal(title="Bajar peso", goal_class="reductual", target=70, progress=70.5)
+
+        assert (await service.step_progress(up.id)).completed
+        stepped = await service.step_progress(down.id)
+        assert stepped.progress == 70 and stepped.completed
+        assert await service.step_progress("missing") is None
+        assert await service.count_completed() == 2
+
+    @pytest.mark.asyncio
+    async def test_step_progress_honors_reduce_action(self, database_service):
+        """Test que el botón de reducir resta también en una meta incremental"""
+        service = GoalsService(database_service)
+        goal = await service.create_goal(title="Leer", target=5, progress=3)
+
+        reduced = await service.step_progress(goal.id, action="reductual")
+        assert reduced.progress == 2 and not reduced.completed
+        assert (await service.step_progress(goal.id, action="incremental")).progress == 3
+
+    @pytest.mark.asyncio
+    async def test_old_table_is_migrated(self, database_service):
+        """Test que una tabla sin goal_class/completed se migra y calcula completed"""
+        await database_service.connect()
+        await database_service.execute(
+            "CREATE TABLE goals (id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, goal_type TEXT, "
+            "unit_type TEXT, custom_unit TEXT, target REAL, progress REAL, created_at TEXT, updated_at TEXT)"
+        )
+        await database_service.execute(
+            "INSERT INTO goals (id, title, target, progress, created_at) VALUES ('g1', 'Vieja', 3, 3, '2026-01-01')"
+        )
+        await database_service.commit()
+
+        service = GoalsService(database_service)
+
+        assert await service.count_completed() == 1
+        cursor = await database_service.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM goals WHERE completed = 1"
+        )
+        plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+        assert "idx_goals_completed_goal_class" in plan
@@ -0,0 +1,282 @@
+"""
+Tests para HabitsService (historial de completados)
+"""
+import json
+import pytest
+from datetime import date, datetime, timedelta
+from app.logic.system_points import POINTS_BY_ACTION
+from app.services.habits_service import HabitsService, read_completions_csv, read_completions_json
+from app.services.progress_service import ProgressService
+
+
+async def _insert_completion(database_service, habit_id: str, day: str):
+    await database_service.execute(
+        "INSERT OR IGNORE INTO habit_completions (id, habit_id, frequency, completed_at, created_at) "
+        "VALUES (?, ?, 'daily', ?, ?)",
+        (f"{habit_id}-{day}", habit_id, day, datetime.now().isoformat()),
+    )
+    await database_service.commit()
+
+
+class TestCompletionHistory:
+    """Tests de índices y consultas por rango"""
+
+    @pytest.mark.asyncio
+    async def test_completion_is_unique_per_day(self, database_service):
+        """Test que completar dos veces el mismo día deja un solo registro"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        habit = await service.create_habit("Leer", "")
+
+        await service._add_completion_record(habit)
+        await service._add_completion_record(habit)
+
+        assert await service.count_completion_records() == 1
+
+    @pytest.mark.asyncio
+    async def test_completions_between_is_inclusive(self, database_service):
+        """Test que completions_between devuelve el rango inclusive y ordenado"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        for day in ["2026-01-01", "2026-01-05", "2026-01-10", "2026-02-01"]:
+            await _insert_completion(database_service, "h1", day)
+        await _insert_completion(database_service, "h2", "2026-01-05")
+
+        records = await service.completions_between("h1", date(2026, 1, 5), "2026-01-31")
+
+        assert [r["completed_at"] for r in records] == ["2026-01-05", "2026-01-10"]
+        assert await service.count_completions_between("2026-01-01", "2026-01-31") == 4
+        assert await service.count_completions_between("2026-01-01", "2026-01-31", habit_id="h2") == 1
+
+    @pytest.mark.asyncio
+    async def test_range_query_uses_index(self, database_service):
+        """Test que la consulta por rango usa el índice (habit_id, completed_at)"""
+        service = HabitsService(database_service)
+        await service.initialize()
+
+        cursor = await database_service.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM habit_completions "
+            "WHERE habit_id = ? AND completed_at BETWEEN ? AND ?",
+            ("h1", "2026-01-01", "2026-01-31"),
+        )
+        plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+
+        assert "idx_habit_completions_habit_day" in plan
+
+    @pytest.mark.asyncio
+    async def test_existing_duplicates_removed_before_unique_index(self, database_service):
+        """Test que una BD antigua con duplicados migra al índice único"""
+        await database_service.connect()
+        await database_service.execute(
+            "CREATE TABLE habit_completions (id TEXT PRIMARY KEY, habit_id TEXT NOT NULL, "
+            "frequency TEXT NOT NULL, completed_at TEXT NOT NULL, created_at TEXT NOT NULL)"
+        )
+        for record_id in ("a", "b"):
+            await database_service.execute(
+                "INSERT INTO habit_completions VALUES (?, 'h1', 'daily', '2026-01-01', '2026-01-01T10:00:00')",
+                (record_id,),
+            )
+        await database_service.commit()
+
+        service = HabitsService(database_service)
+        await service.initialize()
+
+        assert await service.count_completion_records() == 1
+
+
+class TestStreaks:
+    """Tests de rachas derivadas del historial"""
+
+    @pytest.mark.asyncio
+    async def test_streak_from_history_and_toggle(self, database_service):
+        """Test que la racha sale del historial y se recalcula al desmarcar"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        habit = await service.create_habit("Correr", "")
+        today = date.today()
+        for offset in (2, 1):
+            await _insert_completion(database_service, habit.id, (today - timedelta(days=offset)).isoformat())
+
+        assert await service.get_current_streak(habit.id) == 2
+
+        await service.complete_habit(habit.id)
+        assert habit.streak == 3
+        assert await service.get_longest_streak(habit.id) == 3
+
+        await service.complete_habit(habit.id)  # desmarcar hoy
+        assert habit.streak == 2
+
+
+class TestCompletionSeries:
+    """Tests de las series agregadas para los gráficos"""
+
+    @pytest.mark.asyncio
+    async def test_daily_series_fills_empty_days(self, database_service):
+        """Test que la serie diaria incluye días sin completados con tasa 0"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        habit = await service.create_habit("Leer", "")
+        for day in ["2026-03-02", "2026-03-04"]:
+            await _insert_completion(database_service, habit.id, day)
+
+        series = await service.get_completion_series(habit.id, "day", "2026-03-02", "2026-03-05")
+
+        assert [(p["period"], p["count"], p["rate"]) for p in series] == [
+            ("2026-03-02", 1, 1.0),
+            ("2026-03-03", 0, 0.0),
+            ("2026-03-04", 1, 1.0),
+            ("2026-03-05", 0, 0.0),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_weekly_and_monthly_rates_for_all_habits(self, database_service):
+        """Test que semanas y meses agrupan en SQL y la tasa considera todos los hábitos"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        first = await service.create_habit("Leer", "")
+        second = await service.create_habit("Correr", "")
+        # Semana del lunes 2026-03-02 y del lunes 2026-03-09
+        for day in ["2026-03-02", "2026-03-08", "2026-03-09"]:
+            await _insert_completion(database_service, first.id, day)
+        await _insert_completion(database_service, second.id, "2026-03-03")
+
+        weekly = await service.get_completion_series(None, "week", "2026-03-02", "2026-03-15")
+        monthly = await service.get_completion_series(None, "month", "2026-03-01", "2026-03-31")
+
+        assert [(p["period"], p["count"]) for p in weekly] == [("2026-03-02", 3), ("2026-03-09", 1)]
+        assert weekly[0]["rate"] == pytest.approx(3 / 14)
+        assert monthly == [{"period": "2026-03-01", "count": 4, "rate": pytest.approx(4 / 62)}]
+
+    @pytest.mark.asyncio
+    async def test_rate_follows_habit_frequency(self, database_service):
+        """Test que la tasa de un hábito semanal usa sus veces por semana, no los días"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        weekly = await service.create_habit("Correr", "", frequency="weekly", frequency_times=2)
+        daily = await service.create_habit("Leer", "")
+        for day in ["2026-03-02", "2026-03-04", "2026-03-10"]:
+            await _insert_completion(database_service, weekly.id, day)
+        await _insert_completion(database_service, daily.id, "2026-03-02")
+
+        weeks = await service.get_completion_series(weekly.id, "week", "2026-03-02", "2026-03-15")
+        month = await service.get_completion_series(weekly.id, "month", "2026-03-01", "2026-03-31")
+        both = await service.get_completion_series(None, "week", "2026-03-02", "2026-03-08")
+
+        assert [(p["count"], p["rate"]) for p in weeks] == [(2, 1.0), (1, 0.5)]
+        assert month[0]["rate"] == pytest.approx(3 / (2 * 31 / 7))
+        assert both[0]["rate"] == pytest.approx(3 / (7 + 2))
+
+    @pytest.mark.asyncio
+    async def test_series_cache_invalidated_on_completion(self, database_service):
+        """Test que la serie cacheada se descarta al completar el hábito"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        habit = await service.create_habit("Meditar", "")
+
+        before = await service.get_completion_series(habit.id, "day")
+        assert await service.get_completion_series(habit.id, "day") is before
+        assert before[-1]["count"] == 0
+
+        await service.complete_habit(habit.id)
+        after = await service.get_completion_series(habit.id, "day")
+
+        assert len(after) == 84
+        assert after[-1] == {"period": date.today().isoformat(), "count": 1, "rate": 1.0}
+
+
+class TestCompleteHabits:
+    """Tests del completado en lote"""
+
+    @pytest.fixture(autouse=True)
+    def reset_progress_singleton(self):
+        ProgressService._instance = None
+        ProgressService._initialized = False
+        yield
+        ProgressService._instance = None
+        ProgressService._initialized = False
+
+    @pytest.mark.asyncio
+    async def test_batch_completes_and_awards_once(self, database_service):
+        """Test que el lote registra completados, rachas y puntos sin duplicar al repetirlo"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        progress = ProgressService(database_service)
+        daily = await service.create_habit("Leer", "")
+        weekly = await service.create_habit("Nadar", "", frequency="weekly")
+        await _insert_completion(database_service, daily.id, (date.today() - timedelta(days=1)).isoformat())
+
+        result = await service.complete_habits([daily.id, weekly.id, "missing"], progress_service=progress)
+
+        assert result["results"] == {"missing": "not_found", daily.id: "completed", weekly.id: "completed"}
+        assert result["streaks"] == {daily.id: 2, weekly.id: 1}
+        assert result["points_delta"] == pytest.approx(
+            POINTS_BY_ACTION["habit_daily_completed"] + POINTS_BY_ACTION["habit_weekly_completed"]
+        )
+        assert daily.was_completed_today()
+
+        again = await service.complete_habits([daily.id, weekly.id], progress_service=progress)
+
+        assert set(again["results"].values()) == {"already_completed"}
+        assert again["points_delta"] == 0
+        assert await service.count_completion_records() == 3
+
+
+class TestImportCompletions:
+    """Tests de la importación de historial"""
+
+    @pytest.mark.asyncio
+    async def test_import_from_csv_recomputes_streak(self, database_service, tmp_path):
+        """Test que importar un CSV inserta por lotes, ignora lo inválido y recalcula la racha"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        habit = await service.create_habit("Leer", "")
+        today = date.today()
+        lines = ["habit_id,date"]
+        lines += [f"{habit.id},{(today - timedelta(days=offset)).isoformat()}" for offset in range(1, 6)]
+        lines += [f"{habit.id},{(today - timedelta(days=2)).isoformat()}", "otro,2026-01-01", f"{habit.id},ayer"]
+        path = tmp_path / "history.csv"
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        report = await service.import_completions(read_completions_csv(path), chunk_size=2)
+
+        assert report["read"] == 8
+        assert (report["inserted"], report["duplicates"]) == (5, 1)
+        assert (report["unknown_habits"], report["invalid_dates"]) == (1, 1)
+        assert report["rows_per_second"] > 0
+        assert habit.streak == 5
+        assert habit.last_completed[:10] == (today - timedelta(days=1)).isoformat()
+
+    @pytest.mark.asyncio
+    async def test_import_json_lines_is_idempotent(self, database_service, tmp_path):
+        """Test que repetir la importación de JSON Lines no duplica registros"""
+        service = HabitsService(database_service)
+        await service.initialize()
+        habit = await service.create_habit("Correr", "")
+        path = tmp_path / "history.jsonl"
+        path.write_text(
+            f'{{"habit_id": "{habit.id}", "date": "2025-05-01"}}\n'
+            f'{{"habit_id": "{habit.id}", "date": "2025-05-02T08:30:00"}}\n',
+            encoding="utf-8",
+        )
+
+        await service.import_completions(read_completions_json(path))
+        again = await service.import_completions(read_completions_json(path))
+
+        assert (again["inserted"], again["duplicates"]) == (0, 2)
+        assert await service.count_completion_records() == 2
+        assert await service.get_longest_streak(habit.id) == 2
+
+    def test_json_array_is_read_incrementally(self, tmp_path):
+        """Test que una lista JSON se decodifica elemento a elemento aunque cruce bloques"""
+        from app.services.habits_service import _iter_json_array
+
+        items = [{"habit_id": f"h{i}", "date": "2025-05-01"} for i in range(50)]
+        path = tmp_path / "history.json"
+        path.write_text(" \n" + json.dumps(items, indent=2), encoding="utf-8")
+
+        assert list(read_completions_json(path)) == [(item["habit_id"], item["date"]) for item in items]
+        with open(path, encoding="utf-8") as handle:
+            handle.read(4)  # " \n[" más el salto de línea
+            decoded = _iter_json_array(handle, chunk_size=8)
+            assert next(decoded) == items[0]
+            assert len(list(decoded)) == len(items) - 1
@@ -0,0 +1,107 @@
+"""
+Tests para MaintenanceService (backup en caliente y compactación)
+"""
+import asyncio
+import sqlite3
+import pytest
+from app.services.event_bus import EventBus, TaskDeleted
+from app.services.maintenance_service import AUTO_VACUUM_INCREMENTAL, MaintenanceService
+
+
+async def _fill(database_service, rows: int = 2000):
+    await database_service.execute("CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, body TEXT)")
+    await database_service.executemany(
+        "INSERT INTO notes (body) VALUES (?)", [("x" * 200,) for _ in range(rows)]
+    )
+    await database_service.commit()
+
+
+class TestBackup:
+    """Tests de la copia por páginas y la rotación"""
+
+    @pytest.mark.asyncio
+    async def test_paged_backup_copies_database(self, database_service, tmp_path):
+        """Test que la copia por bloques de páginas es una BD completa y legible"""
+        await _fill(database_service)
+        maintenance = MaintenanceService(database_service, backup_dir=tmp_path)
+
+        result = await maintenance.backup(pages=8)
+
+        assert result["pages"] > 8
+        assert result["bytes"] > 0
+        with sqlite3.connect(result["path"]) as copy:
+            assert copy.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 2000
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_rotation_keeps_newest_backups(self, database_service, tmp_path):
+        """Test que solo se conservan las últimas keep_backups copias"""
+        await _fill(database_service, rows=10)
+        maintenance = MaintenanceService(database_service, backup_dir=tmp_path, keep_backups=2)
+
+        paths = [(await maintenance.backup())["path"] for _ in range(2)]
+        last = await maintenance.backup()
+
+        assert last["removed"] == 1
+        assert last["bytes_reclaimed"] > 0
+        assert [str(p) for p in maintenance.list_backups()] == [last["path"], paths[1]]
+
+
+class TestCompaction:
+    """Tests de VACUUM incremental, optimize y ANALYZE"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_vacuum_reclaims_freed_pages(self, database_service, tmp_path):
+        """Test que la primera vez activa auto_vacuum y después recupera páginas libres"""
+        await _fill(database_service)
+        await database_service.execute("DELETE FROM notes")
+        await database_service.commit()
+        maintenance = MaintenanceService(database_service, backup_dir=tmp_path)
+
+        first = await maintenance.incremental_vacuum()
+        mode = (await (await database_service.execute("PRAGMA auto_vacuum")).fetchone())[0]
+        await _fill(database_service)
+        await database_service.execute("DELETE FROM notes")
+        await database_service.commit()
+        second = await maintenance.incremental_vacuum()
+
+        assert first["step"] == "vacuum" and first["bytes_reclaimed"] > 0
+        assert mode == AUTO_VACUUM_INCREMENTAL
+        assert second["step"] == "incremental_vacuum" and second["bytes_reclaimed"] > 0
+
+    @pytest.mark.asyncio
+    async def test_run_all_reports_every_step(self, database_service, tmp_path):
+        """Test que run_all informa duración y bytes recuperados de cada paso"""
+        await _fill(database_service, rows=10)
+        maintenance = MaintenanceService(database_service, backup_dir=tmp_path)
+
+        report = await maintenance.run_all()
+
+        assert [step["step"] for step in report] == ["optimize", "vacuum", "analyze", "backup"]
+        for step in report:
+            assert "error" not in step
+            assert step["seconds"] >= 0
+            assert "bytes_reclaimed" in step
+        stats = await (await database_service.execute("SELECT COUNT(*) FROM sqlite_stat1")).fetchone()
+        assert stats[0] > 0
+
+    @pytest.mark.asyncio
+    async def test_runs_only_when_idle(self, database_service, tmp_path):
+        """Test que la actividad en el bus aplaza el mantenimiento y luego se ejecuta una vez"""
+        await _fill(database_service, rows=10)
+        bus = EventBus()
+        maintenance = MaintenanceService(database_service, backup_dir=tmp_path, bus=bus)
+        maintenance.start(idle_seconds=0.1, interval=3600)
+        try:
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                bus.publish(TaskDeleted(task_id="t"))
+            await asyncio.sleep(0)
+            assert maintenance.last_report == []
+
+            await asyncio.sleep(0.3)
+        finally:
+            maintenance.stop()
+
+        assert len(maintenance.list_backups()) == 1
+        assert [step["step"] for step in maintenance.last_report][-1] == "backup"
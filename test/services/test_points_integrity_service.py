@@ -0,0 +1,134 @@
+"""
+Tests para PointsIntegrityService (conteos mantenidos por triggers)
+"""
+import pytest
+from app.logic.system_points import POINTS_BY_ACTION
+from app.services.habits_service import HabitsService
+from app.services.completion_counters import COUNTERS_TABLE
+from app.services.dashboard_counters_service import DashboardCountersService
+from app.services.points_integrity_service import PointsIntegrityService
+from app.services.progress_service import ProgressService
+from app.services.task_service import TaskService
+
+
+@pytest.fixture(autouse=True)
+def reset_progress_singleton():
+    """Aísla el singleton de ProgressService entre tests"""
+    ProgressService._instance = None
+    ProgressService._initialized = False
+    yield
+    ProgressService._instance = None
+    ProgressService._initialized = False
+
+
+@pytest.fixture
+async def seeded_db(database_service):
+    """BD con una tarea completada (2 subtareas, 1 completada) y una pendiente"""
+    task_service = TaskService(database_service)
+    await task_service.initialize()
+    await HabitsService(database_service).initialize()
+
+    done = await task_service.create_task({"title": "Hecha", "user_id": "default_user"})
+    first = await task_service.create_subtask(done.id, {"title": "a"})
+    await task_service.create_subtask(done.id, {"title": "b"})
+    await task_service.update_subtask(first.id, {"completed": True})
+    await task_service.update_task(done.id, {"status": "completada"})
+    await task_service.create_task({"title": "Pendiente", "user_id": "default_user"})
+    return database_service, task_service, done
+
+
+class TestPointsIntegrity:
+    """Tests de los conteos por triggers y la verificación"""
+
+    @pytest.mark.asyncio
+    async def test_expected_points_from_aggregates(self, seeded_db):
+        """Test que los puntos esperados salen de los agregados SQL"""
+        database_service, _, _ = seeded_db
+        service = PointsIntegrityService(database_service)
+
+        result = await service.compute_expected()
+
+        assert result["completed_tasks"] == 1
+        assert result["completed_subtasks"] == 1
+        assert result["expected_points"] == pytest.approx(
+            POINTS_BY_ACTION["task_completed"] + POINTS_BY_ACTION["subtask_completed"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_check_only_examines_changes(self, seeded_db):
+        """Test que tras instalar los triggers una verificación no recorre las tablas de origen"""
+        database_service, task_service, done = seeded_db
+        service = PointsIntegrityService(database_service)
+        first = await service.compute_expected()
+        assert first["examined_rows"] >= 4
+
+        await task_service.update_task(done.id, {"status": "pendiente"})
+        second = await service.compute_expected()
+
+        assert second["examined_rows"] == 0
+        assert second["completed_tasks"] == 0
+        assert second["expected_points"] == pytest.approx(POINTS_BY_ACTION["subtask_completed"])
+
+    @pytest.mark.asyncio
+    async def test_deleted_rows_are_subtracted(self, seeded_db):
+        """Test que las filas eliminadas se descuentan del total"""
+        database_service, task_service, done = seeded_db
+        service = PointsIntegrityService(database_service)
+        await service.compute_expected()
+
+        await database_service.execute("DELETE FROM subtasks WHERE task_id = ?", (done.id,))
+        await database_service.commit()
+        result = await service.compute_expected()
+
+        assert result["completed_subtasks"] == 0
+        assert result["expected_points"] == pytest.approx(POINTS_BY_ACTION["task_completed"])
+
+    @pytest.mark.asyncio
+    async def test_verify_repairs_progress(self, seeded_db):
+        """Test que verify ajusta los puntos de ProgressService al esperado"""
+        database_service, _, _ = seeded_db
+        progress = ProgressService(database_service)
+        await progress.set_points(10.0)
+
+        result = await PointsIntegrityService(database_service).verify(progress)
+
+        assert result["had_correction"]
+        assert progress.current_points == pytest.approx(result["expected_points"])
+
+    @pytest.mark.asyncio
+    async def test_full_recount_repairs_counts(self, seeded_db):
+        """Test que full=True recuenta desde las tablas si un conteo se desvió"""
+        database_service, _, _ = seeded_db
+        service = PointsIntegrityService(database_service)
+        await service.compute_expected()
+        await database_service.execute(f"UPDATE {COUNTERS_TABLE} SET value = 7 WHERE name = 'tasks_completed'")
+
+        result = await service.compute_expected(full=True)
+
+        assert result["completed_tasks"] == 1
+        assert result["examined_rows"] >= 4
+
+    @pytest.mark.asyncio
+    async def test_shares_dashboard_counters_with_frequency_buckets(self, seeded_db):
+        """Test que la verificación lee los contadores del resumen, con los hábitos por frecuencia"""
+        database_service, _, _ = seeded_db
+        habits = HabitsService(database_service)
+        await habits.initialize()
+        weekly = await habits.create_habit("Correr", "", frequency="weekly")
+        await habits.complete_habit(weekly.id)
+        daily = await habits.create_habit("Leer", "")
+        await habits.complete_habit(daily.id)
+        dashboard = DashboardCountersService(database_service)
+
+        result = await PointsIntegrityService(database_service).compute_expected()
+        counters = await dashboard.get_counters()
+
+        assert result["completed_habits"] == counters["habits_completed"] == 2
+        assert result["completed_tasks"] == counters["tasks_completed"]
+        assert result["habit_points"] == pytest.approx(
+            POINTS_BY_ACTION["habit_weekly_completed"] + POINTS_BY_ACTION["habit_daily_completed"]
+        )
+        cursor = await database_service.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name LIKE 'points_integrity%'"
+        )
+        assert (await cursor.fetchone())[0] == 0
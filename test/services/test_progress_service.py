@@ -0,0 +1,292 @@
+"""
+Tests para ProgressService (libro mayor de puntos)
+"""
+import asyncio
+import pytest
+from app.logic.system_points import POINTS_BY_ACTION
+from app.services.progress_service import ProgressService, LEDGER_TABLE, PROGRESS_TABLE, PROGRESS_ID
+
+
+@pytest.fixture(autouse=True)
+def reset_progress_singleton():
+    """Aísla el singleton de ProgressService entre tests"""
+    ProgressService._instance = None
+    ProgressService._initialized = False
+    yield
+    ProgressService._instance = None
+    ProgressService._initialized = False
+
+
+class TestPointsLedger:
+    """Tests del libro mayor append-only"""
+
+    @pytest.mark.asyncio
+    async def test_awards_are_recorded_in_ledger(self, database_service):
+        """Test que cada asignación queda en el libro mayor y cuadra con el total"""
+        service = ProgressService(database_service)
+        await service.add_points("task_completed", source_id="task-1")
+        await service.add_points("subtask_completed", source_id="sub-1")
+
+        entries = await service.get_ledger_entries()
+        assert [e["source_id"] for e in entries] == ["sub-1", "task-1"]
+
+        expected = POINTS_BY_ACTION["task_completed"] + POINTS_BY_ACTION["subtask_completed"]
+        assert await service.get_ledger_total() == pytest.approx(expected)
+        assert (await service.verify_ledger())["consistent"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_source_is_ignored(self, database_service):
+        """Test que la misma acción para la misma entidad no suma dos veces"""
+        service = ProgressService(database_service)
+        await service.add_points("subtask_completed", source_id="sub-1")
+        stats = await service.add_points("subtask_completed", source_id="sub-1")
+
+        assert stats["duplicate"] is True
+        assert service.current_points == pytest.approx(POINTS_BY_ACTION["subtask_completed"])
+        assert await service.has_award("subtask_completed", "sub-1")
+
+    @pytest.mark.asyncio
+    async def test_uncomplete_reverses_and_recomplete_awards_again(self, database_service):
+        """Test completar → desmarcar → completar: la reversión resta y libera el par"""
+        service = ProgressService(database_service)
+        points = POINTS_BY_ACTION["task_completed"]
+        await service.add_points("task_completed", source_id="task-1")
+
+        revoked = await service.revoke_points("task_completed", source_id="task-1")
+        assert revoked["revoked"] is True
+        assert service.current_points == pytest.approx(0.0)
+        assert not await service.has_award("task_completed", "task-1")
+        assert (await service.revoke_points("task_completed", source_id="task-1"))["revoked"] is False
+
+        again = await service.add_points("task_completed", source_id="task-1")
+        assert "duplicate" not in again
+        assert service.current_points == pytest.approx(points)
+        assert await service.get_ledger_total() == pytest.approx(points)
+        assert (await service.verify_ledger(repair=False))["consistent"]
+
+        entries = await service.get_ledger_entries()
+        assert [(e["action"], e["amount"]) for e in entries] == [
+            ("task_completed", points), ("reversal", -points), ("task_completed", points),
+        ]
+        assert entries[1]["source_id"] == entries[2]["source_id"] == f"task-1#{entries[2]['id']}"
+
+    @pytest.mark.asyncio
+    async def test_set_points_records_adjustment(self, database_service):
+        """Test que set_points deja el libro mayor consistente con el total"""
+        service = ProgressService(database_service)
+        await service.add_points("task_completed")
+        await service.set_points(3.0)
+
+        assert await service.get_ledger_total() == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_failed_set_or_reset_leaves_memory_untouched(self, database_service, monkeypatch):
+        """Test que si falla la escritura de set_points o reset_progress la memoria no cambia"""
+        service = ProgressService(database_service)
+        await service.add_points("task_completed", source_id="task-1")
+        before = service.get_stats()
+
+        async def failing_persist(*args, **kwargs):
+            raise RuntimeError("fallo de escritura")
+
+        monkeypatch.setattr(service, "_persist_state", failing_persist)
+        with pytest.raises(RuntimeError):
+            await service.set_points(500.0)
+        with pytest.raises(RuntimeError):
+            await service.reset_progress()
+        monkeypatch.undo()
+
+        assert service.get_stats() == before
+        assert await service.get_ledger_total() == pytest.approx(before["points"])
+        assert (await service.verify_ledger(repair=False))["consistent"]
+
+    @pytest.mark.asyncio
+    async def test_existing_progress_migrates_as_opening_balance(self, database_service):
+        """Test que el progreso previo al libro mayor se registra como saldo inicial"""
+        service = ProgressService(database_service)
+        await service.ensure_persistence()
+        await database_service.update(PROGRESS_TABLE, PROGRESS_ID, {"current_points": 7.5})
+        await database_service.execute("DELETE FROM points_ledger")
+        await database_service.commit()
+
+        ProgressService._instance = None
+        ProgressService._initialized = False
+        reloaded = ProgressService(database_service)
+        await reloaded.load_stats()
+
+        assert reloaded.current_points == pytest.approx(7.5)
+        assert await reloaded.get_ledger_total() == pytest.approx(7.5)
+
+
+class TestWriteCoalescing:
+    """Tests de asignación masiva y write-behind"""
+
+    @pytest.mark.asyncio
+    async def test_add_points_bulk_by_count(self, database_service):
+        """Test que add_points_bulk suma N asignaciones de una vez"""
+        service = ProgressService(database_service)
+        stats = await service.add_points_bulk("subtask_completed", count=50)
+
+        assert stats["awarded"] == 50
+        assert service.total_actions == 50
+        assert service.current_points == pytest.approx(50 * POINTS_BY_ACTION["subtask_completed"])
+        assert await service.get_ledger_total() == pytest.approx(service.current_points)
+
+    @pytest.mark.asyncio
+    async def test_add_points_bulk_skips_awarded_sources(self, database_service):
+        """Test que add_points_bulk ignora entidades ya otorgadas"""
+        service = ProgressService(database_service)
+        await service.add_points("subtask_completed", source_id="sub-1")
+        stats = await service.add_points_bulk("subtask_completed", source_ids=["sub-1", "sub-2", "sub-3"])
+
+        assert stats["awarded"] == 2
+        assert service.current_points == pytest.approx(3 * POINTS_BY_ACTION["subtask_completed"])
+
+    @pytest.mark.asyncio
+    async def test_add_awards_mixes_actions(self, database_service):
+        """Test que add_awards suma acciones distintas y devuelve el delta aplicado"""
+        service = ProgressService(database_service)
+        await service.add_points("habit_daily_completed", source_id="h1:2026-03-02")
+
+        result = await service.add_awards([
+            ("habit_daily_completed", "h1:2026-03-02"),
+            ("habit_daily_completed", "h2:2026-03-02"),
+            ("habit_weekly_completed", "h3:2026-03-02"),
+        ])
+
+        expected = POINTS_BY_ACTION["habit_daily_completed"] + POINTS_BY_ACTION["habit_weekly_completed"]
+        assert result["awarded"] == 2
+        assert result["points_delta"] == pytest.approx(expected)
+        assert (await service.verify_ledger())["consistent"]
+
+    @pytest.mark.asyncio
+    async def test_write_behind_commits_on_flush(self, database_service, temp_database):
+        """Test que el write-behind agrupa asignaciones y las confirma en flush()"""
+        from app.services.database_service import DatabaseService
+
+        service = ProgressService(database_service)
+        await service.ensure_persistence()
+        service.configure_write_behind(60)
+
+        for _ in range(3):
+            await service.add_points("task_completed")
+
+        reader = DatabaseService(db_path=temp_database)
+        try:
+            before = await reader.get(PROGRESS_TABLE, PROGRESS_ID)
+            assert before["current_points"] == 0.0
+
+            await service.flush()
+            after = await reader.get(PROGRESS_TABLE, PROGRESS_ID)
+            assert after["current_points"] == pytest.approx(3 * POINTS_BY_ACTION["task_completed"])
+            assert after["total_actions"] == 3
+        finally:
+            await reader.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_failed_award_keeps_pending_writes(self, database_service, temp_database, monkeypatch):
+        """Test que una asignación fallida solo deshace su savepoint y restaura la memoria"""
+        from app.services.database_service import DatabaseService
+
+        service = ProgressService(database_service)
+        await service.ensure_persistence()
+        service.configure_write_behind(60)
+        await database_service.execute("CREATE TABLE other_service (value TEXT)")
+        await database_service.commit()
+
+        await service.add_points("task_completed", source_id="t1")
+        await database_service.execute("INSERT INTO other_service (value) VALUES ('pendiente')")
+
+        insert_rows = service._insert_ledger_rows
+
+        async def failing_insert(request, now):
+            await insert_rows(request, now)
+            raise RuntimeError("disco lleno")
+
+        monkeypatch.setattr(service, "_insert_ledger_rows", failing_insert)
+        with pytest.raises(RuntimeError):
+            await service.add_points("task_completed", source_id="t2")
+        monkeypatch.undo()
+
+        assert service.current_points == pytest.approx(POINTS_BY_ACTION["task_completed"])
+        assert service.total_actions == 1
+        await service.flush()
+
+        reader = DatabaseService(db_path=temp_database)
+        try:
+            ledger = await (await reader.execute(f"SELECT source_id FROM {LEDGER_TABLE}")).fetchall()
+            assert [row[0] for row in ledger] == ["t1"]
+            assert await reader.count("other_service") == 1
+            saved = await reader.get(PROGRESS_TABLE, PROGRESS_ID)
+            assert saved["current_points"] == pytest.approx(service.current_points)
+        finally:
+            await reader.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_flush_awaits_scheduled_task(self, database_service):
+        """Test que flush() espera la tarea programada y no queda ninguna viva"""
+        service = ProgressService(database_service)
+        await service.ensure_persistence()
+        service.configure_write_behind(0.01)
+
+        await service.add_points("task_completed")
+        await asyncio.sleep(0.03)
+        await service.add_points("task_completed")
+        await service.shutdown()
+
+        assert service._flush_task is None
+        assert service._flush_handle is None
+        assert service._pending_writes == 0
+
+
+class TestConcurrentAwards:
+    """Tests de asignaciones concurrentes sobre la cola ordenada"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_awards_lose_no_increment(self, database_service):
+        """Test que muchas asignaciones simultáneas suman todas en memoria, BD y libro mayor"""
+        service = ProgressService(database_service)
+        results = await asyncio.gather(
+            *(service.add_points("task_completed", source_id=f"t{i}") for i in range(50))
+        )
+
+        expected = 50 * POINTS_BY_ACTION["task_completed"]
+        assert not any(stats.get("duplicate") for stats in results)
+        assert service.current_points == pytest.approx(expected)
+        assert service.total_actions == 50
+        saved = await database_service.get(PROGRESS_TABLE, PROGRESS_ID)
+        assert saved["current_points"] == pytest.approx(expected)
+        assert saved["total_actions"] == 50
+        assert await service.get_ledger_total() == pytest.approx(expected)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_award_once(self, database_service):
+        """Test que la misma entidad enviada a la vez solo puntúa una vez"""
+        service = ProgressService(database_service)
+        results = await asyncio.gather(
+            *(service.add_points("task_completed", source_id="same") for _ in range(5))
+        )
+
+        assert sum(1 for stats in results if not stats.get("duplicate")) == 1
+        assert service.current_points == pytest.approx(POINTS_BY_ACTION["task_completed"])
+        assert service.total_actions == 1
+
+    @pytest.mark.asyncio
+    async def test_first_use_prepares_database_once(self, database_service, monkeypatch):
+        """Test que dos primeras llamadas simultáneas preparan la BD una sola vez"""
+        service = ProgressService(database_service)
+        calls = []
+        prepare = service._prepare_db
+
+        async def counted_prepare():
+            calls.append(1)
+            await prepare()
+
+        monkeypatch.setattr(service, "_prepare_db", counted_prepare)
+        await asyncio.gather(
+            service.add_points("task_completed", source_id="a"),
+            service.add_points("subtask_completed", source_id="b"),
+        )
+
+        assert len(calls) == 1
+        assert (await service.verify_ledger())["consistent"]
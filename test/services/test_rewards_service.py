@@ -0,0 +1,86 @@
+"""
+Tests para RewardsService (cola de escritura write-behind)
+"""
+import asyncio
+import pytest
+from app.services.rewards_service import REWARD_COLUMNS, RewardsService
+
+
+async def _stored_titles(database_service):
+    cursor = await database_service.execute("SELECT title FROM rewards ORDER BY points_required")
+    return [row[0] for row in await cursor.fetchall()]
+
+
+class TestRewardsWriteQueue:
+    """Tests de la cola ordenada con agrupación y flush por lotes"""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_coalesced_and_flushed_in_one_batch(self, database_service):
+        """Test que varias escrituras de la misma recompensa se agrupan en un lote"""
+        service = RewardsService(database_service)
+        await service.initialize()
+        service.configure_write_behind(60)  # Solo el flush explícito escribe
+        base_flushes = service.get_write_metrics()["flushes"]
+
+        reward = service.create_reward({"title": "Cine", "points_required": 40})
+        service.update_reward(reward.id, {"title": "Cine 3D"})
+        service.update_reward(reward.id, {"points_required": 45})
+        temp = service.create_reward({"title": "Temporal", "points_required": 1})
+        service.delete_reward(temp.id)
+
+        metrics = service.get_write_metrics()
+        assert metrics["queue_depth"] == 1
+        assert metrics["coalesced"] >= 3
+
+        await service.flush()
+
+        metrics = service.get_write_metrics()
+        assert metrics["queue_depth"] == 0
+        assert metrics["flushes"] == base_flushes + 1
+        assert "Cine 3D" in await _stored_titles(database_service)
+        assert "Temporal" not in await _stored_titles(database_service)
+
+    @pytest.mark.asyncio
+    async def test_queue_flushes_itself_after_window(self, database_service):
+        """Test que la cola se vacía sola al cerrar la ventana y el borrado se aplica"""
+        service = RewardsService(database_service)
+        await service.initialize()
+        service.configure_write_behind(0)
+        reward = service.create_reward({"title": "Helado", "points_required": 2})
+        await asyncio.sleep(0.05)
+        assert "Helado" in await _stored_titles(database_service)
+
+        service.delete_reward(reward.id)
+        await asyncio.sleep(0.05)
+
+        assert "Helado" not in await _stored_titles(database_service)
+        assert service.get_write_metrics()["last_flush_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_keeps_other_pending_writes(self, database_service, monkeypatch):
+        """Test que un lote fallido no deshace los puntos write-behind pendientes"""
+        from app.services.progress_service import ProgressService
+
+        ProgressService._instance = None
+        ProgressService._initialized = False
+        try:
+            progress = ProgressService(database_service)
+            await progress.ensure_persistence()
+            progress.configure_write_behind(60)
+            service = RewardsService(database_service)
+            await service.initialize()
+            service.configure_write_behind(60)
+
+            await progress.add_points("task_completed", source_id="t1")
+            service.create_reward({"title": "Roto", "points_required": 3})
+            monkeypatch.setattr(RewardsService, "_reward_row", staticmethod(lambda reward: (None,) * len(REWARD_COLUMNS)))
+            with pytest.raises(Exception):
+                await service.flush()
+            await progress.flush()
+
+            assert await progress.get_ledger_total() == pytest.approx(progress.current_points)
+            assert await progress.has_award("task_completed", "t1")
+            assert service.get_write_metrics()["queue_depth"] == 1
+        finally:
+            ProgressService._instance = None
+            ProgressService._initialized = False
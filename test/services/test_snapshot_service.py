@@ -0,0 +1,131 @@
+"""
+Tests para SnapshotService (snapshot de los espejos en memoria y reproducción de cambios)
+"""
+import shutil
+import pytest
+from app.models.subtask import Subtask
+from app.services.database_service import DatabaseService
+from app.services.habits_service import HabitsService
+from app.services.progress_service import ProgressService
+from app.services.rewards_service import RewardsService
+from app.services.snapshot_service import SnapshotService
+from app.services.startup_service import StartupService
+from app.services.task_service import TaskService
+from app.utils.task_helper import TASK_STATUS_COMPLETED
+
+
+@pytest.fixture(autouse=True)
+def reset_progress_singleton():
+    """Aísla el singleton de ProgressService entre tests"""
+    ProgressService._instance = None
+    ProgressService._initialized = False
+    yield
+    ProgressService._instance = None
+    ProgressService._initialized = False
+
+
+async def _services(database_service):
+    tasks = TaskService(database_service)
+    await tasks.initialize()
+    habits = HabitsService(database_service)
+    await habits.initialize()
+    rewards = RewardsService(database_service)
+    await rewards.initialize()
+    return tasks, habits, rewards
+
+
+class TestSnapshotService:
+    """Tests de guardado, restauración y validez del snapshot"""
+
+    @pytest.mark.asyncio
+    async def test_restore_replays_changes_after_watermark(self, database_service, tmp_path):
+        """Test que el snapshot más los cambios posteriores reproduce el estado de la BD"""
+        tasks, habits, rewards = await _services(database_service)
+        task = await tasks.create_task({
+            "title": "Con subtarea", "user_id": "u1",
+            "subtasks": [Subtask(id="s1", task_id="", title="Sub")],
+        })
+        kept = await habits.create_habit("Leer", "")
+        dropped = await habits.create_habit("Correr", "")
+        snapshots = SnapshotService(database_service, path=tmp_path / "app.snapshot")
+        await snapshots.initialize()
+        saved = await snapshots.save()
+        assert saved["rows"] == 2 + len(rewards.rewards) + 1
+
+        await tasks.update_subtask("s1", {"completed": True})
+        await tasks.create_task({"title": "Nueva", "user_id": "u1", "status": TASK_STATUS_COMPLETED})
+        await habits.delete_habit(dropped.id)
+        await habits.create_habit("Meditar", "")
+        reward_id = next(iter(rewards.rewards))
+        rewards.delete_reward(reward_id)
+        await rewards.flush()
+
+        fresh_tasks = TaskService(database_service)
+        fresh_habits = HabitsService(database_service)
+        fresh_rewards = RewardsService(database_service)
+        restored = await snapshots.restore(fresh_tasks, fresh_habits, fresh_rewards)
+
+        assert restored is not None and restored["replayed"] == 5
+        assert sorted(h.title for h in fresh_habits.get_all_habits()) == ["Leer", "Meditar"]
+        assert kept.id in fresh_habits.habits
+        assert set(fresh_rewards.rewards) == set(rewards.rewards)
+        assert reward_id not in {r.id for r in fresh_rewards.get_all_rewards()}
+        cached = fresh_tasks.get_cached_tasks("u1")
+        assert [t.title for t in cached] == ["Nueva", "Con subtarea"]
+        assert fresh_tasks._tasks[task.id].subtasks[0].completed
+
+    @pytest.mark.asyncio
+    async def test_unusable_snapshot_falls_back_to_full_load(self, database_service, tmp_path):
+        """Test que un snapshot superado, de otra BD o ilegible no se aplica"""
+        tasks, habits, rewards = await _services(database_service)
+        path = tmp_path / "app.snapshot"
+        snapshots = SnapshotService(database_service, path=path)
+        await snapshots.save()
+        shutil.copy(path, tmp_path / "old.snapshot")
+        await habits.create_habit("Leer", "")
+        await snapshots.save()
+
+        # El registro ya se recortó hasta el snapshot más nuevo
+        old = SnapshotService(database_service, path=tmp_path / "old.snapshot")
+        assert await old.restore(tasks, habits, rewards) is None
+
+        other_db = DatabaseService(db_path=str(tmp_path / "other.db"))
+        try:
+            await _services(other_db)
+            await SnapshotService(other_db).initialize()
+            assert await SnapshotService(other_db, path=path).restore(tasks, habits, rewards) is None
+        finally:
+            await other_db.disconnect()
+
+        path.write_bytes(b"no es un pickle")
+        assert await snapshots.restore(tasks, habits, rewards) is None
+        assert [h.title for h in habits.get_all_habits()] == ["Leer"]
+
+
+class TestStartupSnapshot:
+    """Tests del arranque en caliente desde un snapshot"""
+
+    @pytest.mark.asyncio
+    async def test_warm_start_uses_snapshot(self, database_service, tmp_path):
+        """Test que el segundo arranque restaura los espejos y precarga desde ellos"""
+        path = tmp_path / "app.snapshot"
+        first = StartupService(database_service, snapshot_service=SnapshotService(database_service, path=path))
+        await first.run()
+        assert first.snapshot is None
+        await first.task_service.create_task({"title": "T", "user_id": first.user_id})
+        await first.habits_service.create_habit("Leer", "")
+        await first.shutdown()
+
+        ProgressService._instance = None
+        ProgressService._initialized = False
+        second = StartupService(database_service, snapshot_service=SnapshotService(database_service, path=path))
+        try:
+            await second.run()
+        finally:
+            await second.shutdown()
+
+        assert second.errors == {}
+        assert second.snapshot is not None and second.snapshot["replayed"] == 0
+        assert [t.title for t in second.tasks] == ["T"]
+        assert [h.title for h in second.habits_service.get_all_habits()] == ["Leer"]
+        assert len(second.rewards_service.get_all_rewards()) == len(first.rewards_service.rewards)
@@ -0,0 +1,77 @@
+"""
+Tests para StartupService
+"""
+import pytest
+from app.services.progress_service import ProgressService
+from app.services.startup_service import StartupService, STARTUP_PHASES
+
+
+@pytest.fixture(autouse=True)
+def reset_progress_singleton():
+    """Aísla el singleton de ProgressService entre tests"""
+    ProgressService._instance = None
+    ProgressService._initialized = False
+    yield
+    ProgressService._instance = None
+    ProgressService._initialized = False
+
+
+@pytest.fixture
+async def startup(database_service):
+    """StartupService que se cierra al terminar (cancela la suscripción al bus)"""
+    service = StartupService(database_service)
+    yield service
+    await service.shutdown()
+
+
+class TestStartupService:
+    """Tests del orquestador de arranque"""
+
+    @pytest.mark.asyncio
+    async def test_run_preloads_all_data(self, startup):
+        """Test que run() precarga tareas, hábitos, metas, recompensas y progreso"""
+        assert not startup.ready
+
+        await startup.run()
+
+        assert startup.ready
+        assert startup.errors == {}
+        assert all(startup.loaded.values())
+        assert startup.tasks == []
+        assert startup.goals == []
+        assert startup.progress_stats["points"] == 0.0
+        assert startup.rewards_service._initialized
+        # Las recompensas por defecto quedan cargadas en memoria
+        assert len(startup.rewards_service.rewards) > 0
+
+    @pytest.mark.asyncio
+    async def test_services_share_connection(self, startup, database_service):
+        """Test que todos los servicios usan el mismo DatabaseService"""
+
+        assert startup.task_service.database_service is database_service
+        assert startup.habits_service.database_service is database_service
+        assert startup.rewards_service.database_service is database_service
+        assert startup.goals_service.db is database_service
+        assert startup.progress_service.database_service is database_service
+
+    @pytest.mark.asyncio
+    async def test_loading_steps_follow_phases(self, startup):
+        """Test que los pasos de carga esperan cada fase del arranque"""
+        steps = startup.loading_steps()
+        assert len(steps) == len(STARTUP_PHASES)
+
+        await startup.run()
+        for _, step in steps:
+            await step()  # No bloquea: todas las fases terminaron
+
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_counters_refresh(self, startup, database_service):
+        """Test que tras shutdown un evento tardío no reabre la BD cerrada"""
+        await startup.run()
+        await startup.shutdown()
+        await database_service.disconnect()
+
+        await startup.counters_service._on_source_events([])
+        await startup.counters_service.refresh()
+
+        assert not database_service.is_connected
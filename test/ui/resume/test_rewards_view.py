@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.rewards_service import RewardsService
+from app.ui.resume.rewards import rewards_view
+from app.ui.resume.rewards.rewards_view import RewardsView
+
+
+@pytest.fixture(autouse=True)
+def stub_form(monkeypatch):
+    """El formulario no participa en el refresco de listas"""
+    monkeypatch.setattr(rewards_view, "RewardsForm", MagicMock())
+
+
+def _service_with_rewards():
+    service = RewardsService()
+    cheap = service.create_reward({"title": "Café", "points_required": 1})
+    dear = service.create_reward({"title": "Cine", "points_required": 5})
+    return service, cheap, dear
+
+
+def test_small_point_change_without_crossing_skips_refresh():
+    service, _, _ = _service_with_rewards()
+    view = RewardsView(rewards_service=service, user_points=2.0)
+    unlocked_controls = view.unlocked_list.controls
+    locked_tile = view.locked_list.controls[0]
+
+    view.set_user_points(2.02)
+
+    assert view.user_points == 2.02
+    assert view.unlocked_list.controls is unlocked_controls
+    assert view.locked_list.controls[0] is locked_tile
+
+
+def test_crossing_moves_only_the_crossed_reward():
+    service, _, dear = _service_with_rewards()
+    view = RewardsView(rewards_service=service, user_points=2.0)
+    cheap_tile = view.unlocked_list.controls[0]
+
+    view.set_user_points(6.0)
+
+    assert view.unlocked_list.controls[0] is cheap_tile
+    assert len(view.unlocked_list.controls) == 2
+    assert view._list_keys["unlocked"][1] == dear.id
+    assert view._list_keys["locked"] == []
+
+
+def test_edited_reward_tile_is_rebuilt():
+    service, cheap, _ = _service_with_rewards()
+    view = RewardsView(rewards_service=service, user_points=2.0)
+    old_tile = view.unlocked_list.controls[0]
+
+    service.update_reward(cheap.id, {"title": "Café doble"})
+    view.refresh_lists()
+
+    assert view.unlocked_list.controls[0] is not old_tile
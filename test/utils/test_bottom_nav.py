@@ -0,0 +1,83 @@
+"""
+Tests para bottom_nav.py (construcción perezosa de pantallas)
+"""
+import pytest
+from unittest.mock import MagicMock
+import flet as ft
+from app.utils.bottom_nav import BottomNav, create_bottom_nav_with_views
+
+
+class FakeView:
+    """Vista mínima que cuenta cuántas veces se construye"""
+
+    instances = 0
+
+    def __init__(self):
+        FakeView.instances += 1
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return ft.Text(f"vista {id(self)}")
+
+
+def _navigate(bottom_nav, index, page):
+    event = MagicMock()
+    event.control.selected_index = index
+    event.page = page
+    bottom_nav._handle_navigation(event)
+
+
+class TestLazyBottomNav:
+    """Tests de pantallas construidas al seleccionarlas"""
+
+    def test_only_initial_screen_is_built(self, mock_page):
+        """Test que solo la pantalla visible se construye en build()"""
+        views = [FakeView(), FakeView(), FakeView()]
+        bottom_nav = create_bottom_nav_with_views(views, mock_page)
+        bottom_nav.build(mock_page)
+
+        assert [v.builds for v in views] == [1, 0, 0]
+        assert len(bottom_nav.nav_bar.destinations) == 3
+
+    def test_screen_built_on_first_selection_only(self, mock_page):
+        """Test que la pantalla se construye al seleccionarla y se reutiliza"""
+        views = [FakeView(), FakeView()]
+        bottom_nav = create_bottom_nav_with_views(views, mock_page)
+        bottom_nav.build(mock_page)
+
+        _navigate(bottom_nav, 1, mock_page)
+        _navigate(bottom_nav, 0, mock_page)
+        _navigate(bottom_nav, 1, mock_page)
+
+        assert views[1].builds == 1
+        assert bottom_nav.screen_container.content is bottom_nav.screens[1]
+
+    def test_view_classes_are_instantiated_lazily(self, mock_page):
+        """Test que las clases de vista se instancian solo al abrir su pestaña"""
+        FakeView.instances = 0
+        bottom_nav = create_bottom_nav_with_views([FakeView, FakeView], mock_page)
+        bottom_nav.build(mock_page)
+        assert FakeView.instances == 1
+
+        _navigate(bottom_nav, 1, mock_page)
+        assert FakeView.instances == 2
+
+    def test_eager_mode_builds_everything(self, mock_page):
+        """Test que lazy=False mantiene la construcción anticipada"""
+        views = [FakeView(), FakeView()]
+        create_bottom_nav_with_views(views, mock_page, lazy=False)
+
+        assert [v.builds for v in views] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_idle_prefetch_builds_pending_screens(self, mock_page):
+        """Test que el prefetch en tiempo ocioso construye las pantallas pendientes"""
+        views = [FakeView(), FakeView(), FakeView()]
+        bottom_nav = create_bottom_nav_with_views(views, mock_page)
+        bottom_nav.build(mock_page)
+
+        await bottom_nav._prefetch_pending(delay=0)
+
+        assert [v.builds for v in views] == [1, 1, 1]
+        assert bottom_nav.screen_factories == {}
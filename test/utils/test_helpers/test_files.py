@@ -178,9 +178,7 @@ class TestFiles:
         original = Path("test.txt")
         backup = create_backup_path(original)
         
-        # El código actual tiene un bug: usa suffix dos veces
-        # backup_name = f"{stem}{suffix}{suffix}" donde suffix es la extensión
-        assert backup.name.endswith(".txt")
+        assert backup.name == "test_backup.txt"
         assert backup.parent == original.parent
     
     def test_create_backup_path_custom_suffix(self):
@@ -188,8 +186,7 @@ class TestFiles:
         original = Path("test.txt")
         backup = create_backup_path(original, suffix="_old")
         
-        # El código actual tiene un bug en la implementación
-        assert backup.name.endswith(".txt")
+        assert backup.name == "test_old.txt"
         assert backup.parent == original.parent
     
     def test_list_files_in_directory(self):
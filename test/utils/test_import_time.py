@@ -0,0 +1,67 @@
+"""
+Tests de tiempo de import (benchmark de arranque con `python -X importtime`)
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Presupuesto en microsegundos para importar la capa de modelos y utilidades
+IMPORT_BUDGET_US = 150_000
+
+
+def _run_python(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    return subprocess.run(
+        args + ["-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def _cumulative_import_time(stderr: str, module: str) -> int:
+    """Devuelve el tiempo acumulado (us) del módulo según `-X importtime`"""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, _, cumulative, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        if name == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} no aparece en la salida de importtime")
+
+
+class TestImportTime:
+    """Tests del coste de import de los paquetes con exportaciones perezosas"""
+
+    def test_packages_do_not_import_flet(self):
+        """Test que modelos y utilidades no arrastran Flet al importarse"""
+        result = _run_python(
+            "import sys, app.models, app.utils, app.utils.helpers, app.ui; "
+            "print('flet' in sys.modules)"
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
+    def test_lazy_exports_resolve_on_access(self):
+        """Test que las exportaciones perezosas siguen disponibles"""
+        result = _run_python(
+            "from app.utils import LoadingScreen, get_quadrant_name; "
+            "from app.utils.helpers import format_date; "
+            "import app.utils as utils; "
+            "print(get_quadrant_name('Q1') != '', 'LoadingScreen' in dir(utils))"
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "True True"
+
+    def test_models_import_within_budget(self):
+        """Test que importar app.models.task está dentro del presupuesto"""
+        result = _run_python("import app.models.task", importtime=True)
+        assert result.returncode == 0, result.stderr
+
+        elapsed = _cumulative_import_time(result.stderr, "app.models")
+        assert elapsed < IMPORT_BUDGET_US, f"app.models tardó {elapsed}us (presupuesto {IMPORT_BUDGET_US}us)"
@@ -0,0 +1,60 @@
+"""
+Tests para screem_load.py (pantalla de carga guiada por pasos de arranque)
+"""
+import pytest
+from unittest.mock import MagicMock
+from app.utils.screem_load import LoadingScreen
+
+
+class TestLoadingScreenSteps:
+    """Tests de la carga basada en pasos reales"""
+
+    @pytest.mark.asyncio
+    async def test_finishes_when_steps_complete(self, mock_page):
+        """Test que la carga termina al completar los pasos sin espera mínima"""
+        done = []
+        calls = []
+
+        async def step_one():
+            calls.append("uno")
+
+        async def step_two():
+            calls.append("dos")
+
+        screen = LoadingScreen(on_complete=lambda: done.append(True), min_display_time=0)
+        screen.animation_running = True
+        await screen._run_steps(mock_page, [("Uno", step_one), ("Dos", step_two)])
+
+        assert calls == ["uno", "dos"]
+        assert done == [True]
+        assert screen.is_complete()
+
+    @pytest.mark.asyncio
+    async def test_failed_step_does_not_block_startup(self, mock_page):
+        """Test que un paso con error se registra y la carga continúa"""
+        done = []
+
+        async def broken():
+            raise RuntimeError("sin BD")
+
+        async def ok():
+            pass
+
+        screen = LoadingScreen(on_complete=lambda: done.append(True), min_display_time=0)
+        screen.animation_running = True
+        await screen._run_steps(mock_page, [("Roto", broken), ("Ok", ok)])
+
+        assert done == [True]
+        assert screen.step_errors[0][0] == "Roto"
+
+    def test_start_loading_schedules_steps(self, mock_page):
+        """Test que start_loading agenda los pasos en el loop de la página"""
+        screen = LoadingScreen(min_display_time=0)
+        screen.start_loading(mock_page, steps=[])
+
+        mock_page.run_task.assert_called_once()
+        assert mock_page.run_task.call_args[0][0] == screen._run_steps
+
+    def test_min_display_time_cannot_be_negative(self):
+        """Test que el tiempo mínimo se normaliza a 0"""
+        assert LoadingScreen(min_display_time=-3).min_display_time == 0.0
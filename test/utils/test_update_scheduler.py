@@ -0,0 +1,75 @@
+"""
+Tests para UpdateScheduler (envío agrupado de actualizaciones de UI)
+"""
+import asyncio
+import pytest
+import flet as ft
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.utils.update_scheduler import UpdateScheduler, get_update_scheduler, request_update
+
+
+class TestUpdateScheduler:
+    """Tests de agrupación por frame y límite de FPS"""
+
+    @pytest.mark.asyncio
+    async def test_burst_in_one_tick_sends_one_update(self):
+        """Test que varias peticiones de la misma vuelta del loop producen un solo envío"""
+        page = MagicMock()
+        scheduler = UpdateScheduler(page, max_fps=0)
+
+        for _ in range(5):
+            scheduler.request()
+        page.update.assert_not_called()
+
+        await asyncio.sleep(0)
+
+        page.update.assert_called_once_with()
+        assert (scheduler.requests, scheduler.flushes) == (5, 1)
+
+    @pytest.mark.asyncio
+    async def test_max_fps_delays_next_frame(self):
+        """Test que tras un envío el siguiente espera al intervalo mínimo"""
+        page = MagicMock()
+        scheduler = UpdateScheduler(page, max_fps=20)
+
+        scheduler.request()
+        await asyncio.sleep(0)
+        scheduler.request()
+        scheduler.request()
+        await asyncio.sleep(0)
+        assert page.update.call_count == 1
+
+        await asyncio.sleep(scheduler.min_interval + 0.02)
+
+        assert page.update.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_only_outermost_dirty_controls_are_sent(self):
+        """Test que un control cuyo ancestro ya está pendiente no se envía aparte"""
+        page = MagicMock()
+        outer = SimpleNamespace(page=page, parent=page)
+        inner = SimpleNamespace(page=page, parent=SimpleNamespace(parent=outer))
+        other = SimpleNamespace(page=page, parent=page)
+        scheduler = UpdateScheduler(page, max_fps=0)
+
+        scheduler.request(inner)
+        scheduler.request(outer, other)
+        await asyncio.sleep(0)
+
+        page.update.assert_called_once_with(outer, other)
+
+    def test_without_loop_updates_immediately(self):
+        """Test que sin event loop la actualización es inmediata"""
+        page = MagicMock()
+        page.loop = None
+
+        request_update(page)
+
+        page.update.assert_called_once_with()
+        assert get_update_scheduler(page) is get_update_scheduler(page)
+
+    def test_unmounted_control_is_ignored(self):
+        """Test que un control fuera de la página no falla ni envía nada"""
+        request_update(ft.Text("suelto"))